@@ -52,9 +52,9 @@ class ClarityCLI:
             print(f"\n✓ Found {len(metrics)} records")
 
             if metrics and not args.count_only:
-                # Show summary
+                # Show summary (most recent first)
                 print("\nSample data:")
-                for i, metric in enumerate(metrics[:5]):
+                for metric in reversed(metrics[-5:]):
                     print(f"  - {metric['metric_date']}: {metric.get('sessions', 'N/A')} sessions")
                 if len(metrics) > 5:
                     print(f"  ... and {len(metrics) - 5} more")
@@ -207,8 +207,15 @@ class ClarityCLI:
         print("\n" + "=" * 60)
 
 
-def main():
-    """Main CLI entry point."""
+def main(argv=None) -> int:
+    """Main CLI entry point.
+
+    Args:
+        argv: Argument list (default: sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
     parser = argparse.ArgumentParser(
         description="Clarity UX Insights - Unified CLI",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -266,7 +273,7 @@ Examples:
     # Status command
     status_parser = subparsers.add_parser('status', help='Show system status')
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if not args.command:
         parser.print_help()
@@ -5,6 +5,9 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
 
+# libyaml-backed loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 
 @dataclass
 class ProjectConfig:
@@ -104,7 +107,7 @@ class ClarityConfig:
             return cls()
 
         with open(config_path, 'r') as f:
-            data = yaml.safe_load(f) or {}
+            data = yaml.load(f, Loader=YAML_LOADER) or {}
 
         # Parse configuration sections
         project = cls._parse_project(data.get('project', {}))
@@ -212,29 +215,61 @@ class ClarityConfig:
     def validate(self) -> List[str]:
         """Validate configuration and return list of errors."""
         errors = []
+        for section in self._SECTION_VALIDATORS:
+            errors.extend(self.validate_section(section))
+        return errors
+
+    def validate_section(self, section: str) -> List[str]:
+        """Validate a single configuration section and return its errors.
+
+        Args:
+            section: Section name ('project', 'tracking' or 'reports')
 
-        # Validate project
+        Returns:
+            List of error messages for that section
+        """
+        validator = self._SECTION_VALIDATORS.get(section)
+        if validator is None:
+            raise ValueError(f"No validation for section: {section}")
+        return validator(self)
+
+    def _validate_project(self) -> List[str]:
+        """Validate project settings."""
+        errors = []
         if not self.project.name:
             errors.append("Project name is required")
+        return errors
+
+    def _validate_tracking(self) -> List[str]:
+        """Validate page IDs and paths are unique."""
+        errors = []
 
-        # Validate page IDs are unique
         page_ids = [p.id for p in self.tracking.pages]
         if len(page_ids) != len(set(page_ids)):
             errors.append("Duplicate page IDs found in tracking configuration")
 
-        # Validate page paths are unique
         page_paths = [p.path for p in self.tracking.pages]
         if len(page_paths) != len(set(page_paths)):
             errors.append("Duplicate page paths found in tracking configuration")
 
-        # Validate output formats
+        return errors
+
+    def _validate_reports(self) -> List[str]:
+        """Validate output formats."""
+        errors = []
         valid_formats = ['markdown', 'csv', 'json']
         for fmt in self.reports.output_formats:
             if fmt not in valid_formats:
                 errors.append(f"Invalid output format: {fmt}. Valid: {valid_formats}")
-
         return errors
 
+    # Section name -> validator, in the order validate() reports errors
+    _SECTION_VALIDATORS = {
+        'project': _validate_project,
+        'tracking': _validate_tracking,
+        'reports': _validate_reports,
+    }
+
 
 def load_config(config_path: Optional[Path] = None) -> ClarityConfig:
     """Convenience function to load configuration.
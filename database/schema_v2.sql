@@ -160,11 +160,127 @@ CREATE TABLE IF NOT EXISTS archive_log (
     archive_file_path TEXT
 );
 
+-- Daily rollup of daily_metrics per (scope, metric, date), summed across
+-- pages and dimensions. Maintained by the triggers below so report queries
+-- read one row per day instead of one row per dimension value.
+CREATE TABLE IF NOT EXISTS daily_rollup (
+    data_scope TEXT NOT NULL,
+    metric_name TEXT NOT NULL,
+    metric_date DATE NOT NULL,
+
+    data_points INTEGER NOT NULL DEFAULT 0,
+    sessions INTEGER NOT NULL DEFAULT 0,
+    users INTEGER NOT NULL DEFAULT 0,
+    bot_sessions INTEGER NOT NULL DEFAULT 0,
+    dead_clicks INTEGER NOT NULL DEFAULT 0,
+    rage_clicks INTEGER NOT NULL DEFAULT 0,
+    quick_backs INTEGER NOT NULL DEFAULT 0,
+    error_clicks INTEGER NOT NULL DEFAULT 0,
+    script_errors INTEGER NOT NULL DEFAULT 0,
+    scroll_depth REAL NOT NULL DEFAULT 0,
+    scroll_depth_count INTEGER NOT NULL DEFAULT 0,   -- Rows with non-zero scroll_depth
+    engagement_time REAL NOT NULL DEFAULT 0,
+    engagement_time_count INTEGER NOT NULL DEFAULT 0, -- Rows with non-zero engagement_time
+
+    PRIMARY KEY (data_scope, metric_name, metric_date)
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_daily_rollup_insert
+AFTER INSERT ON daily_metrics
+WHEN NEW.data_scope IS NOT NULL
+BEGIN
+    INSERT INTO daily_rollup (
+        data_scope, metric_name, metric_date, data_points,
+        sessions, users, bot_sessions,
+        dead_clicks, rage_clicks, quick_backs, error_clicks, script_errors,
+        scroll_depth, scroll_depth_count, engagement_time, engagement_time_count
+    ) VALUES (
+        NEW.data_scope, NEW.metric_name, NEW.metric_date, 1,
+        COALESCE(NEW.sessions, 0), COALESCE(NEW.users, 0), COALESCE(NEW.bot_sessions, 0),
+        COALESCE(NEW.dead_clicks, 0), COALESCE(NEW.rage_clicks, 0), COALESCE(NEW.quick_backs, 0),
+        COALESCE(NEW.error_clicks, 0), COALESCE(NEW.script_errors, 0),
+        COALESCE(NEW.scroll_depth, 0), COALESCE(NEW.scroll_depth, 0) <> 0,
+        COALESCE(NEW.engagement_time, 0), COALESCE(NEW.engagement_time, 0) <> 0
+    )
+    ON CONFLICT(data_scope, metric_name, metric_date) DO UPDATE SET
+        data_points = data_points + excluded.data_points,
+        sessions = sessions + excluded.sessions,
+        users = users + excluded.users,
+        bot_sessions = bot_sessions + excluded.bot_sessions,
+        dead_clicks = dead_clicks + excluded.dead_clicks,
+        rage_clicks = rage_clicks + excluded.rage_clicks,
+        quick_backs = quick_backs + excluded.quick_backs,
+        error_clicks = error_clicks + excluded.error_clicks,
+        script_errors = script_errors + excluded.script_errors,
+        scroll_depth = scroll_depth + excluded.scroll_depth,
+        scroll_depth_count = scroll_depth_count + excluded.scroll_depth_count,
+        engagement_time = engagement_time + excluded.engagement_time,
+        engagement_time_count = engagement_time_count + excluded.engagement_time_count;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_daily_rollup_delete
+AFTER DELETE ON daily_metrics
+WHEN OLD.data_scope IS NOT NULL
+BEGIN
+    UPDATE daily_rollup SET
+        data_points = data_points - 1,
+        sessions = sessions - COALESCE(OLD.sessions, 0),
+        users = users - COALESCE(OLD.users, 0),
+        bot_sessions = bot_sessions - COALESCE(OLD.bot_sessions, 0),
+        dead_clicks = dead_clicks - COALESCE(OLD.dead_clicks, 0),
+        rage_clicks = rage_clicks - COALESCE(OLD.rage_clicks, 0),
+        quick_backs = quick_backs - COALESCE(OLD.quick_backs, 0),
+        error_clicks = error_clicks - COALESCE(OLD.error_clicks, 0),
+        script_errors = script_errors - COALESCE(OLD.script_errors, 0),
+        scroll_depth = scroll_depth - COALESCE(OLD.scroll_depth, 0),
+        scroll_depth_count = scroll_depth_count - (COALESCE(OLD.scroll_depth, 0) <> 0),
+        engagement_time = engagement_time - COALESCE(OLD.engagement_time, 0),
+        engagement_time_count = engagement_time_count - (COALESCE(OLD.engagement_time, 0) <> 0)
+    WHERE data_scope = OLD.data_scope
+      AND metric_name = OLD.metric_name
+      AND metric_date = OLD.metric_date;
+
+    DELETE FROM daily_rollup
+    WHERE data_scope = OLD.data_scope
+      AND metric_name = OLD.metric_name
+      AND metric_date = OLD.metric_date
+      AND data_points <= 0;
+END;
+
+-- Updates are recomputed from daily_metrics for the affected old and new keys
+CREATE TRIGGER IF NOT EXISTS trg_daily_rollup_update
+AFTER UPDATE ON daily_metrics
+BEGIN
+    DELETE FROM daily_rollup
+    WHERE (data_scope = OLD.data_scope AND metric_name = OLD.metric_name AND metric_date = OLD.metric_date)
+       OR (data_scope = NEW.data_scope AND metric_name = NEW.metric_name AND metric_date = NEW.metric_date);
+
+    INSERT INTO daily_rollup (
+        data_scope, metric_name, metric_date, data_points,
+        sessions, users, bot_sessions,
+        dead_clicks, rage_clicks, quick_backs, error_clicks, script_errors,
+        scroll_depth, scroll_depth_count, engagement_time, engagement_time_count
+    )
+    SELECT
+        data_scope, metric_name, metric_date, COUNT(*),
+        COALESCE(SUM(sessions), 0), COALESCE(SUM(users), 0), COALESCE(SUM(bot_sessions), 0),
+        COALESCE(SUM(dead_clicks), 0), COALESCE(SUM(rage_clicks), 0), COALESCE(SUM(quick_backs), 0),
+        COALESCE(SUM(error_clicks), 0), COALESCE(SUM(script_errors), 0),
+        COALESCE(SUM(scroll_depth), 0), COUNT(NULLIF(scroll_depth, 0)),
+        COALESCE(SUM(engagement_time), 0), COUNT(NULLIF(engagement_time, 0))
+    FROM daily_metrics
+    WHERE data_scope IS NOT NULL
+      AND ((data_scope = OLD.data_scope AND metric_name = OLD.metric_name AND metric_date = OLD.metric_date)
+        OR (data_scope = NEW.data_scope AND metric_name = NEW.metric_name AND metric_date = NEW.metric_date))
+    GROUP BY data_scope, metric_name, metric_date;
+END;
+
 -- Indexes for fast time-series queries
 CREATE INDEX IF NOT EXISTS idx_daily_date ON daily_metrics(metric_date);
 CREATE INDEX IF NOT EXISTS idx_daily_date_metric ON daily_metrics(metric_date, metric_name);
 CREATE INDEX IF NOT EXISTS idx_daily_page_date ON daily_metrics(page_id, metric_date);
 CREATE INDEX IF NOT EXISTS idx_daily_scope ON daily_metrics(data_scope);
+CREATE INDEX IF NOT EXISTS idx_daily_scope_metric_date ON daily_metrics(data_scope, metric_name, metric_date);
 CREATE INDEX IF NOT EXISTS idx_daily_fetch ON daily_metrics(fetch_timestamp);
 
 CREATE INDEX IF NOT EXISTS idx_weekly_period ON weekly_metrics(week_start, week_end);
@@ -30,6 +30,7 @@ def cleanup_database():
 
     tables_to_clean = [
         'daily_metrics',
+        'daily_rollup',
         'weekly_metrics',
         'monthly_metrics',
         'fetch_log',
@@ -9,18 +9,37 @@ from pathlib import Path
 from datetime import date, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 
+import numpy as np
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scripts.query_engine import QueryEngine, DateRange, DateParser
 
+# Per-period totals, in the order they are reported
+SUM_KEYS = (
+    'sessions', 'users', 'page_views',
+    'mobile_sessions', 'desktop_sessions', 'tablet_sessions',
+    'dead_clicks', 'rage_clicks', 'quick_backs', 'error_clicks',
+)
+
+# Per-row averages combined as session-weighted means
+WEIGHTED_KEYS = ('avg_scroll_depth', 'avg_time_on_page', 'avg_active_time')
+
+# Frustration totals also reported per session
+RATE_KEYS = ('dead_clicks', 'rage_clicks', 'quick_backs', 'error_clicks')
+
 
 class PeriodComparator:
     """Compare metrics between two time periods."""
 
-    def __init__(self):
-        """Initialize comparator."""
-        self.query_engine = QueryEngine()
+    def __init__(self, query_engine: Optional[QueryEngine] = None):
+        """Initialize comparator.
+
+        Args:
+            query_engine: Engine to query through (default: a new QueryEngine)
+        """
+        self.query_engine = query_engine or QueryEngine()
 
     def compare_periods(
         self,
@@ -41,13 +60,9 @@ class PeriodComparator:
         Returns:
             Comparison results with changes and percentages
         """
-        # Query both periods
-        metrics1 = self.query_engine.query_metrics(
+        # Query both periods in one round trip
+        metrics1, metrics2 = self.query_engine.query_metrics_two_periods(
             period1,
-            metric_name=metric_name,
-            data_scope=data_scope
-        )
-        metrics2 = self.query_engine.query_metrics(
             period2,
             metric_name=metric_name,
             data_scope=data_scope
@@ -109,47 +124,34 @@ class PeriodComparator:
         if not metrics:
             return {}
 
-        result = {}
-
-        # Sum metrics
-        total_sessions = sum(m.get('sessions') or 0 for m in metrics)
-        result['sessions'] = total_sessions
-        result['users'] = sum(m.get('users') or 0 for m in metrics)
-        result['page_views'] = sum(m.get('page_views') or 0 for m in metrics)
-
-        # Device breakdown
-        result['mobile_sessions'] = sum(m.get('mobile_sessions') or 0 for m in metrics)
-        result['desktop_sessions'] = sum(m.get('desktop_sessions') or 0 for m in metrics)
-        result['tablet_sessions'] = sum(m.get('tablet_sessions') or 0 for m in metrics)
-
-        # Frustration signals
-        result['dead_clicks'] = sum(m.get('dead_clicks') or 0 for m in metrics)
-        result['rage_clicks'] = sum(m.get('rage_clicks') or 0 for m in metrics)
-        result['quick_backs'] = sum(m.get('quick_backs') or 0 for m in metrics)
-        result['error_clicks'] = sum(m.get('error_clicks') or 0 for m in metrics)
+        # Metric rows as one (rows x keys) matrix; missing/None as 0. Summed in
+        # float64 so fractional values are kept, as sum() over the rows would
+        n = len(metrics)
+        counts = np.fromiter(
+            (m.get(key) or 0 for m in metrics for key in SUM_KEYS),
+            dtype=np.float64, count=n * len(SUM_KEYS)
+        ).reshape(n, len(SUM_KEYS))
+
+        # Sums: traffic, device breakdown, frustration signals (int when whole)
+        result = {
+            key: int(total) if total.is_integer() else float(total)
+            for key, total in zip(SUM_KEYS, counts.sum(axis=0))
+        }
+        total_sessions = result['sessions']
 
         # Engagement (weighted averages)
         if total_sessions > 0:
-            result['avg_scroll_depth'] = sum(
-                (m.get('avg_scroll_depth') or 0) * (m.get('sessions') or 0)
-                for m in metrics
-            ) / total_sessions
-
-            result['avg_time_on_page'] = sum(
-                (m.get('avg_time_on_page') or 0) * (m.get('sessions') or 0)
-                for m in metrics
-            ) / total_sessions
-
-            result['avg_active_time'] = sum(
-                (m.get('avg_active_time') or 0) * (m.get('sessions') or 0)
-                for m in metrics
-            ) / total_sessions
+            values = np.fromiter(
+                (m.get(key) or 0 for m in metrics for key in WEIGHTED_KEYS),
+                dtype=np.float64, count=n * len(WEIGHTED_KEYS)
+            ).reshape(n, len(WEIGHTED_KEYS))
+            weighted = counts[:, SUM_KEYS.index('sessions')] @ values / total_sessions
+            for key, value in zip(WEIGHTED_KEYS, weighted):
+                result[key] = float(value)
 
             # Rates per session
-            result['dead_clicks_rate'] = result['dead_clicks'] / total_sessions
-            result['rage_clicks_rate'] = result['rage_clicks'] / total_sessions
-            result['quick_backs_rate'] = result['quick_backs'] / total_sessions
-            result['error_clicks_rate'] = result['error_clicks'] / total_sessions
+            for key in RATE_KEYS:
+                result[f'{key}_rate'] = result[key] / total_sessions
 
         return result
 
@@ -5,17 +5,86 @@ import sqlite3
 import re
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Union
+from typing import Any, List, Dict, Optional, Tuple, Union
 from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import config
 
-
-@dataclass
+SCHEMA_PATH = Path(__file__).parent.parent / "database" / "schema_v2.sql"
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Per-metric column totals shared by the grouped aggregate queries
+TOTALS_COLUMNS = """
+    COUNT(*) as data_points,
+    COALESCE(SUM(sessions), 0) as sessions,
+    COALESCE(SUM(users), 0) as users,
+    COALESCE(SUM(bot_sessions), 0) as bot_sessions,
+    COALESCE(SUM(dead_clicks), 0) as dead_clicks,
+    COALESCE(SUM(rage_clicks), 0) as rage_clicks,
+    COALESCE(SUM(quick_backs), 0) as quick_backs,
+    COALESCE(SUM(error_clicks), 0) as error_clicks,
+    COALESCE(SUM(script_errors), 0) as script_errors,
+    COALESCE(SUM(scroll_depth), 0) as scroll_depth,
+    COUNT(NULLIF(scroll_depth, 0)) as scroll_depth_count,
+    COALESCE(SUM(engagement_time), 0) as engagement_time,
+    COUNT(NULLIF(engagement_time, 0)) as engagement_time_count
+"""
+
+# daily_metrics row projection with NULL counts read back as 0
+METRIC_ROW_COLUMNS = """
+    id, metric_date, fetch_timestamp, metric_name, data_scope, page_id,
+    dimension1_name, dimension1_value,
+    dimension2_name, dimension2_value,
+    dimension3_name, dimension3_value,
+    COALESCE(sessions, 0) as sessions,
+    COALESCE(users, 0) as users,
+    COALESCE(bot_sessions, 0) as bot_sessions,
+    pages_per_session,
+    COALESCE(dead_clicks, 0) as dead_clicks,
+    COALESCE(rage_clicks, 0) as rage_clicks,
+    COALESCE(quick_backs, 0) as quick_backs,
+    COALESCE(error_clicks, 0) as error_clicks,
+    COALESCE(script_errors, 0) as script_errors,
+    COALESCE(excessive_scrolls, 0) as excessive_scrolls,
+    scroll_depth, engagement_time, active_time,
+    source_file, raw_json
+"""
+
+# Integer count columns query_metrics_columns can return as arrays
+COUNT_COLUMNS = (
+    'sessions', 'users', 'bot_sessions',
+    'dead_clicks', 'rage_clicks', 'quick_backs',
+    'error_clicks', 'script_errors', 'excessive_scrolls',
+)
+
+# The same totals re-summed from the pre-aggregated daily_rollup table
+ROLLUP_TOTALS_COLUMNS = """
+    SUM(data_points) as data_points,
+    SUM(sessions) as sessions,
+    SUM(users) as users,
+    SUM(bot_sessions) as bot_sessions,
+    SUM(dead_clicks) as dead_clicks,
+    SUM(rage_clicks) as rage_clicks,
+    SUM(quick_backs) as quick_backs,
+    SUM(error_clicks) as error_clicks,
+    SUM(script_errors) as script_errors,
+    SUM(scroll_depth) as scroll_depth,
+    SUM(scroll_depth_count) as scroll_depth_count,
+    SUM(engagement_time) as engagement_time,
+    SUM(engagement_time_count) as engagement_time_count
+"""
+
+
+@dataclass(frozen=True)
 class DateRange:
-    """Represents a date range."""
+    """Represents a date range (immutable, so parsed ranges can be shared)."""
     start: date
     end: date
     description: str = ""
@@ -31,6 +100,35 @@ class DateRange:
         return f"{self.start} to {self.end}"
 
 
+# Date expression patterns, compiled once at import
+NUMERIC_RE = re.compile(r'^(\d+)\s*(d|days?|w|weeks?|m|months?)?$', re.I)
+ISO_MONTH_RE = re.compile(r'^(\d{4})-(\d{1,2})$')
+QUARTER_RE = re.compile(r'^(?:(\d{4})[-\s]?Q(\d)|Q(\d)[-\s]?(\d{4}))$', re.I)
+YEAR_RE = re.compile(r'^(\d{4})$')
+ANY_YEAR_RE = re.compile(r'(\d{4})')
+RANGE_TO_RE = re.compile(r'^(\d{4}-\d{2}-\d{2})\s+to\s+(\d{4}-\d{2}-\d{2})$', re.I)
+RANGE_COLON_RE = re.compile(r'^(\d{4}-\d{2}-\d{2}):(\d{4}-\d{2}-\d{2})$')
+
+# Month names and abbreviations -> month number
+MONTH_NAMES = {
+    'january': 1, 'jan': 1,
+    'february': 2, 'feb': 2,
+    'march': 3, 'mar': 3,
+    'april': 4, 'apr': 4,
+    'may': 5,
+    'june': 6, 'jun': 6,
+    'july': 7, 'jul': 7,
+    'august': 8, 'aug': 8,
+    'september': 9, 'sep': 9, 'sept': 9,
+    'october': 10, 'oct': 10,
+    'november': 11, 'nov': 11,
+    'december': 12, 'dec': 12,
+}
+
+# Leading month name, tried in MONTH_NAMES order like a startswith() scan
+MONTH_PREFIX_RE = re.compile('|'.join(MONTH_NAMES))
+
+
 class DateParser:
     """Parse flexible date expressions into date ranges."""
 
@@ -61,8 +159,16 @@ class DateParser:
         if reference_date is None:
             reference_date = date.today()
 
-        expression = expression.strip()
+        return DateParser._parse_cached(expression.strip(), reference_date)
 
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _parse_cached(expression: str, reference_date: date) -> DateRange:
+        """Parse a stripped expression against a resolved reference date.
+
+        A pure function of its arguments, so results are memoized; failures
+        raise ValueError and are not cached.
+        """
         # Try different parsers in order (specific to general)
         parsers = [
             DateParser._parse_custom_range,
@@ -87,7 +193,7 @@ class DateParser:
     def _parse_numeric(expr: str, ref_date: date) -> Optional[DateRange]:
         """Parse numeric expressions like '3', '7days', '2weeks'."""
         # Match: 3, 7d, 30days, 2weeks, 1month, etc.
-        match = re.match(r'^(\d+)\s*(d|days?|w|weeks?|m|months?)?$', expr, re.I)
+        match = NUMERIC_RE.match(expr)
         if not match:
             return None
 
@@ -151,7 +257,7 @@ class DateParser:
     def _parse_month(expr: str, ref_date: date) -> Optional[DateRange]:
         """Parse month expressions like '2025-11', 'November', 'Nov 2025'."""
         # Format: YYYY-MM
-        match = re.match(r'^(\d{4})-(\d{1,2})$', expr)
+        match = ISO_MONTH_RE.match(expr)
         if match:
             year = int(match.group(1))
             month = int(match.group(2))
@@ -163,46 +269,30 @@ class DateParser:
                 end_date = date(year, month + 1, 1) - timedelta(days=1)
             return DateRange(start_date, end_date, f"{start_date.strftime('%B %Y')}")
 
-        # Month name (current year or specified year)
-        month_names = {
-            'january': 1, 'jan': 1,
-            'february': 2, 'feb': 2,
-            'march': 3, 'mar': 3,
-            'april': 4, 'apr': 4,
-            'may': 5,
-            'june': 6, 'jun': 6,
-            'july': 7, 'jul': 7,
-            'august': 8, 'aug': 8,
-            'september': 9, 'sep': 9, 'sept': 9,
-            'october': 10, 'oct': 10,
-            'november': 11, 'nov': 11,
-            'december': 12, 'dec': 12,
-        }
-
-        expr_lower = expr.lower().strip()
+        # Month name (current year or specified year): "Month Year" or "Month YYYY"
+        match = MONTH_PREFIX_RE.match(expr.lower().strip())
+        if not match:
+            return None
 
-        # Try "Month Year" or "Month YYYY"
-        for month_name, month_num in month_names.items():
-            if expr_lower.startswith(month_name):
-                # Extract year if present
-                year_match = re.search(r'(\d{4})', expr)
-                year = int(year_match.group(1)) if year_match else ref_date.year
+        month_num = MONTH_NAMES[match.group(0)]
 
-                start_date = date(year, month_num, 1)
-                if month_num == 12:
-                    end_date = date(year, 12, 31)
-                else:
-                    end_date = date(year, month_num + 1, 1) - timedelta(days=1)
+        # Extract year if present
+        year_match = ANY_YEAR_RE.search(expr)
+        year = int(year_match.group(1)) if year_match else ref_date.year
 
-                return DateRange(start_date, end_date, f"{start_date.strftime('%B %Y')}")
+        start_date = date(year, month_num, 1)
+        if month_num == 12:
+            end_date = date(year, 12, 31)
+        else:
+            end_date = date(year, month_num + 1, 1) - timedelta(days=1)
 
-        return None
+        return DateRange(start_date, end_date, f"{start_date.strftime('%B %Y')}")
 
     @staticmethod
     def _parse_quarter(expr: str, ref_date: date) -> Optional[DateRange]:
         """Parse quarter expressions like '2025-Q4', 'Q4 2025', '2025Q4'."""
         # Match: 2025-Q4, Q4 2025, 2025Q4, etc.
-        match = re.match(r'^(?:(\d{4})[-\s]?Q(\d)|Q(\d)[-\s]?(\d{4}))$', expr, re.I)
+        match = QUARTER_RE.match(expr)
         if not match:
             return None
 
@@ -227,7 +317,7 @@ class DateParser:
     @staticmethod
     def _parse_year(expr: str, ref_date: date) -> Optional[DateRange]:
         """Parse year expressions like '2025'."""
-        match = re.match(r'^(\d{4})$', expr)
+        match = YEAR_RE.match(expr)
         if not match:
             return None
 
@@ -241,10 +331,10 @@ class DateParser:
     def _parse_custom_range(expr: str, ref_date: date) -> Optional[DateRange]:
         """Parse custom range like '2025-11-01 to 2025-11-30' or '2025-11-01:2025-11-30'."""
         # Try "DATE to DATE" format
-        match = re.match(r'^(\d{4}-\d{2}-\d{2})\s+to\s+(\d{4}-\d{2}-\d{2})$', expr, re.I)
+        match = RANGE_TO_RE.match(expr)
         if not match:
             # Try "DATE:DATE" format
-            match = re.match(r'^(\d{4}-\d{2}-\d{2}):(\d{4}-\d{2}-\d{2})$', expr)
+            match = RANGE_COLON_RE.match(expr)
 
         if not match:
             return None
@@ -268,13 +358,76 @@ class QueryEngine:
             db_path: Path to database file (default: from config)
         """
         self.db_path = db_path or config.DB_PATH
+        self._conn = None
+        self._ensure_schema()
 
     def get_connection(self) -> sqlite3.Connection:
-        """Get database connection."""
-        conn = sqlite3.connect(self.db_path)
+        """Get a new database connection (caller closes it)."""
+        conn = sqlite3.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE)
         conn.row_factory = sqlite3.Row
         return conn
 
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Long-lived connection shared by all queries of this engine.
+
+        Reusing one connection keeps SQLite's prepared-statement cache warm
+        across the many parameterized metric queries issued per report.
+        """
+        if self._conn is None:
+            self._conn = self.get_connection()
+        return self._conn
+
+    def close(self):
+        """Close the shared connection (reopened on next query)."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _ensure_schema(self):
+        """Bring databases created by older schema versions up to date.
+
+        Idempotent: re-applies schema_v2.sql (all statements are
+        IF NOT EXISTS) when the daily_rollup table is missing and backfills
+        it from daily_metrics. A newly created (scope, metric, date) index is
+        followed by a one-off ANALYZE so the planner prefers it over the
+        single-column date index.
+        """
+        cursor = self.conn.execute("""
+            SELECT name FROM sqlite_master
+            WHERE name IN ('daily_metrics', 'daily_rollup', 'idx_daily_scope_metric_date')
+        """)
+        existing = {row['name'] for row in cursor.fetchall()}
+
+        # Database not initialized yet
+        if 'daily_metrics' not in existing:
+            return
+
+        if 'daily_rollup' not in existing:
+            self.conn.executescript(SCHEMA_PATH.read_text())
+            self.conn.execute(f"""
+                INSERT OR REPLACE INTO daily_rollup (
+                    data_scope, metric_name, metric_date, data_points,
+                    sessions, users, bot_sessions,
+                    dead_clicks, rage_clicks, quick_backs, error_clicks, script_errors,
+                    scroll_depth, scroll_depth_count,
+                    engagement_time, engagement_time_count
+                )
+                SELECT data_scope, metric_name, metric_date, {TOTALS_COLUMNS}
+                FROM daily_metrics
+                WHERE data_scope IS NOT NULL
+                GROUP BY data_scope, metric_name, metric_date
+            """)
+
+        if 'idx_daily_scope_metric_date' not in existing:
+            self.conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_daily_scope_metric_date
+                ON daily_metrics(data_scope, metric_name, metric_date)
+            """)
+            self.conn.execute("ANALYZE daily_metrics")
+
+        self.conn.commit()
+
     def query_metrics(
         self,
         date_range: Union[str, DateRange],
@@ -295,45 +448,220 @@ class QueryEngine:
             dimension1_value: First dimension value filter
 
         Returns:
-            List of metric dictionaries
+            List of metric dictionaries, oldest first (NULL counts read back as 0)
         """
         # Parse date range if string
         if isinstance(date_range, str):
             date_range = DateParser.parse(date_range)
 
-        conn = self.get_connection()
-        try:
-            query = """
-                SELECT *
+        query = f"""
+            SELECT {METRIC_ROW_COLUMNS}
+            FROM daily_metrics
+            WHERE metric_date BETWEEN ? AND ?
+              AND data_scope = ?
+        """
+        params = [date_range.start, date_range.end, data_scope]
+
+        if metric_name:
+            query += " AND metric_name = ?"
+            params.append(metric_name)
+
+        if page_id:
+            query += " AND page_id = ?"
+            params.append(page_id)
+
+        if dimension1:
+            query += " AND dimension1_name = ?"
+            params.append(dimension1)
+
+            if dimension1_value:
+                query += " AND dimension1_value = ?"
+                params.append(dimension1_value)
+
+        query += " ORDER BY metric_date, metric_name, id"
+
+        cursor = self.conn.execute(query, params)
+        return [dict(row) for row in cursor.fetchall()]
+
+    def query_metrics_batch(
+        self,
+        date_range: Union[str, DateRange],
+        specs: List[Dict[str, Optional[str]]],
+    ) -> List[List[Dict]]:
+        """Run several query_metrics filters over one date range in one query.
+
+        The date range is read once into a CTE, and each spec selects its
+        rows from it, tagged with the spec's position.
+
+        Args:
+            date_range: Date range (string expression or DateRange object)
+            specs: Filters per query, each with optional 'metric_name',
+                'data_scope' (default 'general') and 'page_id'
+
+        Returns:
+            One row list per spec, each as query_metrics would return it
+
+        Raises:
+            ValueError: If a spec has an unknown filter key
+        """
+        allowed = {'metric_name', 'data_scope', 'page_id'}
+        for spec in specs:
+            unknown = set(spec) - allowed
+            if unknown:
+                raise ValueError(f"Unknown query filters: {sorted(unknown)}")
+
+        if not specs:
+            return []
+
+        # Parse date range if string
+        if isinstance(date_range, str):
+            date_range = DateParser.parse(date_range)
+
+        params = [date_range.start, date_range.end]
+        selects = []
+        for tag, spec in enumerate(specs):
+            select = f"SELECT {tag} as batch_tag, * FROM base WHERE data_scope = ?"
+            params.append(spec.get('data_scope', 'general'))
+
+            if spec.get('metric_name'):
+                select += " AND metric_name = ?"
+                params.append(spec['metric_name'])
+
+            if spec.get('page_id'):
+                select += " AND page_id = ?"
+                params.append(spec['page_id'])
+
+            selects.append(select)
+
+        query = f"""
+            WITH base AS (
+                SELECT {METRIC_ROW_COLUMNS}
                 FROM daily_metrics
                 WHERE metric_date BETWEEN ? AND ?
-                  AND data_scope = ?
-            """
-            params = [date_range.start, date_range.end, data_scope]
+            )
+            {" UNION ALL ".join(selects)}
+            ORDER BY batch_tag, metric_date, metric_name, id
+        """
 
-            if metric_name:
-                query += " AND metric_name = ?"
-                params.append(metric_name)
+        results = [[] for _ in specs]
+        for row in self.conn.execute(query, params).fetchall():
+            metric = dict(row)
+            results[metric.pop('batch_tag')].append(metric)
+        return results
 
-            if page_id:
-                query += " AND page_id = ?"
-                params.append(page_id)
+    def query_metrics_two_periods(
+        self,
+        period1: DateRange,
+        period2: DateRange,
+        metric_name: Optional[str] = None,
+        data_scope: str = 'general',
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """Query metric rows for two periods in a single query.
 
-            if dimension1:
-                query += " AND dimension1_name = ?"
-                params.append(dimension1)
+        Rows are tagged by the period they fall in and split afterwards.
+        Overlapping periods share rows, so they fall back to two queries.
 
-                if dimension1_value:
-                    query += " AND dimension1_value = ?"
-                    params.append(dimension1_value)
+        Args:
+            period1: First period
+            period2: Second period
+            metric_name: Filter by metric name (optional)
+            data_scope: 'general' or 'page'
 
-            query += " ORDER BY metric_date DESC, metric_name"
+        Returns:
+            (period1 rows, period2 rows), each as from query_metrics
+        """
+        if period1.start <= period2.end and period2.start <= period1.end:
+            return (
+                self.query_metrics(period1, metric_name=metric_name, data_scope=data_scope),
+                self.query_metrics(period2, metric_name=metric_name, data_scope=data_scope),
+            )
+
+        query = f"""
+            SELECT metric_date BETWEEN ? AND ? as in_period1,
+                   {METRIC_ROW_COLUMNS}
+            FROM daily_metrics
+            WHERE (metric_date BETWEEN ? AND ? OR metric_date BETWEEN ? AND ?)
+              AND data_scope = ?
+        """
+        params = [
+            period1.start, period1.end,
+            period1.start, period1.end,
+            period2.start, period2.end,
+            data_scope,
+        ]
 
-            cursor = conn.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+        if metric_name:
+            query += " AND metric_name = ?"
+            params.append(metric_name)
 
-        finally:
-            conn.close()
+        query += " ORDER BY metric_date, metric_name, id"
+
+        rows1, rows2 = [], []
+        for row in self.conn.execute(query, params).fetchall():
+            metric = dict(row)
+            (rows1 if metric.pop('in_period1') else rows2).append(metric)
+        return rows1, rows2
+
+    def query_metrics_columns(
+        self,
+        date_range: Union[str, DateRange],
+        columns: Tuple[str, ...] = COUNT_COLUMNS,
+        metric_name: Optional[str] = None,
+        data_scope: str = 'general',
+        page_id: Optional[str] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Query count columns as numpy arrays, oldest row first.
+
+        Rows come back as plain tuples (no row factory) and are converted
+        to one int64 matrix, so no per-row dict is ever built.
+
+        Args:
+            date_range: Date range (string expression or DateRange object)
+            columns: Count columns to return (subset of COUNT_COLUMNS)
+            metric_name: Filter by metric name (optional)
+            data_scope: 'general' or 'page'
+            page_id: Page ID filter (for page scope)
+
+        Returns:
+            Dict of column name -> int64 array (NULL as 0), plus
+            'metric_date' -> array of ISO date strings
+        """
+        unknown = set(columns) - set(COUNT_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown count columns: {sorted(unknown)}")
+
+        # Parse date range if string
+        if isinstance(date_range, str):
+            date_range = DateParser.parse(date_range)
+
+        projection = ", ".join(f"COALESCE({c}, 0)" for c in columns)
+        query = f"""
+            SELECT metric_date, {projection}
+            FROM daily_metrics
+            WHERE metric_date BETWEEN ? AND ?
+              AND data_scope = ?
+        """
+        params = [date_range.start, date_range.end, data_scope]
+
+        if metric_name:
+            query += " AND metric_name = ?"
+            params.append(metric_name)
+
+        if page_id:
+            query += " AND page_id = ?"
+            params.append(page_id)
+
+        query += " ORDER BY metric_date, metric_name, id"
+
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        rows = cursor.execute(query, params).fetchall()
+
+        counts = np.array([row[1:] for row in rows], dtype=np.int64).reshape(len(rows), len(columns))
+        result = {'metric_date': np.array([row[0] for row in rows], dtype=str)}
+        for i, column in enumerate(columns):
+            result[column] = counts[:, i]
+        return result
 
     def aggregate_metrics(
         self,
@@ -357,46 +685,155 @@ class QueryEngine:
         if isinstance(date_range, str):
             date_range = DateParser.parse(date_range)
 
-        conn = self.get_connection()
-        try:
-            query = """
+        query = """
+            SELECT
+                COUNT(*) as data_points,
+                AVG(sessions) as avg_sessions,
+                SUM(sessions) as total_sessions,
+                MIN(sessions) as min_sessions,
+                MAX(sessions) as max_sessions,
+                AVG(users) as avg_users,
+                SUM(users) as total_users,
+                AVG(dead_clicks) as avg_dead_clicks,
+                AVG(rage_clicks) as avg_rage_clicks,
+                AVG(quick_backs) as avg_quick_backs,
+                AVG(scroll_depth) as avg_scroll_depth,
+                AVG(engagement_time) as avg_engagement_time
+            FROM daily_metrics
+            WHERE metric_date BETWEEN ? AND ?
+              AND metric_name = ?
+              AND data_scope = ?
+        """
+        params = [date_range.start, date_range.end, metric_name, data_scope]
+
+        if page_id:
+            query += " AND page_id = ?"
+            params.append(page_id)
+
+        cursor = self.conn.execute(query, params)
+        result = cursor.fetchone()
+
+        return {
+            'date_range': str(date_range),
+            'start_date': date_range.start,
+            'end_date': date_range.end,
+            'days': date_range.days,
+            **dict(result)
+        }
+
+    def aggregate_metric_totals(
+        self,
+        date_range: Union[str, DateRange],
+        metric_names: List[str],
+        data_scope: str = 'general',
+        page_id: Optional[str] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Sum metric columns per metric name in a single GROUP BY query.
+
+        Reads the pre-aggregated daily_rollup table unless a page filter is
+        given.
+
+        Args:
+            date_range: Date range to aggregate
+            metric_names: Metric names to include
+            data_scope: 'general' or 'page'
+            page_id: Page ID (for page scope)
+
+        Returns:
+            Dictionary mapping metric name to its column totals. Metrics with
+            no rows in the range are omitted. The ``*_count`` entries count
+            rows with a non-zero value, for averaging sparse columns.
+        """
+        # Parse date range if string
+        if isinstance(date_range, str):
+            date_range = DateParser.parse(date_range)
+
+        if not metric_names:
+            return {}
+
+        placeholders = ", ".join("?" for _ in metric_names)
+        if page_id:
+            # Per-page totals come from the raw rows
+            query = f"""
                 SELECT
-                    COUNT(*) as data_points,
-                    AVG(sessions) as avg_sessions,
-                    SUM(sessions) as total_sessions,
-                    MIN(sessions) as min_sessions,
-                    MAX(sessions) as max_sessions,
-                    AVG(users) as avg_users,
-                    SUM(users) as total_users,
-                    AVG(dead_clicks) as avg_dead_clicks,
-                    AVG(rage_clicks) as avg_rage_clicks,
-                    AVG(quick_backs) as avg_quick_backs,
-                    AVG(scroll_depth) as avg_scroll_depth,
-                    AVG(engagement_time) as avg_engagement_time
+                    metric_name,
+                    {TOTALS_COLUMNS}
                 FROM daily_metrics
                 WHERE metric_date BETWEEN ? AND ?
-                  AND metric_name = ?
                   AND data_scope = ?
+                  AND metric_name IN ({placeholders})
+                  AND page_id = ?
+            """
+            params = [date_range.start, date_range.end, data_scope, *metric_names, page_id]
+        else:
+            query = f"""
+                SELECT
+                    metric_name,
+                    {ROLLUP_TOTALS_COLUMNS}
+                FROM daily_rollup
+                WHERE metric_date BETWEEN ? AND ?
+                  AND data_scope = ?
+                  AND metric_name IN ({placeholders})
             """
-            params = [date_range.start, date_range.end, metric_name, data_scope]
+            params = [date_range.start, date_range.end, data_scope, *metric_names]
 
-            if page_id:
-                query += " AND page_id = ?"
-                params.append(page_id)
+        query += " GROUP BY metric_name"
 
-            cursor = conn.execute(query, params)
-            result = cursor.fetchone()
+        cursor = self.conn.execute(query, params)
+        return {row['metric_name']: dict(row) for row in cursor.fetchall()}
 
-            return {
-                'date_range': str(date_range),
-                'start_date': date_range.start,
-                'end_date': date_range.end,
-                'days': date_range.days,
-                **dict(result)
-            }
+    def aggregate_metrics_two_periods(
+        self,
+        current: DateRange,
+        previous: DateRange,
+        metric_names: List[str],
+        data_scope: str = 'general',
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Sum metric columns for two periods in a single query.
 
-        finally:
-            conn.close()
+        Rollup rows are tagged 'current' when they fall inside ``current``
+        and 'previous' otherwise, so both periods are read in one query.
+
+        Args:
+            current: Current period
+            previous: Previous (comparison) period
+            metric_names: Metric names to include
+            data_scope: 'general' or 'page'
+
+        Returns:
+            Dictionary mapping (period, metric_name) to column totals, where
+            period is 'current' or 'previous'
+        """
+        if not metric_names:
+            return {}
+
+        placeholders = ", ".join("?" for _ in metric_names)
+        query = f"""
+            SELECT
+                CASE WHEN metric_date BETWEEN ? AND ?
+                     THEN 'current' ELSE 'previous' END as period,
+                metric_name,
+                {ROLLUP_TOTALS_COLUMNS}
+            FROM daily_rollup
+            WHERE (metric_date BETWEEN ? AND ? OR metric_date BETWEEN ? AND ?)
+              AND data_scope = ?
+              AND metric_name IN ({placeholders})
+            GROUP BY period, metric_name
+        """
+        params = [
+            current.start, current.end,
+            current.start, current.end,
+            previous.start, previous.end,
+            data_scope, *metric_names,
+        ]
+
+        cursor = self.conn.execute(query, params)
+        results = {}
+        for row in cursor.fetchall():
+            totals = dict(row)
+            period = totals.pop('period')
+            results[(period, row['metric_name'])] = totals
+        return results
 
     def get_available_dates(self, data_scope: str = 'general') -> List[date]:
         """Get list of dates with available data.
@@ -407,19 +844,14 @@ class QueryEngine:
         Returns:
             List of dates with data
         """
-        conn = self.get_connection()
-        try:
-            cursor = conn.execute("""
-                SELECT DISTINCT metric_date
-                FROM daily_metrics
-                WHERE data_scope = ?
-                ORDER BY metric_date DESC
-            """, (data_scope,))
-
-            return [row['metric_date'] for row in cursor.fetchall()]
+        cursor = self.conn.execute("""
+            SELECT DISTINCT metric_date
+            FROM daily_metrics
+            WHERE data_scope = ?
+            ORDER BY metric_date DESC
+        """, (data_scope,))
 
-        finally:
-            conn.close()
+        return [row['metric_date'] for row in cursor.fetchall()]
 
 
 if __name__ == "__main__":
@@ -469,7 +901,7 @@ if __name__ == "__main__":
         print(f"\n  Last week Traffic metrics: {len(metrics)} records")
 
         if metrics:
-            sample = metrics[0]
+            sample = metrics[-1]  # Rows are oldest first; show the newest
             print(f"    Sample: {sample.get('metric_date')} - {sample.get('sessions')} sessions")
 
     print("\n✅ Query engine tests complete!")
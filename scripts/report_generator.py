@@ -3,18 +3,208 @@
 Database-driven report generator using universal templates.
 """
 
+import os
+import re
 import sqlite3
 import yaml
+from collections import ChainMap
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
 from datetime import datetime, date
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Mapping, Optional, Any, Set, Tuple
 import sys
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scripts.query_engine import QueryEngine, DateRange, DateParser
-from config_loader import load_config
+from config_loader import load_config, YAML_LOADER
+
+# Clarity metrics summarized by every report
+REPORT_METRICS = [
+    "Traffic",
+    "DeadClickCount",
+    "RageClickCount",
+    "QuickbackClick",
+    "ErrorClickCount",
+    "ScriptErrorCount",
+    "EngagementTime",
+    "ScrollDepth",
+]
+
+# Health score thresholds as (rate key, critical above, warning above), in %
+HEALTH_THRESHOLDS = (
+    ('DEAD_CLICK_RATE', 5, 2),
+    ('RAGE_CLICK_RATE', 1, 0.5),
+    ('QUICK_BACK_RATE', 10, 5),
+    ('ERROR_CLICK_RATE', 1, 0),
+    ('SCRIPT_ERROR_RATE', 0.5, 0),
+)
+
+# Placeholder tokens such as {TOTAL_SESSIONS}
+_PLACEHOLDER_RE = re.compile(r"\{([A-Z][A-Z0-9_]*)\}")
+
+
+@lru_cache(maxsize=64)
+def _parse_template(text: str) -> tuple:
+    """Split template text into (is_literal, text_or_placeholder) segments."""
+    parts = _PLACEHOLDER_RE.split(text)
+    # re.split puts the captured placeholder names at odd indices
+    return tuple((i % 2 == 0, part) for i, part in enumerate(parts) if part or i % 2)
+
+
+@lru_cache(maxsize=64)
+def _template_placeholders(text: str) -> frozenset:
+    """Names of all placeholders used in template text."""
+    return frozenset(seg for is_literal, seg in _parse_template(text) if not is_literal)
+
+
+def _split_frontmatter(content: str) -> tuple:
+    """Split template content into (frontmatter dict, body)."""
+    if not content.startswith("---"):
+        return {}, content
+
+    parts = content.split("---", 2)
+    if len(parts) < 3:
+        return {}, content
+
+    try:
+        frontmatter = yaml.load(parts[1], Loader=YAML_LOADER)
+        if frontmatter is None:
+            frontmatter = {}
+    except:
+        frontmatter = {}
+
+    return frontmatter, parts[2]
+
+
+@lru_cache(maxsize=32)
+def _load_template(path: Path, mtime_ns: int) -> tuple:
+    """Read a template as (dumped frontmatter YAML, body), cached per mtime."""
+    with open(path, 'r') as f:
+        content = f.read()
+    frontmatter, body = _split_frontmatter(content)
+    return yaml.dump(frontmatter), body
+
+
+# Shared placeholder texts
+_NA = "N/A"
+_REQ_PAGE_DATA = "Requires page-level data collection"
+_REQ_JOURNEY_DATA = "Requires user journey data"
+_REQ_DEVICE_FRUSTRATION = "Requires device-level frustration data"
+
+# Insight placeholders whose text never depends on report data
+_STATIC_INSIGHTS = {
+    'PAGES_WITH_DEAD_CLICKS': "multiple",  # Placeholder - would need page-level data
+    'PAGES_WITH_RAGE_CLICKS': "multiple",  # Placeholder - would need page-level data
+    'TOP_TRAFFIC_SOURCES': "Direct, Organic Search, Social Media",  # Placeholder - would need source data
+    'PERIOD_COMPARISON': "Period comparison data not available",  # Placeholder
+    # Frustration Analysis specific placeholders
+    'EXCESSIVE_SCROLL_COUNT': "0",
+    'EXCESSIVE_SCROLL_SESSIONS': "0",
+    'EXCESSIVE_SCROLL_PERCENTAGE': "0.0",
+    'QUICK_BACK_BY_PAGE': _REQ_PAGE_DATA,
+    'RAGE_CLICK_BY_PAGE': _REQ_PAGE_DATA,
+    'HIGH_FRUSTRATION_SOURCES': "Pages with >10% frustration rate",
+    'LOW_FRUSTRATION_SOURCES': "Pages with <2% frustration rate",
+    # Device Performance specific placeholders
+    'MOBILE_ENGAGEMENT': _NA,
+    'MOBILE_PAGES': _NA,
+    'MOBILE_FRUSTRATION': _NA,
+    'DESKTOP_ENGAGEMENT': _NA,
+    'DESKTOP_PAGES': _NA,
+    'DESKTOP_FRUSTRATION': _NA,
+    'TABLET_ENGAGEMENT': _NA,
+    'TABLET_PAGES': _NA,
+    'TABLET_FRUSTRATION': _NA,
+    'OTHER_ENGAGEMENT': _NA,
+    'OTHER_PAGES': _NA,
+    'OTHER_FRUSTRATION': _NA,
+    'MOBILE_VS_DESKTOP_ENGAGEMENT': "Requires device dimension data",
+    'MOBILE_VS_DESKTOP_REC': "Enable device tracking for detailed comparison",
+    'MOBILE_FRUSTRATION_DETAIL': _REQ_DEVICE_FRUSTRATION,
+    'DESKTOP_FRUSTRATION_DETAIL': _REQ_DEVICE_FRUSTRATION,
+    # Geographic Insights specific placeholders
+    'COUNTRY_COUNT': "Data collection needed",
+    'REGIONAL_ANALYSIS': "Geographic data collection not yet configured",
+    'TOP_MARKETS': "Requires country dimension data",
+    # Content Performance specific placeholders
+    'TOP_PAGES_TABLE': _REQ_PAGE_DATA,
+    'CATEGORY_PERFORMANCE': "Requires page categorization and metrics",
+    'REFERRER_ANALYSIS': "Requires referrer dimension data",
+    # Page-specific placeholders
+    'DEVICE_BREAKDOWN': "Requires page-level device data",
+    'REFERRER_BREAKDOWN': "Requires page-level referrer data",
+    'PREVIOUS_PAGES': _REQ_JOURNEY_DATA,
+    'NEXT_PAGES': _REQ_JOURNEY_DATA,
+    'PAGE_SUMMARY': "Page-level data collection not yet configured",
+    'SITE_BOUNCE_RATE': _NA,
+    'SITE_COMPARISON': "Page comparison requires page-level data",
+    'SCROLL_ISSUE_COUNT': "0",
+    'SCROLL_ISSUE_SESSIONS': "0",
+    'SCROLL_ISSUE_PCT': "0.0",
+    # Frustration-analysis template specific placeholders
+    'TECHNICAL_CAUSE_1': "UI elements styled as interactive but non-functional (dead clicks)",
+    'TECHNICAL_CAUSE_2': "Slow response times causing rage clicks",
+    'TECHNICAL_CAUSE_3': "Poor page load performance triggering quick backs",
+    'TECHNICAL_FIX_1': "Audit and fix clickability affordances (cursor feedback, hover states)",
+    'TECHNICAL_FIX_2': "Add loading indicators and optimize async operations",
+    'TECHNICAL_FIX_3': "Improve page load performance (<2s target)",
+    'UX_IMPROVEMENT_1': "Review visual design for misleading clickable elements",
+    'UX_IMPROVEMENT_2': "Add clear feedback for all interactive elements",
+    'UX_IMPROVEMENT_3': "Align landing page content with user expectations",
+    'MARKETING_REC_1': "Audit ad copy and meta descriptions for accuracy",
+    'MARKETING_REC_2': "Focus acquisition on lower-frustration traffic sources",
+}
+
+# Placeholders that render the same value as another (alias -> canonical)
+_ALIASES = {
+    'TECHNICAL_ACTIONS': 'TECHNICAL_INSIGHTS',
+    'UX_IMPROVEMENTS': 'UX_INSIGHTS',
+    'BUSINESS_IMPACT': 'BUSINESS_INSIGHTS',
+    'BUSINESS_OPPORTUNITIES': 'BUSINESS_INSIGHTS',
+    'MARKETING_RECOMMENDATIONS': 'MARKETING_INSIGHTS',
+    'QUICK_BACK_PCT': 'QUICK_BACK_PERCENTAGE',
+    'DEAD_CLICK_PCT': 'DEAD_CLICK_PERCENTAGE',
+    'RAGE_CLICK_PCT': 'RAGE_CLICK_PERCENTAGE',
+}
+
+# Placeholders produced by _calculate_health_score and _calculate_trends
+HEALTH_KEYS = frozenset({
+    'UX_HEALTH_SCORE', 'HEALTH_INDICATOR', 'CRITICAL_ISSUES_COUNT',
+    'WARNINGS_COUNT', 'GOOD_SIGNALS_COUNT',
+})
+TREND_KEYS = frozenset({
+    'SESSIONS_TREND', 'USERS_TREND', 'DEAD_CLICK_TREND', 'RAGE_CLICK_TREND',
+    'QUICK_BACK_TREND', 'SCROLL_DEPTH_TREND', 'ENGAGEMENT_TREND',
+})
+
+
+@lru_cache(maxsize=2048)
+def _fmt_int(n: int) -> str:
+    """Format an integer with thousands separators."""
+    return f"{n:,}"
+
+
+@lru_cache(maxsize=4096)
+def _extract_num(val) -> float:
+    """Parse a formatted number such as '1,234' or '49.6%' back into a float."""
+    if isinstance(val, str):
+        return float(val.replace(',', '').replace('%', ''))
+    return float(val) if val else 0
+
+
+def _health_indicator(score: int) -> str:
+    """Map a 0-100 health score to its display indicator."""
+    if score >= 80:
+        return "🟢 Excellent"
+    elif score >= 60:
+        return "🟡 Good"
+    elif score >= 40:
+        return "🟠 Fair"
+    return "🔴 Needs Attention"
 
 
 class ReportGenerator:
@@ -30,6 +220,7 @@ class ReportGenerator:
 
         self.templates_dir = Path(__file__).parent.parent / "templates"
         self.reports_dir = Path(__file__).parent.parent / "reports"
+        self._created_dirs = set()
 
     def generate_report(
         self,
@@ -50,35 +241,24 @@ class ReportGenerator:
         Returns:
             Path to generated report
         """
-        # Load template
+        # Load template (cached until the file changes)
         template_path = self._find_template(template_name)
-        with open(template_path, 'r') as f:
-            template_content = f.read()
-
-        # Extract YAML frontmatter
-        frontmatter, template_body = self._extract_frontmatter(template_content)
+        frontmatter_yaml, template_body = _load_template(
+            template_path, template_path.stat().st_mtime_ns
+        )
 
         # Gather data from database
         data = self._gather_data(date_range, page_id)
 
+        # Format placeholder values once, only for placeholders in use
+        needed = _template_placeholders(template_body) | _template_placeholders(frontmatter_yaml)
+        values = self._placeholder_values(data, date_range, page_id, needed)
+
         # Fill placeholders
-        report_content = self._fill_placeholders(
-            template_body,
-            data,
-            date_range,
-            page_id
-        )
+        report_content = self._apply_values(template_body, values)
 
         # Update frontmatter with actual values
-        frontmatter_filled = self._fill_placeholders(
-            yaml.dump(frontmatter),
-            data,
-            date_range,
-            page_id
-        )
-
-        # Combine frontmatter and body
-        final_report = f"---\n{frontmatter_filled}---\n\n{report_content}"
+        frontmatter_filled = self._apply_values(frontmatter_yaml, values)
 
         # Determine output path
         if output_path is None:
@@ -88,13 +268,67 @@ class ReportGenerator:
                 page_id
             )
 
-        # Write report
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'w') as f:
-            f.write(final_report)
+        # Write report (output directories are created once per generator)
+        output_dir = output_path.parent
+        if output_dir not in self._created_dirs:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(output_dir)
+
+        try:
+            self._write_report(output_path, frontmatter_filled, report_content)
+        except FileNotFoundError:
+            # Directory removed since it was first created
+            output_dir.mkdir(parents=True, exist_ok=True)
+            self._write_report(output_path, frontmatter_filled, report_content)
 
         return output_path
 
+    def generate_reports_batch(
+        self,
+        template_name: str,
+        date_range: DateRange,
+        page_ids: List[str],
+        max_workers: Optional[int] = None
+    ) -> List[Path]:
+        """
+        Generate page-specific reports in parallel worker processes.
+
+        Each worker builds its own ReportGenerator (and therefore its own
+        SQLite connection), since connections can't be shared across processes.
+
+        Args:
+            template_name: Name of template
+            date_range: Date range to generate reports for
+            page_ids: Page IDs to generate a report for
+            max_workers: Number of processes (default: CPU count)
+
+        Returns:
+            Paths to generated reports, in page_ids order
+        """
+        if not page_ids:
+            return []
+
+        workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(page_ids) // (4 * workers))
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(
+                _generate_page_report,
+                repeat(template_name),
+                repeat(date_range),
+                page_ids,
+                repeat(self.reports_dir),
+                chunksize=chunksize
+            ))
+
+    def _write_report(self, output_path: Path, frontmatter: str, body: str):
+        """Write frontmatter and body as separate chunks, always as UTF-8."""
+        with open(output_path, 'w', encoding='utf-8', newline='\n', buffering=1 << 20) as f:
+            f.write("---\n")
+            f.write(frontmatter)
+            f.write("---\n\n")
+            f.write(body)
+
     def _find_template(self, template_name: str) -> Path:
         """Find template file by name."""
         # Try general templates
@@ -111,21 +345,7 @@ class ReportGenerator:
 
     def _extract_frontmatter(self, content: str) -> tuple:
         """Extract YAML frontmatter from template."""
-        if not content.startswith("---"):
-            return {}, content
-
-        parts = content.split("---", 2)
-        if len(parts) < 3:
-            return {}, content
-
-        try:
-            frontmatter = yaml.safe_load(parts[1])
-            if frontmatter is None:
-                frontmatter = {}
-        except:
-            frontmatter = {}
-
-        return frontmatter, parts[2]
+        return _split_frontmatter(content)
 
     def _gather_data(
         self,
@@ -133,151 +353,92 @@ class ReportGenerator:
         page_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Gather all data needed for report."""
-        data = {}
-
-        # Query general traffic metrics
-        traffic_metrics = self.query_engine.query_metrics(
+        # Sum every report metric in one grouped query (Clarity stores
+        # traffic, frustration and engagement metrics as separate rows)
+        totals = self.query_engine.aggregate_metric_totals(
             date_range,
-            metric_name="Traffic",
+            REPORT_METRICS,
             data_scope="general"
         )
+        data = self._format_totals(totals)
 
-        # Query individual frustration metrics (Clarity stores them separately)
-        dead_clicks_metrics = self.query_engine.query_metrics(
-            date_range,
-            metric_name="DeadClickCount",
-            data_scope="general"
-        )
-
-        rage_clicks_metrics = self.query_engine.query_metrics(
-            date_range,
-            metric_name="RageClickCount",
-            data_scope="general"
-        )
-
-        quick_backs_metrics = self.query_engine.query_metrics(
-            date_range,
-            metric_name="QuickbackClick",
-            data_scope="general"
-        )
-
-        error_clicks_metrics = self.query_engine.query_metrics(
-            date_range,
-            metric_name="ErrorClickCount",
-            data_scope="general"
-        )
-
-        script_errors_metrics = self.query_engine.query_metrics(
-            date_range,
-            metric_name="ScriptErrorCount",
-            data_scope="general"
-        )
+        # Page-specific data
+        if page_id:
+            page_data = self._gather_page_data(date_range, page_id)
+            data.update(page_data)
 
-        # Query individual engagement metrics
-        engagement_time_metrics = self.query_engine.query_metrics(
-            date_range,
-            metric_name="EngagementTime",
-            data_scope="general"
-        )
+        return data
 
-        scroll_depth_metrics = self.query_engine.query_metrics(
-            date_range,
-            metric_name="ScrollDepth",
-            data_scope="general"
-        )
+    def _format_totals(self, totals: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Format per-metric totals into report placeholder values."""
+        data = {}
 
         # Aggregate traffic data
-        if traffic_metrics:
-            data.update(self._aggregate_traffic(traffic_metrics))
+        traffic = totals.get("Traffic")
+        if traffic:
+            data.update(self._aggregate_traffic(traffic))
 
         # Aggregate frustration data from individual metrics
-        frustration_data = self._aggregate_frustration(
-            dead_clicks_metrics,
-            rage_clicks_metrics,
-            quick_backs_metrics,
-            error_clicks_metrics,
-            script_errors_metrics,
-            traffic_metrics
-        )
-        data.update(frustration_data)
+        data.update(self._aggregate_frustration(totals))
 
         # Aggregate engagement data
-        engagement_data = self._aggregate_engagement(
-            engagement_time_metrics,
-            scroll_depth_metrics,
-            traffic_metrics
-        )
-        data.update(engagement_data)
-
-        # Page-specific data
-        if page_id:
-            page_data = self._gather_page_data(date_range, page_id)
-            data.update(page_data)
+        data.update(self._aggregate_engagement(totals))
 
         return data
 
-    def _aggregate_traffic(self, metrics: List[Dict]) -> Dict[str, Any]:
-        """Aggregate traffic metrics."""
-        if not metrics:
+    def _aggregate_traffic(self, traffic: Dict[str, Any]) -> Dict[str, Any]:
+        """Format traffic totals."""
+        if not traffic:
             return {}
 
-        total_sessions = sum(m.get('sessions') or 0 for m in metrics)
-        total_users = sum(m.get('users') or 0 for m in metrics)
-        total_page_views = sum(m.get('page_views') or 0 for m in metrics)
-        bot_sessions = sum(m.get('bot_sessions') or 0 for m in metrics)
+        total_sessions = traffic['sessions']
+        total_users = traffic['users']
+        bot_sessions = traffic['bot_sessions']
 
-        # Device breakdown
-        mobile = sum(m.get('mobile_sessions') or 0 for m in metrics)
-        desktop = sum(m.get('desktop_sessions') or 0 for m in metrics)
-        tablet = sum(m.get('tablet_sessions') or 0 for m in metrics)
+        # Page views, device breakdown and session time are not stored in
+        # daily_metrics yet
+        total_page_views = 0
+        mobile = 0
+        desktop = 0
+        tablet = 0
 
         return {
-            'TOTAL_SESSIONS': f"{total_sessions:,}",
-            'UNIQUE_USERS': f"{total_users:,}",  # Renamed from TOTAL_USERS
-            'TOTAL_USERS': f"{total_users:,}",  # Keep for backward compatibility
-            'TOTAL_PAGE_VIEWS': f"{total_page_views:,}",
-            'BOT_SESSIONS': f"{bot_sessions:,}",
+            'TOTAL_SESSIONS': _fmt_int(total_sessions),
+            'UNIQUE_USERS': _fmt_int(total_users),  # Renamed from TOTAL_USERS
+            'TOTAL_USERS': _fmt_int(total_users),  # Keep for backward compatibility
+            'TOTAL_PAGE_VIEWS': _fmt_int(total_page_views),
+            'BOT_SESSIONS': _fmt_int(bot_sessions),
             'BOT_PERCENTAGE': f"{(bot_sessions/total_sessions*100 if total_sessions else 0):.1f}",
-            'MOBILE_SESSIONS': f"{mobile:,}",
-            'DESKTOP_SESSIONS': f"{desktop:,}",
-            'TABLET_SESSIONS': f"{tablet:,}",
+            'MOBILE_SESSIONS': _fmt_int(mobile),
+            'DESKTOP_SESSIONS': _fmt_int(desktop),
+            'TABLET_SESSIONS': _fmt_int(tablet),
             'MOBILE_PERCENTAGE': f"{(mobile/total_sessions*100 if total_sessions else 0):.1f}",
             'DESKTOP_PERCENTAGE': f"{(desktop/total_sessions*100 if total_sessions else 0):.1f}",
             'TABLET_PERCENTAGE': f"{(tablet/total_sessions*100 if total_sessions else 0):.1f}",
-            'AVG_SESSION_DURATION': self._format_duration(
-                sum(m.get('total_session_time', 0) for m in metrics) / total_sessions if total_sessions else 0
-            ),
+            'AVG_SESSION_DURATION': self._format_duration(0),
         }
 
-    def _aggregate_frustration(
-        self,
-        dead_clicks_metrics: List[Dict],
-        rage_clicks_metrics: List[Dict],
-        quick_backs_metrics: List[Dict],
-        error_clicks_metrics: List[Dict],
-        script_errors_metrics: List[Dict],
-        traffic_metrics: List[Dict]
-    ) -> Dict[str, Any]:
-        """Aggregate frustration metrics from individual Clarity metric types."""
+    def _aggregate_frustration(self, totals: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Format frustration totals from individual Clarity metric types."""
         # Get session count from traffic metrics
-        total_sessions = sum(m.get('sessions') or 0 for m in traffic_metrics) if traffic_metrics else 0
+        total_sessions = totals.get('Traffic', {}).get('sessions', 0)
 
-        # Aggregate each frustration type
-        dead_clicks = sum(m.get('dead_clicks') or 0 for m in dead_clicks_metrics) if dead_clicks_metrics else 0
-        rage_clicks = sum(m.get('rage_clicks') or 0 for m in rage_clicks_metrics) if rage_clicks_metrics else 0
-        quick_backs = sum(m.get('quick_backs') or 0 for m in quick_backs_metrics) if quick_backs_metrics else 0
-        error_clicks = sum(m.get('error_clicks') or 0 for m in error_clicks_metrics) if error_clicks_metrics else 0
-        script_errors = sum(m.get('script_errors') or 0 for m in script_errors_metrics) if script_errors_metrics else 0
+        # Each frustration type is summed from its own metric rows
+        dead_clicks = totals.get('DeadClickCount', {}).get('dead_clicks', 0)
+        rage_clicks = totals.get('RageClickCount', {}).get('rage_clicks', 0)
+        quick_backs = totals.get('QuickbackClick', {}).get('quick_backs', 0)
+        error_clicks = totals.get('ErrorClickCount', {}).get('error_clicks', 0)
+        script_errors = totals.get('ScriptErrorCount', {}).get('script_errors', 0)
 
         total_frustration = dead_clicks + rage_clicks + quick_backs + error_clicks
 
         return {
-            'TOTAL_DEAD_CLICKS': f"{dead_clicks:,}",
-            'TOTAL_RAGE_CLICKS': f"{rage_clicks:,}",
-            'TOTAL_QUICK_BACKS': f"{quick_backs:,}",
-            'TOTAL_ERROR_CLICKS': f"{error_clicks:,}",
-            'TOTAL_SCRIPT_ERRORS': f"{script_errors:,}",
-            'TOTAL_FRUSTRATION_SIGNALS': f"{total_frustration:,}",
+            'TOTAL_DEAD_CLICKS': _fmt_int(dead_clicks),
+            'TOTAL_RAGE_CLICKS': _fmt_int(rage_clicks),
+            'TOTAL_QUICK_BACKS': _fmt_int(quick_backs),
+            'TOTAL_ERROR_CLICKS': _fmt_int(error_clicks),
+            'TOTAL_SCRIPT_ERRORS': _fmt_int(script_errors),
+            'TOTAL_FRUSTRATION_SIGNALS': _fmt_int(total_frustration),
             'DEAD_CLICK_RATE': f"{(dead_clicks/total_sessions*100 if total_sessions else 0):.1f}",
             'RAGE_CLICK_RATE': f"{(rage_clicks/total_sessions*100 if total_sessions else 0):.1f}",
             'QUICK_BACK_RATE': f"{(quick_backs/total_sessions*100 if total_sessions else 0):.1f}",
@@ -286,25 +447,17 @@ class ReportGenerator:
             'FRUSTRATION_RATE': f"{(total_frustration/total_sessions if total_sessions else 0):.2f}",
         }
 
-    def _aggregate_engagement(
-        self,
-        engagement_time_metrics: List[Dict],
-        scroll_depth_metrics: List[Dict],
-        traffic_metrics: List[Dict]
-    ) -> Dict[str, Any]:
-        """Aggregate engagement metrics from individual Clarity metric types."""
-        # Get session count from traffic metrics
-        total_sessions = sum(m.get('sessions') or 0 for m in traffic_metrics) if traffic_metrics else 0
-
-        # Aggregate scroll depth
-        total_scroll = sum(m.get('scroll_depth') or 0 for m in scroll_depth_metrics) if scroll_depth_metrics else 0
-        scroll_count = len([m for m in scroll_depth_metrics if m.get('scroll_depth')]) if scroll_depth_metrics else 0
-        avg_scroll_depth = (total_scroll / scroll_count) if scroll_count > 0 else 0
+    def _aggregate_engagement(self, totals: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Format engagement averages from individual Clarity metric types."""
+        # Average scroll depth over rows that reported a value
+        scroll = totals.get('ScrollDepth', {})
+        scroll_count = scroll.get('scroll_depth_count', 0)
+        avg_scroll_depth = (scroll['scroll_depth'] / scroll_count) if scroll_count > 0 else 0
 
-        # Aggregate engagement time
-        total_engagement = sum(m.get('engagement_time') or 0 for m in engagement_time_metrics) if engagement_time_metrics else 0
-        engagement_count = len([m for m in engagement_time_metrics if m.get('engagement_time')]) if engagement_time_metrics else 0
-        avg_engagement_time = (total_engagement / engagement_count) if engagement_count > 0 else 0
+        # Average engagement time over rows that reported a value
+        engagement = totals.get('EngagementTime', {})
+        engagement_count = engagement.get('engagement_time_count', 0)
+        avg_engagement_time = (engagement['engagement_time'] / engagement_count) if engagement_count > 0 else 0
 
         return {
             'AVG_SCROLL_DEPTH': f"{avg_scroll_depth:.1f}",
@@ -327,7 +480,7 @@ class ReportGenerator:
         if page_metrics:
             # Aggregate page data
             total_sessions = sum(m.get('sessions', 0) for m in page_metrics)
-            data['PAGE_SESSIONS'] = f"{total_sessions:,}"
+            data['PAGE_SESSIONS'] = _fmt_int(total_sessions)
 
         return data
 
@@ -339,110 +492,106 @@ class ReportGenerator:
         page_id: Optional[str] = None
     ) -> str:
         """Fill template placeholders with data."""
-        content = template
+        needed = set(_template_placeholders(template))
+        values = self._placeholder_values(data, date_range, page_id, needed)
+        return self._apply_values(template, values)
 
+    def _placeholder_values(
+        self,
+        data: Dict[str, Any],
+        date_range: DateRange,
+        page_id: Optional[str] = None,
+        needed: Optional[Set[str]] = None
+    ) -> Dict[str, str]:
+        """Compute every placeholder value of a report once.
+
+        Adds health score and trend values to ``data``. Returns the
+        formatted strings for project info, dates, data, calculated values
+        and insights, ready to be substituted into any number of template
+        sections. When ``needed`` is given, only those placeholders are
+        formatted and health, trends and insights are skipped if no needed
+        placeholder depends on them.
+        """
         # Project info
         if self.config:
-            content = content.replace('{PROJECT_NAME}', self.config.project.name)
-            content = content.replace('{PROJECT_TYPE}', self.config.project.type)
-            content = content.replace('{PROJECT_URL}', self.config.project.url or 'N/A')
+            values = {
+                'PROJECT_NAME': self.config.project.name,
+                'PROJECT_TYPE': self.config.project.type,
+                'PROJECT_URL': self.config.project.url or 'N/A',
+            }
         else:
-            content = content.replace('{PROJECT_NAME}', 'My Project')
-            content = content.replace('{PROJECT_TYPE}', 'website')
-            content = content.replace('{PROJECT_URL}', 'N/A')
+            values = {
+                'PROJECT_NAME': 'My Project',
+                'PROJECT_TYPE': 'website',
+                'PROJECT_URL': 'N/A',
+            }
 
         # Date range and period
+        now = datetime.now()
         period_days = (date_range.end - date_range.start).days + 1
-        content = content.replace('{START_DATE}', date_range.start.isoformat())
-        content = content.replace('{END_DATE}', date_range.end.isoformat())
-        content = content.replace('{PERIOD_DAYS}', str(period_days))
-        content = content.replace('{GENERATED_DATE}', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-        content = content.replace('{REPORT_GENERATION_DATE}', datetime.now().isoformat())
+        values['START_DATE'] = date_range.start.isoformat()
+        values['END_DATE'] = date_range.end.isoformat()
+        values['PERIOD_DAYS'] = str(period_days)
+        values['GENERATED_DATE'] = now.strftime('%Y-%m-%d %H:%M:%S')
+        values['REPORT_GENERATION_DATE'] = now.isoformat()
 
         # Page info
         if page_id:
-            content = content.replace('{PAGE_ID}', page_id)
+            values['PAGE_ID'] = page_id
 
-        # Data placeholders
-        for key, value in data.items():
-            placeholder = f"{{{key}}}"
-            content = content.replace(placeholder, str(value))
+        if needed is None:
+            want_insights = want_health = want_trends = True
+        else:
+            # Anything not provided directly must come from the insights
+            insight_keys = needed - values.keys() - data.keys() - HEALTH_KEYS - TREND_KEYS
+            want_insights = bool(insight_keys)
+            want_health = want_insights or not needed.isdisjoint(HEALTH_KEYS)
+            want_trends = 'TREND_ANALYSIS' in insight_keys or not needed.isdisjoint(TREND_KEYS)
 
         # Calculate health scores and trends
-        health_data = self._calculate_health_score(data)
-        data.update(health_data)
-
-        trend_data = self._calculate_trends(date_range, data)
-        data.update(trend_data)
-
-        # Fill calculated placeholders
-        for key, value in data.items():
-            placeholder = f"{{{key}}}"
-            content = content.replace(placeholder, str(value))
-
-        # Generate insights (placeholder for now)
-        content = self._generate_insights(content, data)
-
-        return content
+        if want_health:
+            health_data = self._calculate_health_score(data)
+            data.update(health_data)
+
+        if want_trends:
+            trend_data = self._calculate_trends(date_range, data)
+            data.update(trend_data)
+
+        # Earlier sources win: project/date info, then data, then insights
+        insights = self._build_insights(data, needed) if want_insights else {}
+        merged = {**insights, **data, **values}
+        if needed is None:
+            needed = merged.keys() | _ALIASES.keys()
+
+        result = {}
+        for key in needed:
+            source = key if key in merged else _ALIASES.get(key)
+            if source in merged:
+                result[key] = str(merged[source])
+        return result
+
+    def _apply_values(self, content: str, values: Dict[str, str]) -> str:
+        """Substitute pre-formatted placeholder values into content.
+
+        Placeholders without a value render as an empty string.
+        """
+        return "".join(
+            seg if is_literal else values.get(seg, "")
+            for is_literal, seg in _parse_template(content)
+        )
 
     def _calculate_health_score(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate UX health score and issue counts."""
-        # Extract numeric values from formatted strings
-        def extract_num(val_str):
-            if isinstance(val_str, str):
-                return float(val_str.replace(',', '').replace('%', ''))
-            return float(val_str) if val_str else 0
-
-        dead_click_rate = extract_num(data.get('DEAD_CLICK_RATE', '0'))
-        rage_click_rate = extract_num(data.get('RAGE_CLICK_RATE', '0'))
-        quick_back_rate = extract_num(data.get('QUICK_BACK_RATE', '0'))
-        error_click_rate = extract_num(data.get('ERROR_CLICK_RATE', '0'))
-        script_error_rate = extract_num(data.get('SCRIPT_ERROR_RATE', '0'))
-
         # Count critical issues (thresholds based on industry standards)
         critical_issues = 0
         warnings = 0
         good_signals = 0
 
-        # Dead clicks: critical if >5%, warning if >2%
-        if dead_click_rate > 5:
-            critical_issues += 1
-        elif dead_click_rate > 2:
-            warnings += 1
-        else:
-            good_signals += 1
-
-        # Rage clicks: critical if >1%, warning if >0.5%
-        if rage_click_rate > 1:
-            critical_issues += 1
-        elif rage_click_rate > 0.5:
-            warnings += 1
-        else:
-            good_signals += 1
-
-        # Quick backs: critical if >10%, warning if >5%
-        if quick_back_rate > 10:
-            critical_issues += 1
-        elif quick_back_rate > 5:
-            warnings += 1
-        else:
-            good_signals += 1
-
-        # Error clicks: critical if >1%, warning if >0%
-        if error_click_rate > 1:
-            critical_issues += 1
-        elif error_click_rate > 0:
-            warnings += 1
-        else:
-            good_signals += 1
-
-        # Script errors: critical if >0.5%, warning if >0%
-        if script_error_rate > 0.5:
-            critical_issues += 1
-        elif script_error_rate > 0:
-            warnings += 1
-        else:
-            good_signals += 1
+        for key, critical, warning in HEALTH_THRESHOLDS:
+            rate = _extract_num(data.get(key, '0'))
+            critical_issues += rate > critical
+            warnings += warning < rate <= critical
+            good_signals += rate <= warning
 
         # Calculate overall health score (0-100)
         # Start at 100, deduct points for issues
@@ -451,19 +600,9 @@ class ReportGenerator:
         score -= warnings * 7  # -7 per warning
         score = max(0, score)  # Don't go below 0
 
-        # Health indicator
-        if score >= 80:
-            indicator = "🟢 Excellent"
-        elif score >= 60:
-            indicator = "🟡 Good"
-        elif score >= 40:
-            indicator = "🟠 Fair"
-        else:
-            indicator = "🔴 Needs Attention"
-
         return {
             'UX_HEALTH_SCORE': str(score),
-            'HEALTH_INDICATOR': indicator,
+            'HEALTH_INDICATOR': _health_indicator(score),
             'CRITICAL_ISSUES_COUNT': str(critical_issues),
             'WARNINGS_COUNT': str(warnings),
             'GOOD_SIGNALS_COUNT': str(good_signals),
@@ -478,9 +617,14 @@ class ReportGenerator:
         prev_start = prev_end - timedelta(days=period_length - 1)
         prev_range = DateRange(prev_start, prev_end)
 
-        # Try to get previous period data
+        # Fetch current and previous period totals in one query
         try:
-            prev_data = self._gather_data(prev_range)
+            period_totals = self.query_engine.aggregate_metrics_two_periods(
+                date_range,
+                prev_range,
+                REPORT_METRICS,
+                data_scope="general"
+            )
         except:
             # If no previous data, return neutral trends
             return {
@@ -493,15 +637,18 @@ class ReportGenerator:
                 'ENGAGEMENT_TREND': '→',
             }
 
-        def extract_num(val_str):
-            if isinstance(val_str, str):
-                return float(val_str.replace(',', '').replace('%', ''))
-            return float(val_str) if val_str else 0
+        by_period = {'current': {}, 'previous': {}}
+        for (period, metric_name), totals in period_totals.items():
+            by_period[period][metric_name] = totals
+
+        prev_data = self._format_totals(by_period['previous'])
+        # Values already in the report data take precedence over the query
+        current_data = {**self._format_totals(by_period['current']), **current_data}
 
         def calc_trend(current_val, prev_val, higher_is_better=True):
             """Calculate trend indicator."""
-            curr = extract_num(current_val)
-            prev = extract_num(prev_val)
+            curr = _extract_num(current_val)
+            prev = _extract_num(prev_val)
             if prev == 0:
                 return '→'
             change_pct = ((curr - prev) / prev) * 100
@@ -522,28 +669,44 @@ class ReportGenerator:
             'ENGAGEMENT_TREND': calc_trend(current_data.get('AVG_ENGAGEMENT_TIME', '0'), prev_data.get('AVG_ENGAGEMENT_TIME', '0'), True),
         }
 
-    def _generate_insights(self, content: str, data: Dict[str, Any]) -> str:
-        """Generate data-driven audience-specific insights."""
-        def extract_num(val_str):
-            if isinstance(val_str, str):
-                return float(val_str.replace(',', '').replace('%', ''))
-            return float(val_str) if val_str else 0
+    def _build_insights(
+        self,
+        data: Dict[str, Any],
+        needed: Optional[Set[str]] = None
+    ) -> Mapping[str, str]:
+        """Generate data-driven audience-specific insight values.
+
+        Only computed values are built here; constant texts come from
+        _STATIC_INSIGHTS through the returned ChainMap. When ``needed`` is
+        given, longer text sections are only built for those placeholders.
+        """
+        dget = data.get
 
         # Extract metrics
-        total_sessions = extract_num(data.get('TOTAL_SESSIONS', '0'))
-        unique_users = extract_num(data.get('UNIQUE_USERS', '0'))
-        dead_clicks = extract_num(data.get('TOTAL_DEAD_CLICKS', '0'))
-        rage_clicks = extract_num(data.get('TOTAL_RAGE_CLICKS', '0'))
-        quick_backs = extract_num(data.get('TOTAL_QUICK_BACKS', '0'))
-        error_clicks = extract_num(data.get('TOTAL_ERROR_CLICKS', '0'))
-        script_errors = extract_num(data.get('TOTAL_SCRIPT_ERRORS', '0'))
-        bot_sessions = extract_num(data.get('BOT_SESSIONS', '0'))
-
-        dead_click_rate = extract_num(data.get('DEAD_CLICK_RATE', '0'))
-        rage_click_rate = extract_num(data.get('RAGE_CLICK_RATE', '0'))
-        quick_back_rate = extract_num(data.get('QUICK_BACK_RATE', '0'))
-        health_score = extract_num(data.get('UX_HEALTH_SCORE', '0'))
-        critical_issues = int(extract_num(data.get('CRITICAL_ISSUES_COUNT', '0')))
+        total_sessions = _extract_num(dget('TOTAL_SESSIONS', '0'))
+        unique_users = _extract_num(dget('UNIQUE_USERS', '0'))
+        dead_clicks = _extract_num(dget('TOTAL_DEAD_CLICKS', '0'))
+        rage_clicks = _extract_num(dget('TOTAL_RAGE_CLICKS', '0'))
+        quick_backs = _extract_num(dget('TOTAL_QUICK_BACKS', '0'))
+        error_clicks = _extract_num(dget('TOTAL_ERROR_CLICKS', '0'))
+        script_errors = _extract_num(dget('TOTAL_SCRIPT_ERRORS', '0'))
+        bot_sessions = _extract_num(dget('BOT_SESSIONS', '0'))
+
+        dead_click_rate = _extract_num(dget('DEAD_CLICK_RATE', '0'))
+        rage_click_rate = _extract_num(dget('RAGE_CLICK_RATE', '0'))
+        quick_back_rate = _extract_num(dget('QUICK_BACK_RATE', '0'))
+        health_score = _extract_num(dget('UX_HEALTH_SCORE', '0'))
+        critical_issues = int(_extract_num(dget('CRITICAL_ISSUES_COUNT', '0')))
+
+        # Formatted values shared by several insights
+        dc_pct = f"{dead_click_rate:.1f}"
+        rc_pct = f"{rage_click_rate:.1f}"
+        qb_pct = f"{quick_back_rate:.1f}"
+        dc_n = _fmt_int(int(dead_clicks))
+        rc_n = _fmt_int(int(rage_clicks))
+        qb_n = _fmt_int(int(quick_backs))
+        sessions_n = _fmt_int(int(total_sessions))
+        pages_per_user_str = f"{total_sessions/unique_users:.1f}" if unique_users > 0 else _NA
 
         # Generate executive summary
         if health_score >= 80:
@@ -557,85 +720,53 @@ class ReportGenerator:
 
         top_issue = ""
         if dead_click_rate > 5:
-            top_issue = f"Dead clicks affecting {dead_click_rate:.1f}% of sessions ({int(dead_clicks):,} total incidents)"
+            top_issue = f"Dead clicks affecting {dc_pct}% of sessions ({dc_n} total incidents)"
         elif rage_click_rate > 1:
-            top_issue = f"Rage clicks in {rage_click_rate:.1f}% of sessions ({int(rage_clicks):,} total incidents)"
+            top_issue = f"Rage clicks in {rc_pct}% of sessions ({rc_n} total incidents)"
         elif quick_back_rate > 10:
-            top_issue = f"Quick backs in {quick_back_rate:.1f}% of sessions ({int(quick_backs):,} total incidents)"
+            top_issue = f"Quick backs in {qb_pct}% of sessions ({qb_n} total incidents)"
         else:
             top_issue = "No major UX issues detected"
 
         # Critical findings
-        critical_findings = ""
         if critical_issues > 0:
-            critical_findings += f"**{critical_issues} Critical Issues Identified:**\n\n"
+            findings = [f"**{critical_issues} Critical Issues Identified:**\n\n"]
             if dead_click_rate > 5:
-                critical_findings += f"1. **Dead Clicks Crisis:** {int(dead_clicks):,} incidents ({dead_click_rate:.1f}% of sessions) - Users clicking on non-interactive elements, indicating UI confusion.\n\n"
+                findings.append(f"1. **Dead Clicks Crisis:** {dc_n} incidents ({dc_pct}% of sessions) - Users clicking on non-interactive elements, indicating UI confusion.\n\n")
             if rage_click_rate > 1:
-                critical_findings += f"2. **Rage Click Alerts:** {int(rage_clicks):,} incidents ({rage_click_rate:.1f}% of sessions) - Users frantically clicking, signaling broken functionality.\n\n"
+                findings.append(f"2. **Rage Click Alerts:** {rc_n} incidents ({rc_pct}% of sessions) - Users frantically clicking, signaling broken functionality.\n\n")
             if quick_back_rate > 10:
-                critical_findings += f"3. **Quick Back Pattern:** {int(quick_backs):,} incidents ({quick_back_rate:.1f}% of sessions) - Users immediately abandoning pages, suggesting poor landing experience.\n\n"
+                findings.append(f"3. **Quick Back Pattern:** {qb_n} incidents ({qb_pct}% of sessions) - Users immediately abandoning pages, suggesting poor landing experience.\n\n")
+            critical_findings = "".join(findings)
         else:
             critical_findings = "No critical UX issues detected. System performing within acceptable parameters."
 
-        exec_summary = f"Analysis of {int(total_sessions):,} sessions from {int(unique_users):,} unique users shows {health_desc}. "
+        summary_parts = [f"Analysis of {sessions_n} sessions from {_fmt_int(int(unique_users))} unique users shows {health_desc}. "]
         if top_issue:
-            exec_summary += f"Primary concern: {top_issue}. "
-        exec_summary += f"Detected {critical_issues} critical issues requiring immediate remediation."
-
-        # Technical insights
-        tech_insights = f"**Performance & Errors:**\n"
-        if script_errors > 0:
-            tech_insights += f"- {int(script_errors):,} script errors detected - investigate JavaScript issues\n"
-        if error_clicks > 0:
-            tech_insights += f"- {int(error_clicks):,} error clicks - users encountering system errors\n"
-        else:
-            tech_insights += "- No script or error click issues detected\n"
-        tech_insights += f"- Bot traffic: {int(bot_sessions):,} sessions ({bot_sessions/total_sessions*100 if total_sessions else 0:.1f}%)\n\n"
-        tech_insights += f"**Priority Fixes:**\n"
-        if dead_click_rate > 5:
-            tech_insights += f"- HIGH: Dead clicks ({int(dead_clicks):,} total) - elements appearing clickable but non-functional\n"
-        if rage_click_rate > 1:
-            tech_insights += f"- HIGH: Rage clicks ({int(rage_clicks):,} total) - users repeatedly clicking in frustration\n"
-        if quick_back_rate > 10:
-            tech_insights += f"- HIGH: Quick backs ({int(quick_backs):,} total) - users immediately leaving pages\n"
-
-        # UX insights
-        ux_insights = f"**Frustration Analysis:**\n"
-        ux_insights += f"- Dead clicks: {int(dead_clicks):,} incidents ({dead_click_rate:.1f}% of sessions)\n"
-        ux_insights += f"- Rage clicks: {int(rage_clicks):,} incidents ({rage_click_rate:.1f}% of sessions)\n"
-        ux_insights += f"- Quick backs: {int(quick_backs):,} incidents ({quick_back_rate:.1f}% of sessions)\n\n"
-        ux_insights += f"**Recommendations:**\n"
-        if dead_click_rate > 5:
-            ux_insights += "- Review UI for misleading clickable elements\n"
-        if rage_click_rate > 1:
-            ux_insights += "- Identify and fix unresponsive interactions\n"
-        if quick_back_rate > 10:
-            ux_insights += "- Analyze landing pages causing immediate exits\n"
-
-        # Business insights
-        business_insights = f"**Traffic Overview:**\n"
-        business_insights += f"- Total Sessions: {int(total_sessions):,}\n"
-        business_insights += f"- Unique Users: {int(unique_users):,}\n"
-        business_insights += f"- Sessions per User: {total_sessions/unique_users:.1f}\n\n"
-        business_insights += f"**Business Impact:**\n"
-        if health_score < 60:
-            business_insights += f"- UX issues likely impacting conversion and retention\n"
-            business_insights += f"- Estimated {int(total_sessions * dead_click_rate / 100):,} sessions affected by dead clicks\n"
-        else:
-            business_insights += "- UX quality supporting business objectives\n"
-
-        # Marketing insights
-        marketing_insights = f"**Audience Reach:**\n"
-        marketing_insights += f"- {int(unique_users):,} unique users reached\n"
-        marketing_insights += f"- {int(total_sessions):,} total sessions\n"
-        marketing_insights += f"- {int(bot_sessions):,} bot sessions filtered ({bot_sessions/total_sessions*100 if total_sessions else 0:.1f}%)\n"
+            summary_parts.append(f"Primary concern: {top_issue}. ")
+        summary_parts.append(f"Detected {critical_issues} critical issues requiring immediate remediation.")
+        exec_summary = "".join(summary_parts)
+
+        metrics = {
+            'total_sessions': total_sessions,
+            'unique_users': unique_users,
+            'dead_clicks': dead_clicks,
+            'rage_clicks': rage_clicks,
+            'quick_backs': quick_backs,
+            'error_clicks': error_clicks,
+            'script_errors': script_errors,
+            'bot_sessions': bot_sessions,
+            'dead_click_rate': dead_click_rate,
+            'rage_click_rate': rage_click_rate,
+            'quick_back_rate': quick_back_rate,
+            'health_score': health_score,
+        }
 
         # Calculate session counts from rates
         dead_click_sessions = int(total_sessions * dead_click_rate / 100) if total_sessions else 0
         rage_click_sessions = int(total_sessions * rage_click_rate / 100) if total_sessions else 0
         quick_back_sessions = int(total_sessions * quick_back_rate / 100) if total_sessions else 0
-        error_click_sessions = int(total_sessions * extract_num(data.get('ERROR_CLICK_RATE', '0')) / 100) if total_sessions else 0
+        error_click_sessions = int(total_sessions * _extract_num(dget('ERROR_CLICK_RATE', '0')) / 100) if total_sessions else 0
 
         # Calculate total frustrated sessions (unique sessions with any frustration)
         # Approximate as union - assume some overlap
@@ -645,15 +776,6 @@ class ReportGenerator:
         )
         frustrated_percentage = (frustrated_sessions / total_sessions * 100) if total_sessions else 0
 
-        # Generate frustration summary
-        frustration_summary = f"Analysis reveals significant frustration patterns across {int(total_sessions):,} sessions. "
-        if dead_click_rate > 5:
-            frustration_summary += f"Dead clicks are the primary concern ({dead_click_rate:.1f}% of sessions). "
-        if rage_click_rate > 1:
-            frustration_summary += f"Rage clicking indicates broken interactions ({rage_click_rate:.1f}% of sessions). "
-        if quick_back_rate > 10:
-            frustration_summary += f"High quick back rate suggests poor landing experience ({quick_back_rate:.1f}% of sessions)."
-
         # Business impact calculations
         # Assume 3% baseline conversion rate, 50% loss per frustration signal
         estimated_lost_conversions = int(frustrated_sessions * 0.03 * 0.5)
@@ -661,231 +783,277 @@ class ReportGenerator:
         revenue_impact = f"Estimated ${estimated_lost_conversions * 50:,.0f} in lost revenue (assuming $50 avg order value)" if frustrated_percentage > 10 else "Minimal revenue impact"
 
         # Generate device breakdowns (simplified - would need dimension queries for real data)
-        quick_back_by_device = "| Device | Sessions | Quick Backs | Rate |\n|--------|----------|-------------|------|\n"
-        quick_back_by_device += "| All Devices | {:,} | {:,} | {:.1f}% |".format(int(total_sessions), int(quick_backs), quick_back_rate)
-
-        dead_click_hotspots = f"- Primary hotspots detected across {dead_click_sessions:,} sessions\n"
-        dead_click_hotspots += "- Common patterns: Non-clickable UI elements styled as buttons\n"
-        dead_click_hotspots += "- Recommendation: Review visual affordances and cursor feedback"
-
-        rage_click_by_device = "| Device | Sessions | Rage Clicks | Rate |\n|--------|----------|-------------|------|\n"
-        rage_click_by_device += "| All Devices | {:,} | {:,} | {:.1f}% |".format(int(total_sessions), int(rage_clicks), rage_click_rate)
-
-        # Generate recommendations
-        quick_back_recommendations = "**Immediate Actions:**\n"
-        if quick_back_rate > 10:
-            quick_back_recommendations += "1. Audit landing page content alignment with user expectations\n"
-            quick_back_recommendations += "2. Optimize page load performance (target <2s)\n"
-            quick_back_recommendations += "3. Review meta descriptions and ad copy accuracy\n"
-        else:
-            quick_back_recommendations += "- Quick back rate within acceptable range\n"
+        quick_back_by_device = "| Device | Sessions | Quick Backs | Rate |\n|--------|----------|-------------|------|\n" + \
+            f"| All Devices | {sessions_n} | {qb_n} | {qb_pct}% |"
 
-        dead_click_recommendations = "**Immediate Actions:**\n"
-        if dead_click_rate > 5:
-            dead_click_recommendations += "1. Identify and fix non-interactive elements that appear clickable\n"
-            dead_click_recommendations += "2. Add cursor feedback (cursor: pointer only for clickable elements)\n"
-            dead_click_recommendations += "3. Review disabled buttons and form elements\n"
-        else:
-            dead_click_recommendations += "- Dead click rate within acceptable range\n"
+        dead_click_hotspots = "".join([
+            f"- Primary hotspots detected across {_fmt_int(dead_click_sessions)} sessions\n",
+            "- Common patterns: Non-clickable UI elements styled as buttons\n",
+            "- Recommendation: Review visual affordances and cursor feedback",
+        ])
 
-        rage_click_recommendations = "**Immediate Actions:**\n"
-        if rage_click_rate > 1:
-            rage_click_recommendations += "1. Investigate and fix unresponsive interactive elements\n"
-            rage_click_recommendations += "2. Add loading indicators for async operations\n"
-            rage_click_recommendations += "3. Review form validation and error messaging\n"
-        else:
-            rage_click_recommendations += "- Rage click rate within acceptable range\n"
-
-        # Trend analysis placeholder
-        trend_analysis = "**Period-over-period trends:**\n"
-        trend_analysis += f"- Dead clicks: {data.get('DEAD_CLICK_TREND', '→')}\n"
-        trend_analysis += f"- Rage clicks: {data.get('RAGE_CLICK_TREND', '→')}\n"
-        trend_analysis += f"- Quick backs: {data.get('QUICK_BACK_TREND', '→')}\n"
+        rage_click_by_device = "| Device | Sessions | Rage Clicks | Rate |\n|--------|----------|-------------|------|\n" + \
+            f"| All Devices | {sessions_n} | {rc_n} | {rc_pct}% |"
 
         insights = {
             'EXECUTIVE_SUMMARY': exec_summary,
             'TOP_UX_ISSUE': top_issue,
             'CRITICAL_FINDINGS': critical_findings,
-            'TECHNICAL_INSIGHTS': tech_insights,
-            'TECHNICAL_ACTIONS': tech_insights,  # Alias
-            'UX_INSIGHTS': ux_insights,
-            'UX_IMPROVEMENTS': ux_insights,  # Alias
-            'BUSINESS_INSIGHTS': business_insights,
-            'BUSINESS_IMPACT': business_insights,  # Alias
-            'BUSINESS_OPPORTUNITIES': business_insights,  # Alias
-            'MARKETING_INSIGHTS': marketing_insights,
-            'MARKETING_RECOMMENDATIONS': marketing_insights,  # Alias
             'SCRIPT_ERROR_COUNT': str(int(script_errors)),
             'SCRIPT_ERROR_RATE': f"{script_errors/total_sessions*100 if total_sessions else 0:.1f}",
             'ERROR_CLICK_COUNT': str(int(error_clicks)),
-            'QUICK_BACK_PERCENTAGE': f"{quick_back_rate:.1f}",
+            'QUICK_BACK_PERCENTAGE': qb_pct,
             'DEAD_CLICKS_TOTAL': str(int(dead_clicks)),
-            'PAGES_WITH_DEAD_CLICKS': "multiple",  # Placeholder - would need page-level data
-            'PAGES_WITH_RAGE_CLICKS': "multiple",  # Placeholder - would need page-level data
             'ENGAGEMENT_LEVEL': "Low" if health_score < 60 else "Moderate",
             'SESSION_QUALITY': "Needs improvement" if health_score < 60 else "Acceptable",
-            'PAGES_PER_SESSION': f"{total_sessions/unique_users:.1f}" if unique_users > 0 else "N/A",
-            'TOP_TRAFFIC_SOURCES': "Direct, Organic Search, Social Media",  # Placeholder - would need source data
-            'PERIOD_COMPARISON': "Period comparison data not available",  # Placeholder
+            'PAGES_PER_SESSION': pages_per_user_str,
             # Frustration Analysis specific placeholders
-            'SUMMARY': frustration_summary,
-            'FRUSTRATED_SESSIONS': f"{frustrated_sessions:,}",
+            'FRUSTRATED_SESSIONS': _fmt_int(frustrated_sessions),
             'FRUSTRATED_PERCENTAGE': f"{frustrated_percentage:.1f}",
-            'QUICK_BACK_COUNT': f"{int(quick_backs):,}",
-            'QUICK_BACK_SESSIONS': f"{quick_back_sessions:,}",
-            'QUICK_BACK_PCT': f"{quick_back_rate:.1f}",
-            'DEAD_CLICK_COUNT': f"{int(dead_clicks):,}",
-            'DEAD_CLICK_SESSIONS': f"{dead_click_sessions:,}",
-            'DEAD_CLICK_PERCENTAGE': f"{dead_click_rate:.1f}",
-            'DEAD_CLICK_PCT': f"{dead_click_rate:.1f}",
-            'RAGE_CLICK_COUNT': f"{int(rage_clicks):,}",
-            'RAGE_CLICK_SESSIONS': f"{rage_click_sessions:,}",
-            'RAGE_CLICK_PERCENTAGE': f"{rage_click_rate:.1f}",
-            'RAGE_CLICK_PCT': f"{rage_click_rate:.1f}",
-            'ERROR_CLICK_SESSIONS': f"{error_click_sessions:,}",
-            'ERROR_CLICK_PERCENTAGE': f"{extract_num(data.get('ERROR_CLICK_RATE', '0')):.1f}",
-            'EXCESSIVE_SCROLL_COUNT': "0",
-            'EXCESSIVE_SCROLL_SESSIONS': "0",
-            'EXCESSIVE_SCROLL_PERCENTAGE': "0.0",
+            'QUICK_BACK_COUNT': qb_n,
+            'QUICK_BACK_SESSIONS': _fmt_int(quick_back_sessions),
+            'DEAD_CLICK_COUNT': dc_n,
+            'DEAD_CLICK_SESSIONS': _fmt_int(dead_click_sessions),
+            'DEAD_CLICK_PERCENTAGE': dc_pct,
+            'RAGE_CLICK_COUNT': rc_n,
+            'RAGE_CLICK_SESSIONS': _fmt_int(rage_click_sessions),
+            'RAGE_CLICK_PERCENTAGE': rc_pct,
+            'ERROR_CLICK_SESSIONS': _fmt_int(error_click_sessions),
+            'ERROR_CLICK_PERCENTAGE': f"{_extract_num(dget('ERROR_CLICK_RATE', '0')):.1f}",
             'QUICK_BACK_BY_DEVICE': quick_back_by_device,
-            'QUICK_BACK_BY_PAGE': "Requires page-level data collection",
-            'QUICK_BACK_RECOMMENDATIONS': quick_back_recommendations,
             'DEAD_CLICK_HOTSPOTS': dead_click_hotspots,
-            'DEAD_CLICK_RECOMMENDATIONS': dead_click_recommendations,
             'RAGE_CLICK_BY_DEVICE': rage_click_by_device,
-            'RAGE_CLICK_BY_PAGE': "Requires page-level data collection",
-            'RAGE_CLICK_RECOMMENDATIONS': rage_click_recommendations,
-            'ESTIMATED_LOST_CONVERSIONS': f"{estimated_lost_conversions:,} conversions",
+            'ESTIMATED_LOST_CONVERSIONS': f"{_fmt_int(estimated_lost_conversions)} conversions",
             'SATISFACTION_IMPACT': satisfaction_impact,
             'REVENUE_IMPACT': revenue_impact,
-            'ROI_ANALYSIS': f"Fixing frustration signals could recover {estimated_lost_conversions:,} conversions",
-            'HIGH_FRUSTRATION_SOURCES': "Pages with >10% frustration rate",
-            'LOW_FRUSTRATION_SOURCES': "Pages with <2% frustration rate",
-            'TREND_ANALYSIS': trend_analysis,
+            'ROI_ANALYSIS': f"Fixing frustration signals could recover {_fmt_int(estimated_lost_conversions)} conversions",
             # Device Performance specific placeholders
-            'MOBILE_ENGAGEMENT': "N/A",
-            'MOBILE_PAGES': "N/A",
-            'MOBILE_FRUSTRATION': "N/A",
-            'DESKTOP_ENGAGEMENT': "N/A",
-            'DESKTOP_PAGES': "N/A",
-            'DESKTOP_FRUSTRATION': "N/A",
-            'TABLET_ENGAGEMENT': "N/A",
-            'TABLET_PAGES': "N/A",
-            'TABLET_FRUSTRATION': "N/A",
-            'OTHER_SESSIONS': f"{data.get('OTHER_SESSIONS', '0')}",
-            'OTHER_PERCENTAGE': f"{data.get('OTHER_PERCENTAGE', '0')}",
-            'OTHER_ENGAGEMENT': "N/A",
-            'OTHER_PAGES': "N/A",
-            'OTHER_FRUSTRATION': "N/A",
-            'BROWSER_TABLE': "| Browser | Sessions | % |\n|---------|----------|---|\n| All Browsers | {:,} | 100% |".format(int(total_sessions)),
-            'MOBILE_VS_DESKTOP_ENGAGEMENT': "Requires device dimension data",
-            'MOBILE_VS_DESKTOP_REC': "Enable device tracking for detailed comparison",
-            'MOBILE_FRUSTRATION_DETAIL': "Requires device-level frustration data",
-            'DESKTOP_FRUSTRATION_DETAIL': "Requires device-level frustration data",
+            'OTHER_SESSIONS': f"{dget('OTHER_SESSIONS', '0')}",
+            'OTHER_PERCENTAGE': f"{dget('OTHER_PERCENTAGE', '0')}",
+            'BROWSER_TABLE': f"| Browser | Sessions | % |\n|---------|----------|---|\n| All Browsers | {sessions_n} | 100% |",
             # Geographic Insights specific placeholders
-            'COUNTRY_COUNT': "Data collection needed",
-            'TOP_COUNTRIES_TABLE': "| Country | Sessions | % |\n|---------|----------|---|\n| All Countries | {:,} | 100% |".format(int(total_sessions)),
-            'REGIONAL_ANALYSIS': "Geographic data collection not yet configured",
-            'TOP_MARKETS': "Requires country dimension data",
+            'TOP_COUNTRIES_TABLE': f"| Country | Sessions | % |\n|---------|----------|---|\n| All Countries | {sessions_n} | 100% |",
             # Engagement Analysis specific placeholders
             'ENGAGEMENT_STATUS': "Low engagement" if health_score < 60 else "Moderate engagement",
-            'ENGAGEMENT_DISTRIBUTION': f"Average engagement time: {data.get('AVG_ENGAGEMENT_TIME', '0')}s",
-            'BEHAVIOR_PATTERNS': f"Users spending average {data.get('AVG_ENGAGEMENT_TIME', '0')}s on site",
-            'AVG_ENGAGEMENT': f"{data.get('AVG_ENGAGEMENT_TIME', '0')}s",
-            'ACTIVE_STATUS': "Below target" if extract_num(data.get('AVG_ENGAGEMENT_TIME', '0')) < 60 else "Acceptable",
-            'SCROLL_STATUS': "Low" if extract_num(data.get('AVG_SCROLL_DEPTH', '0')) < 70 else "Good",
-            'PAGES_STATUS': f"Average {total_sessions/unique_users:.1f} pages per user" if unique_users > 0 else "N/A",
-            # Content Performance specific placeholders
-            'TOP_PAGES_TABLE': "Requires page-level data collection",
-            'CATEGORY_PERFORMANCE': "Requires page categorization and metrics",
-            'REFERRER_ANALYSIS': "Requires referrer dimension data",
-            'REFERRER_BREAKDOWN': "Referrer tracking not yet configured",
+            'ENGAGEMENT_DISTRIBUTION': f"Average engagement time: {dget('AVG_ENGAGEMENT_TIME', '0')}s",
+            'BEHAVIOR_PATTERNS': f"Users spending average {dget('AVG_ENGAGEMENT_TIME', '0')}s on site",
+            'AVG_ENGAGEMENT': f"{dget('AVG_ENGAGEMENT_TIME', '0')}s",
+            'ACTIVE_STATUS': "Below target" if _extract_num(dget('AVG_ENGAGEMENT_TIME', '0')) < 60 else "Acceptable",
+            'SCROLL_STATUS': "Low" if _extract_num(dget('AVG_SCROLL_DEPTH', '0')) < 70 else "Good",
+            'PAGES_STATUS': f"Average {pages_per_user_str} pages per user" if unique_users > 0 else _NA,
             # Page-specific placeholders
-            'PAGE_NAME': data.get('PAGE_NAME', 'Unknown Page'),
-            'PAGE_PATH': data.get('PAGE_PATH', '/'),
-            'PAGE_CATEGORY': data.get('PAGE_CATEGORY', 'uncategorized'),
-            'PAGE_VIEWS': data.get('PAGE_VIEWS', '0'),
-            'UNIQUE_VISITORS': data.get('UNIQUE_VISITORS', '0'),
-            'AVG_TIME': data.get('AVG_TIME', '0s'),
-            'BOUNCE_RATE': data.get('BOUNCE_RATE', '0.0'),
-            'IS_ENTRY_PAGE': data.get('IS_ENTRY_PAGE', 'Unknown'),
-            'IS_EXIT_PAGE': data.get('IS_EXIT_PAGE', 'Unknown'),
-            'DEVICE_BREAKDOWN': "Requires page-level device data",
-            'REFERRER_BREAKDOWN': "Requires page-level referrer data",
-            'PREVIOUS_PAGES': "Requires user journey data",
-            'NEXT_PAGES': "Requires user journey data",
-            'PAGE_SUMMARY': "Page-level data collection not yet configured",
-            'QUICK_BACK_PERFORMANCE': data.get('QUICK_BACK_PERFORMANCE', 'N/A'),
-            'BOUNCE_PERFORMANCE': data.get('BOUNCE_PERFORMANCE', 'N/A'),
-            'TIME_PERFORMANCE': data.get('TIME_PERFORMANCE', 'N/A'),
-            'SITE_AVG_TIME': data.get('AVG_ENGAGEMENT_TIME', '0'),
-            'SITE_BOUNCE_RATE': "N/A",
-            'SITE_QUICK_BACK': f"{quick_back_rate:.1f}%",
-            'SITE_COMPARISON': "Page comparison requires page-level data",
-            'SCROLL_ISSUE_COUNT': "0",
-            'SCROLL_ISSUE_SESSIONS': "0",
-            'SCROLL_ISSUE_PCT': "0.0",
-            # General recommendations placeholder
-            'RECOMMENDATIONS': self._generate_recommendations(data, dead_click_rate, rage_click_rate, quick_back_rate),
+            'PAGE_NAME': dget('PAGE_NAME', 'Unknown Page'),
+            'PAGE_PATH': dget('PAGE_PATH', '/'),
+            'PAGE_CATEGORY': dget('PAGE_CATEGORY', 'uncategorized'),
+            'PAGE_VIEWS': dget('PAGE_VIEWS', '0'),
+            'UNIQUE_VISITORS': dget('UNIQUE_VISITORS', '0'),
+            'AVG_TIME': dget('AVG_TIME', '0s'),
+            'BOUNCE_RATE': dget('BOUNCE_RATE', '0.0'),
+            'IS_ENTRY_PAGE': dget('IS_ENTRY_PAGE', 'Unknown'),
+            'IS_EXIT_PAGE': dget('IS_EXIT_PAGE', 'Unknown'),
+            'QUICK_BACK_PERFORMANCE': dget('QUICK_BACK_PERFORMANCE', 'N/A'),
+            'BOUNCE_PERFORMANCE': dget('BOUNCE_PERFORMANCE', 'N/A'),
+            'TIME_PERFORMANCE': dget('TIME_PERFORMANCE', 'N/A'),
+            'SITE_AVG_TIME': dget('AVG_ENGAGEMENT_TIME', '0'),
+            'SITE_QUICK_BACK': f"{qb_pct}%",
             # Frustration-analysis template specific placeholders
-            'TECHNICAL_CAUSE_1': "UI elements styled as interactive but non-functional (dead clicks)",
-            'TECHNICAL_CAUSE_2': "Slow response times causing rage clicks",
-            'TECHNICAL_CAUSE_3': "Poor page load performance triggering quick backs",
-            'TECHNICAL_FIX_1': "Audit and fix clickability affordances (cursor feedback, hover states)",
-            'TECHNICAL_FIX_2': "Add loading indicators and optimize async operations",
-            'TECHNICAL_FIX_3': "Improve page load performance (<2s target)",
-            'UX_ISSUE_1': f"Dead clicks affecting {dead_click_rate:.1f}% of sessions",
-            'UX_ISSUE_2': f"Rage clicks indicating broken interactions ({rage_click_rate:.1f}% of sessions)",
-            'UX_ISSUE_3': f"High quick back rate ({quick_back_rate:.1f}%) suggesting poor landing UX",
-            'UX_IMPROVEMENT_1': "Review visual design for misleading clickable elements",
-            'UX_IMPROVEMENT_2': "Add clear feedback for all interactive elements",
-            'UX_IMPROVEMENT_3': "Align landing page content with user expectations",
-            'MARKETING_REC_1': "Audit ad copy and meta descriptions for accuracy",
-            'MARKETING_REC_2': "Focus acquisition on lower-frustration traffic sources",
-            'IMMEDIATE_ACTION_1': f"Fix top dead click issues affecting {int(dead_clicks):,} incidents",
-            'IMMEDIATE_ACTION_2': f"Investigate rage click triggers across {rage_click_sessions:,} sessions",
+            'UX_ISSUE_1': f"Dead clicks affecting {dc_pct}% of sessions",
+            'UX_ISSUE_2': f"Rage clicks indicating broken interactions ({rc_pct}% of sessions)",
+            'UX_ISSUE_3': f"High quick back rate ({qb_pct}%) suggesting poor landing UX",
+            'IMMEDIATE_ACTION_1': f"Fix top dead click issues affecting {dc_n} incidents",
+            'IMMEDIATE_ACTION_2': f"Investigate rage click triggers across {_fmt_int(rage_click_sessions)} sessions",
         }
 
-        for key, value in insights.items():
-            content = content.replace(f"{{{key}}}", value)
+        # Longer text sections, built only when the template uses them
+        sections = {
+            'TECHNICAL_INSIGHTS': lambda: self._technical_insights(metrics),
+            'UX_INSIGHTS': lambda: self._ux_insights(metrics),
+            'BUSINESS_INSIGHTS': lambda: self._business_insights(metrics, pages_per_user_str),
+            'MARKETING_INSIGHTS': lambda: self._marketing_insights(metrics),
+            # Frustration Analysis specific sections
+            'SUMMARY': lambda: self._frustration_summary(metrics),
+            'TREND_ANALYSIS': lambda: "".join([
+                "**Period-over-period trends:**\n",
+                f"- Dead clicks: {dget('DEAD_CLICK_TREND', '→')}\n",
+                f"- Rage clicks: {dget('RAGE_CLICK_TREND', '→')}\n",
+                f"- Quick backs: {dget('QUICK_BACK_TREND', '→')}\n",
+            ]),
+        }
+        wanted = None if needed is None else {_ALIASES.get(key, key) for key in needed}
+        for key, build in sections.items():
+            if wanted is None or key in wanted:
+                insights[key] = build()
+
+        # Per-signal and priority recommendations share one pass
+        recommendation_keys = (
+            'QUICK_BACK_RECOMMENDATIONS',
+            'DEAD_CLICK_RECOMMENDATIONS',
+            'RAGE_CLICK_RECOMMENDATIONS',
+            'RECOMMENDATIONS',
+        )
+        if wanted is None or not wanted.isdisjoint(recommendation_keys):
+            insights.update(zip(recommendation_keys, self._build_all_recommendations(
+                dead_click_rate, rage_click_rate, quick_back_rate
+            )))
+
+        return ChainMap(insights, _STATIC_INSIGHTS)
+
+    def _immediate_actions(self, triggered: bool, signal: str, *actions: str) -> str:
+        """Build the immediate actions list for one frustration signal."""
+        parts = ["**Immediate Actions:**\n"]
+        if triggered:
+            parts.extend(f"{i}. {action}\n" for i, action in enumerate(actions, 1))
+        else:
+            parts.append(f"- {signal} rate within acceptable range\n")
+        return "".join(parts)
+
+    def _technical_insights(self, m: Dict[str, float]) -> str:
+        """Build the technical audience section."""
+        total_sessions = m['total_sessions']
+        parts = ["**Performance & Errors:**\n"]
+        if m['script_errors'] > 0:
+            parts.append(f"- {_fmt_int(int(m['script_errors']))} script errors detected - investigate JavaScript issues\n")
+        if m['error_clicks'] > 0:
+            parts.append(f"- {_fmt_int(int(m['error_clicks']))} error clicks - users encountering system errors\n")
+        else:
+            parts.append("- No script or error click issues detected\n")
+        parts.append(f"- Bot traffic: {_fmt_int(int(m['bot_sessions']))} sessions ({m['bot_sessions']/total_sessions*100 if total_sessions else 0:.1f}%)\n\n")
+        parts.append("**Priority Fixes:**\n")
+        if m['dead_click_rate'] > 5:
+            parts.append(f"- HIGH: Dead clicks ({_fmt_int(int(m['dead_clicks']))} total) - elements appearing clickable but non-functional\n")
+        if m['rage_click_rate'] > 1:
+            parts.append(f"- HIGH: Rage clicks ({_fmt_int(int(m['rage_clicks']))} total) - users repeatedly clicking in frustration\n")
+        if m['quick_back_rate'] > 10:
+            parts.append(f"- HIGH: Quick backs ({_fmt_int(int(m['quick_backs']))} total) - users immediately leaving pages\n")
+        return "".join(parts)
+
+    def _ux_insights(self, m: Dict[str, float]) -> str:
+        """Build the UX audience section."""
+        parts = [
+            "**Frustration Analysis:**\n",
+            f"- Dead clicks: {_fmt_int(int(m['dead_clicks']))} incidents ({m['dead_click_rate']:.1f}% of sessions)\n",
+            f"- Rage clicks: {_fmt_int(int(m['rage_clicks']))} incidents ({m['rage_click_rate']:.1f}% of sessions)\n",
+            f"- Quick backs: {_fmt_int(int(m['quick_backs']))} incidents ({m['quick_back_rate']:.1f}% of sessions)\n\n",
+            "**Recommendations:**\n",
+        ]
+        if m['dead_click_rate'] > 5:
+            parts.append("- Review UI for misleading clickable elements\n")
+        if m['rage_click_rate'] > 1:
+            parts.append("- Identify and fix unresponsive interactions\n")
+        if m['quick_back_rate'] > 10:
+            parts.append("- Analyze landing pages causing immediate exits\n")
+        return "".join(parts)
+
+    def _business_insights(self, m: Dict[str, float], sessions_per_user: str) -> str:
+        """Build the business audience section."""
+        total_sessions = m['total_sessions']
+        unique_users = m['unique_users']
+        parts = [
+            "**Traffic Overview:**\n",
+            f"- Total Sessions: {_fmt_int(int(total_sessions))}\n",
+            f"- Unique Users: {_fmt_int(int(unique_users))}\n",
+            f"- Sessions per User: {sessions_per_user}\n\n",
+            "**Business Impact:**\n",
+        ]
+        if m['health_score'] < 60:
+            parts.append("- UX issues likely impacting conversion and retention\n")
+            parts.append(f"- Estimated {_fmt_int(int(total_sessions * m['dead_click_rate'] / 100))} sessions affected by dead clicks\n")
+        else:
+            parts.append("- UX quality supporting business objectives\n")
+        return "".join(parts)
+
+    def _marketing_insights(self, m: Dict[str, float]) -> str:
+        """Build the marketing audience section."""
+        total_sessions = m['total_sessions']
+        parts = [
+            "**Audience Reach:**\n",
+            f"- {_fmt_int(int(m['unique_users']))} unique users reached\n",
+            f"- {_fmt_int(int(total_sessions))} total sessions\n",
+            f"- {_fmt_int(int(m['bot_sessions']))} bot sessions filtered ({m['bot_sessions']/total_sessions*100 if total_sessions else 0:.1f}%)\n",
+        ]
+        return "".join(parts)
+
+    def _frustration_summary(self, m: Dict[str, float]) -> str:
+        """Build the frustration-analysis summary paragraph."""
+        parts = [f"Analysis reveals significant frustration patterns across {_fmt_int(int(m['total_sessions']))} sessions. "]
+        if m['dead_click_rate'] > 5:
+            parts.append(f"Dead clicks are the primary concern ({m['dead_click_rate']:.1f}% of sessions). ")
+        if m['rage_click_rate'] > 1:
+            parts.append(f"Rage clicking indicates broken interactions ({m['rage_click_rate']:.1f}% of sessions). ")
+        if m['quick_back_rate'] > 10:
+            parts.append(f"High quick back rate suggests poor landing experience ({m['quick_back_rate']:.1f}% of sessions).")
+        return "".join(parts)
+
+    def _build_all_recommendations(
+        self,
+        dead_click_rate: float,
+        rage_click_rate: float,
+        quick_back_rate: float
+    ) -> Tuple[str, str, str, str]:
+        """
+        Build every recommendation block from one threshold check.
 
-        return content
+        Returns:
+            (quick back, dead click, rage click, priority) recommendation texts
+        """
+        dead_critical = dead_click_rate > 5
+        rage_critical = rage_click_rate > 1
+        quick_back_high = quick_back_rate > 10
+
+        quick_back_block = self._immediate_actions(
+            quick_back_high, "Quick back",
+            "Audit landing page content alignment with user expectations",
+            "Optimize page load performance (target <2s)",
+            "Review meta descriptions and ad copy accuracy",
+        )
+        dead_click_block = self._immediate_actions(
+            dead_critical, "Dead click",
+            "Identify and fix non-interactive elements that appear clickable",
+            "Add cursor feedback (cursor: pointer only for clickable elements)",
+            "Review disabled buttons and form elements",
+        )
+        rage_click_block = self._immediate_actions(
+            rage_critical, "Rage click",
+            "Investigate and fix unresponsive interactive elements",
+            "Add loading indicators for async operations",
+            "Review form validation and error messaging",
+        )
 
-    def _generate_recommendations(self, data: Dict[str, Any], dead_click_rate: float, rage_click_rate: float, quick_back_rate: float) -> str:
-        """Generate prioritized recommendations based on metrics."""
-        recommendations = "**Priority Recommendations:**\n\n"
+        parts = ["**Priority Recommendations:**\n\n"]
 
         priority_count = 0
 
         # Priority 1: Most critical issue
-        if dead_click_rate > 5:
+        if dead_critical:
             priority_count += 1
-            recommendations += f"{priority_count}. **Fix Dead Click Issues** (Critical)\n"
-            recommendations += "   - Audit UI for non-interactive elements appearing clickable\n"
-            recommendations += "   - Add proper cursor feedback and visual affordances\n"
-            recommendations += f"   - Impact: Could improve experience for 39.3% of sessions\n"
-            recommendations += "   - Effort: Medium (2-3 days)\n\n"
+            parts.append(f"{priority_count}. **Fix Dead Click Issues** (Critical)\n")
+            parts.append("   - Audit UI for non-interactive elements appearing clickable\n")
+            parts.append("   - Add proper cursor feedback and visual affordances\n")
+            parts.append(f"   - Impact: Could improve experience for 39.3% of sessions\n")
+            parts.append("   - Effort: Medium (2-3 days)\n\n")
 
-        if rage_click_rate > 1:
+        if rage_critical:
             priority_count += 1
-            recommendations += f"{priority_count}. **Resolve Rage Click Triggers** (Critical)\n"
-            recommendations += "   - Identify and fix unresponsive interactions\n"
-            recommendations += "   - Add loading states and feedback indicators\n"
-            recommendations += f"   - Impact: Could improve experience for 12.1% of sessions\n"
-            recommendations += "   - Effort: Medium (2-4 days)\n\n"
+            parts.append(f"{priority_count}. **Resolve Rage Click Triggers** (Critical)\n")
+            parts.append("   - Identify and fix unresponsive interactions\n")
+            parts.append("   - Add loading states and feedback indicators\n")
+            parts.append(f"   - Impact: Could improve experience for 12.1% of sessions\n")
+            parts.append("   - Effort: Medium (2-4 days)\n\n")
 
-        if quick_back_rate > 10:
+        if quick_back_high:
             priority_count += 1
-            recommendations += f"{priority_count}. **Improve Landing Experience** (High)\n"
-            recommendations += "   - Optimize page load performance\n"
-            recommendations += "   - Align content with user expectations\n"
-            recommendations += f"   - Impact: Could reduce bounce for 49.6% of sessions\n"
-            recommendations += "   - Effort: High (1-2 weeks)\n\n"
+            parts.append(f"{priority_count}. **Improve Landing Experience** (High)\n")
+            parts.append("   - Optimize page load performance\n")
+            parts.append("   - Align content with user expectations\n")
+            parts.append(f"   - Impact: Could reduce bounce for 49.6% of sessions\n")
+            parts.append("   - Effort: High (1-2 weeks)\n\n")
 
         if priority_count == 0:
-            recommendations = "**No critical issues detected.** Continue monitoring for patterns.\n"
+            priority = "**No critical issues detected.** Continue monitoring for patterns.\n"
+        else:
+            priority = "".join(parts)
 
-        return recommendations
+        return quick_back_block, dead_click_block, rage_click_block, priority
 
     def _format_duration(self, seconds: float) -> str:
         """Format duration in seconds to human-readable format."""
@@ -918,6 +1086,24 @@ class ReportGenerator:
             return self.reports_dir / "general" / filename
 
 
+# Per-process generator used by generate_reports_batch workers
+_worker_generator: Optional[ReportGenerator] = None
+
+
+def _generate_page_report(
+    template_name: str,
+    date_range: DateRange,
+    page_id: str,
+    reports_dir: Path
+) -> Path:
+    """Generate one page report inside a batch worker process."""
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = ReportGenerator()
+    _worker_generator.reports_dir = reports_dir
+    return _worker_generator.generate_report(template_name, date_range, page_id=page_id)
+
+
 def main():
     """CLI interface for report generator."""
     import argparse
@@ -926,6 +1112,7 @@ def main():
     parser.add_argument('template', help='Template name (e.g., ux-health, frustration-analysis)')
     parser.add_argument('date_range', help='Date range (e.g., 7, last-week, November)')
     parser.add_argument('--page', help='Page ID for page-specific reports')
+    parser.add_argument('--pages', help='Comma-separated page IDs to generate in parallel')
     parser.add_argument('--output', help='Custom output path')
 
     args = parser.parse_args()
@@ -933,8 +1120,15 @@ def main():
     # Parse date range
     date_range = DateParser.parse(args.date_range)
 
-    # Generate report
     generator = ReportGenerator()
+
+    if args.pages:
+        page_ids = [p.strip() for p in args.pages.split(',') if p.strip()]
+        for output_path in generator.generate_reports_batch(args.template, date_range, page_ids):
+            print(f"✓ Report generated: {output_path}")
+        return
+
+    # Generate report
     output_path = generator.generate_report(
         args.template,
         date_range,
@@ -4,16 +4,33 @@ Long-term trend analysis for UX metrics.
 Analyze trends, growth rates, and patterns over extended periods.
 """
 
+import io
 import sys
+import json
 from pathlib import Path
 from datetime import date, timedelta
-from typing import Dict, List, Optional, Any, Tuple
-import statistics
+from functools import lru_cache
+from math import exp, log
+from typing import Dict, Optional, Any, Tuple
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; --json falls back to the stdlib
+    orjson = None
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scripts.query_engine import QueryEngine, DateRange, DateParser
+from scripts.trend_kernels import fit_line, peaks_and_valleys
+
+# Section rule used by format_analysis (one line, newline included)
+SEP = "=" * 60 + "\n"
+
+# Per-day count columns summarized by the overall analysis
+OVERALL_COLUMNS = ('sessions', 'users', 'dead_clicks', 'rage_clicks', 'quick_backs')
 
 
 class TrendAnalyzer:
@@ -22,6 +39,12 @@ class TrendAnalyzer:
     def __init__(self):
         """Initialize trend analyzer."""
         self.query_engine = QueryEngine()
+        # Per-instance memo, so cached arrays die with this analyzer
+        self._fetch_metrics = lru_cache(maxsize=32)(self._fetch_metrics_uncached)
+
+    def clear_cache(self):
+        """Forget memoized metric columns (e.g. after new data is ingested)."""
+        self._fetch_metrics.cache_clear()
 
     def analyze_trend(
         self,
@@ -40,14 +63,16 @@ class TrendAnalyzer:
         Returns:
             Trend analysis results
         """
-        # Query metrics
-        metrics = self.query_engine.query_metrics(
-            date_range,
-            metric_name=metric_name,
-            data_scope=data_scope
+        # Query metric columns, oldest day first
+        cols = self._fetch_metrics(
+            date_range.start.isoformat(),
+            date_range.end.isoformat(),
+            metric_name,
+            data_scope
         )
+        sessions = cols['sessions']
 
-        if not metrics:
+        if not len(sessions):
             return {
                 'error': 'No data found for period',
                 'date_range': {
@@ -56,47 +81,70 @@ class TrendAnalyzer:
                 }
             }
 
-        # Sort by date
-        metrics.sort(key=lambda m: m.get('metric_date', ''))
-
         # Analyze different aspects
         analysis = {
             'period': {
                 'start': date_range.start.isoformat(),
                 'end': date_range.end.isoformat(),
                 'days': (date_range.end - date_range.start).days + 1,
-                'data_points': len(metrics)
+                'data_points': len(sessions)
             },
-            'overall': self._analyze_overall(metrics),
-            'growth': self._analyze_growth(metrics),
-            'volatility': self._analyze_volatility(metrics),
-            'trends': self._identify_trends(metrics),
-            'patterns': self._identify_patterns(metrics)
+            'overall': self._analyze_overall(cols),
+            'growth': self._analyze_growth(sessions),
+            'volatility': self._analyze_volatility(sessions),
+            'trends': self._identify_trends(sessions),
+            'patterns': self._identify_patterns(sessions)
         }
 
         return analysis
 
-    def _analyze_overall(self, metrics: List[Dict]) -> Dict[str, Any]:
+    def _fetch_metrics_uncached(
+        self,
+        start_iso: str,
+        end_iso: str,
+        metric_name: Optional[str],
+        data_scope: str
+    ) -> Dict[str, np.ndarray]:
+        """
+        Fetch date-sorted count columns (memoized per instance as _fetch_metrics).
+
+        Cached arrays are read-only.
+        """
+        date_range = DateRange(date.fromisoformat(start_iso), date.fromisoformat(end_iso))
+
+        cols = self.query_engine.query_metrics_columns(
+            date_range,
+            OVERALL_COLUMNS,
+            metric_name=metric_name,
+            data_scope=data_scope
+        )
+
+        for column in cols.values():
+            column.setflags(write=False)
+        return cols
+
+    def _analyze_overall(self, cols: Dict[str, np.ndarray]) -> Dict[str, Any]:
         """Analyze overall metrics summary."""
-        total_sessions = sum(m.get('sessions') or 0 for m in metrics)
-        total_users = sum(m.get('users') or 0 for m in metrics)
-        total_page_views = sum(m.get('page_views') or 0 for m in metrics)
+        sessions = cols['sessions']
+        days = len(sessions)
+        total_sessions = int(sessions.sum())
+        total_users = int(cols['users'].sum())
 
         # Frustration totals
-        total_dead_clicks = sum(m.get('dead_clicks') or 0 for m in metrics)
-        total_rage_clicks = sum(m.get('rage_clicks') or 0 for m in metrics)
-        total_quick_backs = sum(m.get('quick_backs') or 0 for m in metrics)
+        total_dead_clicks = int(cols['dead_clicks'].sum())
+        total_rage_clicks = int(cols['rage_clicks'].sum())
+        total_quick_backs = int(cols['quick_backs'].sum())
 
         return {
             'sessions': {
                 'total': total_sessions,
-                'average_per_day': total_sessions / len(metrics),
-                'max': max((m.get('sessions') or 0 for m in metrics), default=0),
-                'min': min((m.get('sessions') or 0 for m in metrics), default=0)
+                'average_per_day': total_sessions / days,
+                'max': int(sessions.max()),
+                'min': int(sessions.min())
             },
             'users': {
                 'total': total_users,
-                'average_per_day': total_users / len(metrics)
+                'average_per_day': total_users / days
             },
             'frustration': {
                 'dead_clicks': total_dead_clicks,
@@ -107,14 +155,14 @@ class TrendAnalyzer:
             }
         }
 
-    def _analyze_growth(self, metrics: List[Dict]) -> Dict[str, Any]:
+    def _analyze_growth(self, sessions: np.ndarray) -> Dict[str, Any]:
         """Analyze growth rates."""
-        if len(metrics) < 2:
+        if len(sessions) < 2:
             return {'error': 'Insufficient data for growth analysis'}
 
         # Compare first and last periods
-        first_sessions = metrics[0].get('sessions') or 0
-        last_sessions = metrics[-1].get('sessions') or 0
+        first_sessions = int(sessions[0])
+        last_sessions = int(sessions[-1])
 
         if first_sessions == 0:
             growth_rate = 100 if last_sessions > 0 else 0
@@ -122,26 +170,28 @@ class TrendAnalyzer:
             growth_rate = ((last_sessions - first_sessions) / first_sessions) * 100
 
         # Calculate CAGR if period > 30 days
-        days = len(metrics)
+        days = len(sessions)
         if days > 30:
             # Compound Annual Growth Rate
             # CAGR = (End/Start)^(365/days) - 1
-            if first_sessions > 0:
-                cagr = (pow(last_sessions / first_sessions, 365 / days) - 1) * 100
+            if first_sessions > 0 and last_sessions > 0:
+                cagr = (exp(log(last_sessions / first_sessions) * (365.0 / days)) - 1) * 100
+            elif first_sessions > 0:
+                cagr = -100.0  # Traffic dropped to zero
             else:
                 cagr = 0
         else:
             cagr = None
 
         # Calculate average daily growth
-        daily_changes = []
-        for i in range(1, len(metrics)):
-            prev = metrics[i-1].get('sessions') or 0
-            curr = metrics[i].get('sessions') or 0
-            if prev > 0:
-                daily_changes.append(((curr - prev) / prev) * 100)
-
-        avg_daily_growth = statistics.mean(daily_changes) if daily_changes else 0
+        prev = sessions[:-1]
+        growing_from = prev > 0
+        if growing_from.any():
+            prev = prev[growing_from]
+            curr = sessions[1:][growing_from]
+            avg_daily_growth = float(((curr - prev) / prev * 100).mean())
+        else:
+            avg_daily_growth = 0
 
         return {
             'total_growth': growth_rate,
@@ -152,16 +202,14 @@ class TrendAnalyzer:
             'absolute_change': last_sessions - first_sessions
         }
 
-    def _analyze_volatility(self, metrics: List[Dict]) -> Dict[str, Any]:
+    def _analyze_volatility(self, sessions: np.ndarray) -> Dict[str, Any]:
         """Analyze data volatility."""
-        sessions_list = [m.get('sessions') or 0 for m in metrics]
-
-        if len(sessions_list) < 2:
+        if len(sessions) < 2:
             return {'error': 'Insufficient data for volatility analysis'}
 
-        mean = statistics.mean(sessions_list)
-        std_dev = statistics.stdev(sessions_list)
-        variance = statistics.variance(sessions_list)
+        mean = float(sessions.mean())
+        variance = float(sessions.var(ddof=1))
+        std_dev = float(np.sqrt(variance))
 
         # Coefficient of variation (CV) - normalized volatility
         cv = (std_dev / mean * 100) if mean > 0 else 0
@@ -174,31 +222,13 @@ class TrendAnalyzer:
             'stability': 'high' if cv < 10 else 'medium' if cv < 30 else 'low'
         }
 
-    def _identify_trends(self, metrics: List[Dict]) -> Dict[str, Any]:
+    def _identify_trends(self, sessions: np.ndarray) -> Dict[str, Any]:
         """Identify trends using simple linear regression."""
-        if len(metrics) < 3:
+        if len(sessions) < 3:
             return {'error': 'Insufficient data for trend analysis'}
 
-        sessions_list = [m.get('sessions') or 0 for m in metrics]
-
-        # Simple linear regression: y = mx + b
-        n = len(sessions_list)
-        x = list(range(n))
-        y = sessions_list
-
-        # Calculate slope (m) and intercept (b)
-        x_mean = statistics.mean(x)
-        y_mean = statistics.mean(y)
-
-        numerator = sum((x[i] - x_mean) * (y[i] - y_mean) for i in range(n))
-        denominator = sum((x[i] - x_mean) ** 2 for i in range(n))
-
-        if denominator == 0:
-            slope = 0
-        else:
-            slope = numerator / denominator
-
-        intercept = y_mean - slope * x_mean
+        # Simple linear regression: y = mx + b, with R-squared (goodness of fit)
+        slope, intercept, r_squared = fit_line(sessions)
 
         # Determine trend direction
         if slope > 0.5:
@@ -208,12 +238,6 @@ class TrendAnalyzer:
         else:
             direction = 'stable'
 
-        # Calculate R-squared (goodness of fit)
-        y_pred = [slope * i + intercept for i in x]
-        ss_res = sum((y[i] - y_pred[i]) ** 2 for i in range(n))
-        ss_tot = sum((y[i] - y_mean) ** 2 for i in range(n))
-        r_squared = 1 - (ss_res / ss_tot) if ss_tot > 0 else 0
-
         return {
             'direction': direction,
             'slope': slope,
@@ -222,35 +246,17 @@ class TrendAnalyzer:
             'strength': 'strong' if r_squared > 0.7 else 'moderate' if r_squared > 0.4 else 'weak'
         }
 
-    def _identify_patterns(self, metrics: List[Dict]) -> Dict[str, Any]:
+    def _identify_patterns(self, sessions: np.ndarray) -> Dict[str, Any]:
         """Identify patterns like weekly cycles."""
-        if len(metrics) < 7:
+        if len(sessions) < 7:
             return {'note': 'Insufficient data for pattern analysis (need 7+ days)'}
 
-        sessions_list = [m.get('sessions') or 0 for m in metrics]
-
-        # Identify peaks and valleys
-        peaks = []
-        valleys = []
-
-        for i in range(1, len(sessions_list) - 1):
-            if sessions_list[i] > sessions_list[i-1] and sessions_list[i] > sessions_list[i+1]:
-                peaks.append(i)
-            elif sessions_list[i] < sessions_list[i-1] and sessions_list[i] < sessions_list[i+1]:
-                valleys.append(i)
+        # Identify peaks and valleys (strictly above/below both neighbours)
+        peaks, valleys = peaks_and_valleys(sessions)
 
         # Calculate peak-to-peak and valley-to-valley distances
-        if len(peaks) > 1:
-            peak_distances = [peaks[i+1] - peaks[i] for i in range(len(peaks)-1)]
-            avg_peak_distance = statistics.mean(peak_distances)
-        else:
-            avg_peak_distance = None
-
-        if len(valleys) > 1:
-            valley_distances = [valleys[i+1] - valleys[i] for i in range(len(valleys)-1)]
-            avg_valley_distance = statistics.mean(valley_distances)
-        else:
-            avg_valley_distance = None
+        avg_peak_distance = float(np.diff(peaks).mean()) if peaks.size > 1 else None
+        avg_valley_distance = float(np.diff(valleys).mean()) if valleys.size > 1 else None
 
         # Detect weekly pattern (peaks ~7 days apart)
         weekly_pattern = False
@@ -268,103 +274,102 @@ class TrendAnalyzer:
 
     def format_analysis(self, analysis: Dict[str, Any]) -> str:
         """Format analysis results as readable text."""
-        lines = []
+        buf = io.StringIO()
+        w = buf.write
 
         # Header
-        lines.append("=" * 60)
-        lines.append("LONG-TERM TREND ANALYSIS")
-        lines.append("=" * 60)
+        w(f"{SEP}LONG-TERM TREND ANALYSIS\n{SEP}")
 
         if 'error' in analysis:
-            lines.append(f"\nError: {analysis['error']}")
-            return "\n".join(lines)
+            w(f"\nError: {analysis['error']}")
+            return buf.getvalue()
 
         # Period
         period = analysis['period']
-        lines.append(f"\nPeriod: {period['start']} to {period['end']}")
-        lines.append(f"Duration: {period['days']} days ({period['data_points']} data points)")
+        w(f"\nPeriod: {period['start']} to {period['end']}\n")
+        w(f"Duration: {period['days']} days ({period['data_points']} data points)\n")
 
         # Overall metrics
-        lines.append("\n" + "=" * 60)
-        lines.append("OVERALL METRICS")
-        lines.append("=" * 60)
+        w(f"\n{SEP}OVERALL METRICS\n{SEP}")
 
         overall = analysis['overall']
         sessions = overall['sessions']
-        lines.append(f"\nSessions:")
-        lines.append(f"  Total: {sessions['total']:,}")
-        lines.append(f"  Average per day: {sessions['average_per_day']:,.0f}")
-        lines.append(f"  Range: {sessions['min']:,} - {sessions['max']:,}")
+        w("\nSessions:\n")
+        w(f"  Total: {sessions['total']:,}\n")
+        w(f"  Average per day: {sessions['average_per_day']:,.0f}\n")
+        w(f"  Range: {sessions['min']:,} - {sessions['max']:,}\n")
 
         if 'frustration' in overall:
             frust = overall['frustration']
-            lines.append(f"\nFrustration Signals:")
-            lines.append(f"  Total: {frust['total']:,}")
-            lines.append(f"  Per session: {frust['per_session']:.2f}")
+            w("\nFrustration Signals:\n")
+            w(f"  Total: {frust['total']:,}\n")
+            w(f"  Per session: {frust['per_session']:.2f}\n")
 
         # Growth
         if 'growth' in analysis and 'error' not in analysis['growth']:
-            lines.append("\n" + "=" * 60)
-            lines.append("GROWTH ANALYSIS")
-            lines.append("=" * 60)
+            w(f"\n{SEP}GROWTH ANALYSIS\n{SEP}")
 
             growth = analysis['growth']
-            lines.append(f"\nTotal Growth: {growth['total_growth']:+.1f}%")
-            lines.append(f"  First period: {growth['first_period_sessions']:,} sessions")
-            lines.append(f"  Last period: {growth['last_period_sessions']:,} sessions")
-            lines.append(f"  Absolute change: {growth['absolute_change']:+,}")
+            w(f"\nTotal Growth: {growth['total_growth']:+.1f}%\n")
+            w(f"  First period: {growth['first_period_sessions']:,} sessions\n")
+            w(f"  Last period: {growth['last_period_sessions']:,} sessions\n")
+            w(f"  Absolute change: {growth['absolute_change']:+,}\n")
 
             if growth.get('cagr') is not None:
-                lines.append(f"\nCompound Annual Growth Rate (CAGR): {growth['cagr']:+.1f}%")
+                w(f"\nCompound Annual Growth Rate (CAGR): {growth['cagr']:+.1f}%\n")
 
-            lines.append(f"\nAverage Daily Growth: {growth['avg_daily_growth']:+.2f}%")
+            w(f"\nAverage Daily Growth: {growth['avg_daily_growth']:+.2f}%\n")
 
         # Volatility
         if 'volatility' in analysis and 'error' not in analysis['volatility']:
-            lines.append("\n" + "=" * 60)
-            lines.append("VOLATILITY ANALYSIS")
-            lines.append("=" * 60)
+            w(f"\n{SEP}VOLATILITY ANALYSIS\n{SEP}")
 
             vol = analysis['volatility']
-            lines.append(f"\nMean: {vol['mean']:,.0f} sessions/day")
-            lines.append(f"Standard Deviation: {vol['std_dev']:,.0f}")
-            lines.append(f"Coefficient of Variation: {vol['coefficient_of_variation']:.1f}%")
-            lines.append(f"Stability: {vol['stability'].upper()}")
+            w(f"\nMean: {vol['mean']:,.0f} sessions/day\n")
+            w(f"Standard Deviation: {vol['std_dev']:,.0f}\n")
+            w(f"Coefficient of Variation: {vol['coefficient_of_variation']:.1f}%\n")
+            w(f"Stability: {vol['stability'].upper()}\n")
 
         # Trends
         if 'trends' in analysis and 'error' not in analysis['trends']:
-            lines.append("\n" + "=" * 60)
-            lines.append("TREND ANALYSIS")
-            lines.append("=" * 60)
+            w(f"\n{SEP}TREND ANALYSIS\n{SEP}")
 
             trends = analysis['trends']
-            lines.append(f"\nDirection: {trends['direction'].upper()}")
-            lines.append(f"Slope: {trends['slope']:+.2f} sessions/day")
-            lines.append(f"R-squared: {trends['r_squared']:.3f}")
-            lines.append(f"Strength: {trends['strength'].upper()}")
+            w(f"\nDirection: {trends['direction'].upper()}\n")
+            w(f"Slope: {trends['slope']:+.2f} sessions/day\n")
+            w(f"R-squared: {trends['r_squared']:.3f}\n")
+            w(f"Strength: {trends['strength'].upper()}\n")
 
         # Patterns
         if 'patterns' in analysis and 'note' not in analysis['patterns']:
-            lines.append("\n" + "=" * 60)
-            lines.append("PATTERN ANALYSIS")
-            lines.append("=" * 60)
+            w(f"\n{SEP}PATTERN ANALYSIS\n{SEP}")
 
             patterns = analysis['patterns']
-            lines.append(f"\nPeaks detected: {patterns['peaks_count']}")
-            lines.append(f"Valleys detected: {patterns['valleys_count']}")
+            w(f"\nPeaks detected: {patterns['peaks_count']}\n")
+            w(f"Valleys detected: {patterns['valleys_count']}\n")
 
             if patterns.get('avg_peak_distance'):
-                lines.append(f"Average peak distance: {patterns['avg_peak_distance']:.1f} days")
+                w(f"Average peak distance: {patterns['avg_peak_distance']:.1f} days\n")
 
             if patterns['weekly_pattern_detected']:
-                lines.append("\n✓ Weekly pattern detected (peaks ~7 days apart)")
+                w("\n✓ Weekly pattern detected (peaks ~7 days apart)\n")
 
             if patterns['cyclical']:
-                lines.append("✓ Cyclical pattern present")
+                w("✓ Cyclical pattern present\n")
+
+        w("\n" + SEP[:-1])
+
+        return buf.getvalue()
 
-        lines.append("\n" + "=" * 60)
 
-        return "\n".join(lines)
+def analysis_to_json(analysis: Dict[str, Any]) -> str:
+    """Serialize an analysis dict as indented JSON (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(
+            analysis,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2
+        ).decode()
+    return json.dumps(analysis, indent=2)
 
 
 def main():
@@ -383,6 +388,7 @@ def main():
         choices=['general', 'page'],
         help='Data scope'
     )
+    parser.add_argument('--json', action='store_true', help='Print the analysis as JSON')
 
     args = parser.parse_args()
 
@@ -398,7 +404,10 @@ def main():
     )
 
     # Display results
-    print(analyzer.format_analysis(analysis))
+    if args.json:
+        print(analysis_to_json(analysis))
+    else:
+        print(analyzer.format_analysis(analysis))
 
 
 if __name__ == "__main__":
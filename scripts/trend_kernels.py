@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Numeric kernels for trend analysis.
+Compiled with numba when it is installed, plain numpy otherwise.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; kernels fall back to numpy
+    njit = None
+
+
+def _linreg_numpy(y):
+    n = len(y)
+    x = np.arange(n, dtype=np.float64)
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    dy = y - y_mean
+
+    numerator = float((dx * dy).sum())
+    denominator = float((dx * dx).sum())
+    slope = numerator / denominator if denominator != 0 else 0.0
+    intercept = float(y_mean - slope * x_mean)
+
+    # OLS identity: sum((dy - slope*dx)^2) == ss_tot - slope*numerator
+    ss_tot = float(np.square(dy).sum())
+    ss_res = max(ss_tot - slope * numerator, 0.0)
+    r_squared = 1 - (ss_res / ss_tot) if ss_tot > 0 else 0.0
+    return slope, intercept, r_squared
+
+
+def _find_peaks_numpy(s):
+    d = np.diff(s)
+    peaks = np.flatnonzero((d[:-1] > 0) & (d[1:] < 0)) + 1
+    valleys = np.flatnonzero((d[:-1] < 0) & (d[1:] > 0)) + 1
+    return peaks, valleys
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _linreg_numba(y):
+        # Two passes over centered data: one-pass raw sums cancel badly
+        # for large, low-variance series
+        n = y.shape[0]
+        x_mean = (n - 1) / 2.0
+        y_mean = 0.0
+        for i in range(n):
+            y_mean += y[i]
+        y_mean /= n
+
+        sxy = sxx = syy = 0.0
+        for i in range(n):
+            dx = i - x_mean
+            dy = y[i] - y_mean
+            sxy += dx * dy
+            sxx += dx * dx
+            syy += dy * dy
+
+        slope = sxy / sxx if sxx != 0 else 0.0
+        intercept = y_mean - slope * x_mean
+
+        ss_res = max(syy - slope * sxy, 0.0)
+        r_squared = 1.0 - ss_res / syy if syy > 0 else 0.0
+        return slope, intercept, r_squared
+
+    @njit(cache=True)
+    def _find_peaks_numba(s):
+        n_peaks = n_valleys = 0
+        for i in range(1, s.shape[0] - 1):
+            if s[i] > s[i - 1] and s[i] > s[i + 1]:
+                n_peaks += 1
+            elif s[i] < s[i - 1] and s[i] < s[i + 1]:
+                n_valleys += 1
+
+        peaks = np.empty(n_peaks, np.int64)
+        valleys = np.empty(n_valleys, np.int64)
+        p = v = 0
+        for i in range(1, s.shape[0] - 1):
+            if s[i] > s[i - 1] and s[i] > s[i + 1]:
+                peaks[p] = i
+                p += 1
+            elif s[i] < s[i - 1] and s[i] < s[i + 1]:
+                valleys[v] = i
+                v += 1
+        return peaks, valleys
+
+    linreg = _linreg_numba
+    find_peaks = _find_peaks_numba
+else:
+    linreg = _linreg_numpy
+    find_peaks = _find_peaks_numpy
+
+
+def fit_line(y) -> Tuple[float, float, float]:
+    """
+    Least-squares line through y against its index.
+
+    Args:
+        y: 1-D array of observations
+
+    Returns:
+        (slope, intercept, r_squared)
+    """
+    return linreg(np.ascontiguousarray(y, dtype=np.float64))
+
+
+def peaks_and_valleys(s) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find indices strictly above (peaks) or below (valleys) both neighbours.
+
+    Args:
+        s: 1-D array of observations
+
+    Returns:
+        (peak indices, valley indices) as int64 arrays
+    """
+    return find_peaks(np.ascontiguousarray(s))
@@ -0,0 +1,34 @@
+"""Shared helpers for tests that query SQLite and check its query plans."""
+
+import re
+from datetime import timedelta
+
+# Index named in an EXPLAIN QUERY PLAN detail, e.g. "SEARCH t USING COVERING INDEX idx (...)"
+USING_INDEX_RE = re.compile(r'USING\s+(?:AUTOMATIC\s+)?(?:COVERING\s+)?INDEX\s+(\w+)')
+
+
+def date_range_clause(column, start, end):
+    """Half-open WHERE fragment and params covering the days start..end inclusive."""
+    return f"{column} >= ? AND {column} < ?", (start, end + timedelta(days=1))
+
+
+def query_plan(conn, sql, params=()):
+    """EXPLAIN QUERY PLAN detail strings for sql (detail is the last column)."""
+    return [row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+
+def plan_indexes(plan):
+    """Names of the indexes searched by a query plan."""
+    return {match.group(1) for detail in plan for match in USING_INDEX_RE.finditer(detail)}
+
+
+def uses_index(conn, sql, params, index_name):
+    """Whether the planner searches index_name when running sql."""
+    return index_name in plan_indexes(query_plan(conn, sql, params))
+
+
+def assert_uses_index(conn, sql, params, index_name):
+    """Fail (showing the plan) when sql does not search index_name."""
+    plan = query_plan(conn, sql, params)
+    assert index_name in plan_indexes(plan), \
+        f"{index_name} not used:\n" + "\n".join(plan)
@@ -0,0 +1,79 @@
+"""Shared pytest fixtures for the aggregator, archive manager, comparator and config tests."""
+
+import sys
+import sqlite3
+from pathlib import Path
+from datetime import date, timedelta
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+@pytest.fixture(scope='session')
+def aggregator():
+    """One aggregator for the whole session (imported only when requested)."""
+    from scripts.aggregator import MetricAggregator
+    return MetricAggregator()
+
+
+@pytest.fixture(scope='session')
+def db(aggregator):
+    """Shared read connection for verifying what the aggregator wrote."""
+    conn = sqlite3.connect(aggregator.db_path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(scope='session')
+def max_date(db):
+    """Latest metric_date in daily_metrics (skips dependent tests when empty)."""
+    result = db.execute("SELECT MAX(metric_date) as max_date FROM daily_metrics").fetchone()
+    if not result['max_date']:
+        pytest.skip("No data to aggregate")
+    return date.fromisoformat(result['max_date'])
+
+
+@pytest.fixture(scope='session')
+def manager():
+    """One archive manager for the whole session (imported only when requested)."""
+    from scripts.archive_manager import ArchiveManager
+    return ArchiveManager()
+
+
+@pytest.fixture(scope='session')
+def old_data_info(manager):
+    """Future reference date that makes all data "old", and its identify scan."""
+    reference_date = date.today() + timedelta(days=manager.retention_days + 10)
+    return reference_date, manager.identify_old_data(reference_date)
+
+
+@pytest.fixture(scope='session')
+def query_engine():
+    """One QueryEngine (and its SQLite connection) for the whole session."""
+    from scripts.query_engine import QueryEngine
+    engine = QueryEngine()
+    yield engine
+    engine.close()
+
+
+@pytest.fixture(scope='session')
+def comparator(query_engine):
+    """One period comparator for the whole session, on the shared engine."""
+    from scripts.comparator import PeriodComparator
+    return PeriodComparator(query_engine=query_engine)
+
+
+@pytest.fixture(scope='session')
+def loaded_config():
+    """ClarityConfig.load() once for the whole session (do not mutate)."""
+    from config_loader import ClarityConfig
+    return ClarityConfig.load()
+
+
+@pytest.fixture
+def default_config():
+    """Fresh pure-default ClarityConfig() (ignores any config.yaml) a test may mutate."""
+    from config_loader import ClarityConfig
+    return ClarityConfig()
@@ -2,32 +2,15 @@
 """Tests for metric aggregator."""
 
 import sys
-from pathlib import Path
 from datetime import date
-import sqlite3
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from scripts.aggregator import MetricAggregator
-import config
+import pytest
 
 
-def test_weekly_aggregation():
+def test_weekly_aggregation(aggregator, db, max_date):
     """Test weekly metric aggregation."""
     print("\n🧪 Testing weekly aggregation...")
 
-    aggregator = MetricAggregator()
-
-    # Get current data range
-    conn = aggregator.get_connection()
-    cursor = conn.execute("SELECT MAX(metric_date) as max_date FROM daily_metrics")
-    result = cursor.fetchone()
-    conn.close()
-
-    if not result['max_date']:
-        print("  ⚠ No data to aggregate, skipping")
-        return
-
-    max_date = date.fromisoformat(result['max_date'])
     year, week, _ = max_date.isocalendar()
 
     # Aggregate current week
@@ -44,35 +27,19 @@ def test_weekly_aggregation():
     print(f"    Avg sessions: {result.get('avg_sessions', 0)}")
 
     # Verify data in database
-    conn = aggregator.get_connection()
-    cursor = conn.execute("""
+    db_result = db.execute("""
         SELECT * FROM weekly_metrics
         WHERE year = ? AND week_number = ?
-    """, (year, week))
-    db_result = cursor.fetchone()
-    conn.close()
+    """, (year, week)).fetchone()
 
     assert db_result is not None, "Should be saved in database"
     print("  ✓ Data saved to weekly_metrics table")
 
 
-def test_monthly_aggregation():
+def test_monthly_aggregation(aggregator, db, max_date):
     """Test monthly metric aggregation."""
     print("\n🧪 Testing monthly aggregation...")
 
-    aggregator = MetricAggregator()
-
-    # Get current data range
-    conn = aggregator.get_connection()
-    cursor = conn.execute("SELECT MAX(metric_date) as max_date FROM daily_metrics")
-    result = cursor.fetchone()
-    conn.close()
-
-    if not result['max_date']:
-        print("  ⚠ No data to aggregate, skipping")
-        return
-
-    max_date = date.fromisoformat(result['max_date'])
     year = max_date.year
     month = max_date.month
 
@@ -93,24 +60,19 @@ def test_monthly_aggregation():
     print(f"    Min/Max: {result.get('min_sessions', 0)}/{result.get('max_sessions', 0)}")
 
     # Verify data in database
-    conn = aggregator.get_connection()
-    cursor = conn.execute("""
+    db_result = db.execute("""
         SELECT * FROM monthly_metrics
         WHERE year = ? AND month = ?
-    """, (year, month))
-    db_result = cursor.fetchone()
-    conn.close()
+    """, (year, month)).fetchone()
 
     assert db_result is not None, "Should be saved in database"
     print("  ✓ Data saved to monthly_metrics table")
 
 
-def test_aggregate_all():
+def test_aggregate_all(aggregator):
     """Test aggregating all available data."""
     print("\n🧪 Testing aggregate all...")
 
-    aggregator = MetricAggregator()
-
     counts = aggregator.aggregate_all_available(force=True)
 
     assert 'weekly' in counts, "Should return weekly count"
@@ -122,23 +84,10 @@ def test_aggregate_all():
     print(f"  ✓ Monthly aggregations: {counts['monthly']}")
 
 
-def test_duplicate_prevention():
+def test_duplicate_prevention(aggregator, max_date):
     """Test that duplicate aggregations are prevented."""
     print("\n🧪 Testing duplicate prevention...")
 
-    aggregator = MetricAggregator()
-
-    # Get current month
-    conn = aggregator.get_connection()
-    cursor = conn.execute("SELECT MAX(metric_date) as max_date FROM daily_metrics")
-    result = cursor.fetchone()
-    conn.close()
-
-    if not result['max_date']:
-        print("  ⚠ No data to test, skipping")
-        return
-
-    max_date = date.fromisoformat(result['max_date'])
     year = max_date.year
     month = max_date.month
 
@@ -154,42 +103,26 @@ def test_duplicate_prevention():
     print("  ✓ Returns existing data when not forced")
 
 
-def test_week_start_calculation():
+@pytest.mark.parametrize("year,week,expected", [
+    (2025, 1, date(2024, 12, 30)),  # 2025-W01 starts on Monday, December 30, 2024
+    (2025, 48, date(2025, 11, 24)),  # 2025-W48 (our current test week)
+    (2026, 1, date(2025, 12, 29)),
+])
+def test_week_start_calculation(aggregator, year, week, expected):
     """Test ISO week start calculation."""
     print("\n🧪 Testing week start calculation...")
 
-    aggregator = MetricAggregator()
-
-    # Test known week starts
-    # 2025-W01 starts on Monday, December 30, 2024
-    week_start = aggregator._get_week_start(2025, 1)
-    assert week_start == date(2024, 12, 30), f"2025-W01 should start on 2024-12-30, got {week_start}"
-    print(f"  ✓ 2025-W01 starts on {week_start}")
-
-    # 2025-W48 (our current test week)
-    week_start = aggregator._get_week_start(2025, 48)
+    week_start = aggregator._get_week_start(year, week)
+    assert week_start == expected, f"{year}-W{week:02d} should start on {expected}, got {week_start}"
     assert week_start.weekday() == 0, "Week should start on Monday"
-    print(f"  ✓ 2025-W48 starts on {week_start} (Monday)")
+    assert week_start.isocalendar()[:2] == (year, week), "Start date outside the ISO week"
+    print(f"  ✓ {year}-W{week:02d} starts on {week_start} (Monday)")
 
 
-def test_aggregation_metrics():
+def test_aggregation_metrics(aggregator, max_date):
     """Test that all required metrics are aggregated."""
     print("\n🧪 Testing aggregation metrics...")
 
-    aggregator = MetricAggregator()
-
-    # Get current month
-    conn = aggregator.get_connection()
-    cursor = conn.execute("SELECT MAX(metric_date) as max_date FROM daily_metrics")
-    result = cursor.fetchone()
-    conn.close()
-
-    if not result['max_date']:
-        print("  ⚠ No data to test, skipping")
-        return
-
-    max_date = date.fromisoformat(result['max_date'])
-
     result = aggregator.aggregate_monthly_metrics(
         max_date.year, max_date.month, force=True
     )
@@ -208,41 +141,5 @@ def test_aggregation_metrics():
     print(f"  ✓ All {len(required_metrics)} required metrics present")
 
 
-def run_all_tests():
-    """Run all aggregator tests."""
-    print("=" * 60)
-    print("AGGREGATOR TESTS")
-    print("=" * 60)
-
-    tests = [
-        test_week_start_calculation,
-        test_weekly_aggregation,
-        test_monthly_aggregation,
-        test_aggregate_all,
-        test_duplicate_prevention,
-        test_aggregation_metrics,
-    ]
-
-    passed = 0
-    failed = 0
-
-    for test in tests:
-        try:
-            test()
-            passed += 1
-        except Exception as e:
-            print(f"  ❌ Test failed: {e}")
-            import traceback
-            traceback.print_exc()
-            failed += 1
-
-    print("\n" + "=" * 60)
-    print(f"RESULTS: {passed} passed, {failed} failed")
-    print("=" * 60)
-
-    return failed == 0
-
-
 if __name__ == "__main__":
-    success = run_all_tests()
-    sys.exit(0 if success else 1)
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -2,23 +2,15 @@
 """Tests for archive manager."""
 
 import sys
-from pathlib import Path
 from datetime import date, timedelta
-import json
-import tempfile
-import shutil
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
 
-from scripts.archive_manager import ArchiveManager
 
-
-def test_archive_manager_initialization():
+def test_archive_manager_initialization(manager):
     """Test that archive manager initializes correctly."""
     print("\n🧪 Testing archive manager initialization...")
 
-    manager = ArchiveManager()
-
     assert manager.query_engine is not None, "Query engine not initialized"
     assert manager.retention_days > 0, "Retention days not set"
     assert manager.archive_dir.exists(), "Archive directory not created"
@@ -28,16 +20,12 @@ def test_archive_manager_initialization():
     print(f"  ✓ Archive directory: {manager.archive_dir}")
 
 
-def test_identify_old_data():
+def test_identify_old_data(old_data_info):
     """Test identifying old data."""
     print("\n🧪 Testing old data identification...")
 
-    manager = ArchiveManager()
-
-    # Use a future reference date to make all data "old"
-    reference_date = date.today() + timedelta(days=manager.retention_days + 10)
-
-    old_data_info = manager.identify_old_data(reference_date)
+    # Future reference date makes all data "old"
+    _, old_data_info = old_data_info
 
     assert 'cutoff_date' in old_data_info, "Cutoff date missing"
     assert 'retention_days' in old_data_info, "Retention days missing"
@@ -51,14 +39,12 @@ def test_identify_old_data():
         print(f"  ✓ Date range: {old_data_info['date_range']['min']} to {old_data_info['date_range']['max']}")
 
 
-def test_archive_old_data_dry_run():
+def test_archive_old_data_dry_run(manager, old_data_info):
     """Test archiving with dry run."""
     print("\n🧪 Testing archive dry run...")
 
-    manager = ArchiveManager()
-
-    # Use future reference to make data "old"
-    reference_date = date.today() + timedelta(days=manager.retention_days + 10)
+    # Future reference date makes all data "old"
+    reference_date, _ = old_data_info
 
     result = manager.archive_old_data(reference_date, format='json', dry_run=True)
 
@@ -71,14 +57,12 @@ def test_archive_old_data_dry_run():
         print(f"  ✓ Cutoff: {result['cutoff_date']}")
 
 
-def test_delete_old_data_dry_run():
+def test_delete_old_data_dry_run(manager, old_data_info):
     """Test deletion with dry run."""
     print("\n🧪 Testing delete dry run...")
 
-    manager = ArchiveManager()
-
-    # Use future reference to make data "old"
-    reference_date = date.today() + timedelta(days=manager.retention_days + 10)
+    # Future reference date makes all data "old"
+    reference_date, _ = old_data_info
 
     result = manager.delete_old_data(reference_date, dry_run=True)
 
@@ -91,36 +75,29 @@ def test_delete_old_data_dry_run():
         print(f"  ✓ Cutoff: {result['cutoff_date']}")
 
 
-def test_archive_formats():
+@pytest.mark.parametrize("fmt", ["json", "csv"])
+def test_archive_formats(manager, old_data_info, fmt):
     """Test both JSON and CSV archive formats."""
-    print("\n🧪 Testing archive formats...")
-
-    manager = ArchiveManager()
+    print(f"\n🧪 Testing {fmt.upper()} archive format...")
 
-    # Test with future date
-    reference_date = date.today() + timedelta(days=manager.retention_days + 10)
+    # Future reference date makes all data "old"
+    reference_date, info = old_data_info
 
-    # Test JSON format (dry run)
-    json_result = manager.archive_old_data(reference_date, format='json', dry_run=True)
-    print(f"  ✓ JSON format supported")
+    # Dry run in this format
+    result = manager.archive_old_data(reference_date, format=fmt, dry_run=True)
+    print(f"  ✓ {fmt.upper()} format supported")
 
-    # Test CSV format (dry run)
-    csv_result = manager.archive_old_data(reference_date, format='csv', dry_run=True)
-    print(f"  ✓ CSV format supported")
-
-    # Both should have same record count
-    if json_result['status'] == 'dry_run' and csv_result['status'] == 'dry_run':
-        assert json_result['would_archive'] == csv_result['would_archive'], \
+    # Every format should archive the same records
+    if result['status'] == 'dry_run':
+        assert result['would_archive'] == info['total_records'], \
             "Format results should match"
-        print(f"  ✓ Both formats would archive same count")
+        print(f"  ✓ {fmt.upper()} would archive all {result['would_archive']:,} old records")
 
 
-def test_list_archives():
+def test_list_archives(manager):
     """Test listing archive files."""
     print("\n🧪 Testing archive listing...")
 
-    manager = ArchiveManager()
-
     archives = manager.list_archives()
 
     assert isinstance(archives, list), "Archives not a list"
@@ -133,14 +110,12 @@ def test_list_archives():
         print(f"    - {archive['file']} ({size_mb:.2f} MB)")
 
 
-def test_archive_and_delete_workflow():
+def test_archive_and_delete_workflow(manager, old_data_info):
     """Test the full archive and delete workflow (dry run)."""
     print("\n🧪 Testing archive and delete workflow...")
 
-    manager = ArchiveManager()
-
-    # Use future reference date
-    reference_date = date.today() + timedelta(days=manager.retention_days + 10)
+    # Future reference date makes all data "old"
+    reference_date, _ = old_data_info
 
     # Test combined operation (dry run)
     result = manager.archive_and_delete(reference_date, format='json', dry_run=True)
@@ -158,12 +133,10 @@ def test_archive_and_delete_workflow():
         print("  ⚠ No old data (expected for fresh database)")
 
 
-def test_cutoff_date_calculation():
+def test_cutoff_date_calculation(manager):
     """Test cutoff date calculation."""
     print("\n🧪 Testing cutoff date calculation...")
 
-    manager = ArchiveManager()
-
     reference = date(2025, 11, 25)
     expected_cutoff = reference - timedelta(days=manager.retention_days)
 
@@ -178,43 +151,5 @@ def test_cutoff_date_calculation():
     print(f"  ✓ Calculation correct")
 
 
-def run_all_tests():
-    """Run all archive manager tests."""
-    print("=" * 60)
-    print("ARCHIVE MANAGER TESTS")
-    print("=" * 60)
-
-    tests = [
-        test_archive_manager_initialization,
-        test_identify_old_data,
-        test_archive_old_data_dry_run,
-        test_delete_old_data_dry_run,
-        test_archive_formats,
-        test_list_archives,
-        test_archive_and_delete_workflow,
-        test_cutoff_date_calculation,
-    ]
-
-    passed = 0
-    failed = 0
-
-    for test in tests:
-        try:
-            test()
-            passed += 1
-        except Exception as e:
-            print(f"  ❌ Test failed: {e}")
-            import traceback
-            traceback.print_exc()
-            failed += 1
-
-    print("\n" + "=" * 60)
-    print(f"RESULTS: {passed} passed, {failed} failed")
-    print("=" * 60)
-
-    return failed == 0
-
-
 if __name__ == "__main__":
-    success = run_all_tests()
-    sys.exit(0 if success else 1)
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -1,18 +1,79 @@
 #!/usr/bin/env python3
 """Tests for Claude slash commands."""
 
+import os
+import re
 import sys
+from functools import lru_cache
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+COMMANDS_DIR = ROOT / ".claude/commands"
+
+
+def _iter_md(base):
+    """Yield <category>/<command>.md files using scandir's cached entry types."""
+    with os.scandir(base) as top:
+        for category in top:
+            if category.is_dir(follow_symlinks=False):
+                with os.scandir(category.path) as sub:
+                    for entry in sub:
+                        if entry.name.endswith(".md") and entry.is_file(follow_symlinks=False):
+                            yield Path(entry.path)
+
+
+def _entry_names(base, dirs):
+    """Names of the directories (dirs=True) or files directly under base, from one scandir."""
+    if not base.is_dir():
+        return set()
+    with os.scandir(base) as entries:
+        return {entry.name for entry in entries if entry.is_dir(follow_symlinks=False) is dirs}
+
+
+@lru_cache(maxsize=1)
+def _all_commands():
+    """Find and read every command file once: tuple of (path, raw bytes)."""
+    return tuple((path, path.read_bytes()) for path in sorted(_iter_md(COMMANDS_DIR)))
+
+
+# Patterns that should NOT appear (example project names)
+FORBIDDEN_PATTERNS = [
+    'Televika',  # Example project name
+]
+
+# All forbidden patterns as one alternation, matched in a single scan per file
+FORBIDDEN_RE = re.compile(b'|'.join(re.escape(p.encode()) for p in FORBIDDEN_PATTERNS))
+PYTHON_RE = re.compile(rb'python', re.IGNORECASE)
+
+
+@lru_cache(maxsize=1)
+def _scan_commands():
+    """Run every per-file content check in one pass: {path: {check: result}}.
+
+    Checks search the raw bytes, so files are never decoded or lowercased.
+    """
+    results = {}
+    for path, content in _all_commands():
+        results[path] = {
+            'title': content[:1] == b'#',
+            'usage': b'Usage' in content or b'usage' in content,
+            'examples': b'Example' in content or b'example' in content or b'```' in content,
+            'code_blocks': b'```' in content,
+            'python': PYTHON_RE.search(content) is not None,
+            'cli_reference': b'clarity_cli.py' in content,
+            'hardcoded': sorted({m.decode() for m in FORBIDDEN_RE.findall(content)}),
+        }
+    return results
 
 
 def test_commands_directory_structure():
     """Test that command directories exist."""
     print("\n🧪 Testing command directory structure...")
 
-    commands_dir = Path(__file__).parent.parent / ".claude/commands"
-
     expected_dirs = [
         "analysis",
         "fetch",
@@ -20,9 +81,10 @@ def test_commands_directory_structure():
         "reports",
     ]
 
+    present = _entry_names(COMMANDS_DIR, dirs=True)
+
     for dir_name in expected_dirs:
-        dir_path = commands_dir / dir_name
-        assert dir_path.exists(), f"Directory missing: {dir_name}"
+        assert dir_name in present, f"Directory missing: {dir_name}"
         print(f"  ✓ {dir_name}/ exists")
 
     print(f"  ✓ All {len(expected_dirs)} directories found")
@@ -32,8 +94,6 @@ def test_command_files_exist():
     """Test that expected command files exist."""
     print("\n🧪 Testing command files...")
 
-    commands_dir = Path(__file__).parent.parent / ".claude/commands"
-
     expected_commands = {
         "analysis": [
             "query-data.md",
@@ -54,9 +114,9 @@ def test_command_files_exist():
 
     total_commands = 0
     for category, commands in expected_commands.items():
+        present = _entry_names(COMMANDS_DIR / category, dirs=False)
         for command in commands:
-            command_path = commands_dir / category / command
-            assert command_path.exists(), f"Command missing: {category}/{command}"
+            assert command in present, f"Command missing: {category}/{command}"
             print(f"  ✓ {category}/{command}")
             total_commands += 1
 
@@ -67,136 +127,69 @@ def test_command_content():
     """Test that commands have proper content."""
     print("\n🧪 Testing command content...")
 
-    commands_dir = Path(__file__).parent.parent / ".claude/commands"
-
-    all_commands = list(commands_dir.glob("*/*.md"))
-
-    for command_path in all_commands:
-        with open(command_path, 'r') as f:
-            content = f.read()
+    scanned = _scan_commands()
 
+    for command_path, checks in scanned.items():
         # Check for title
-        assert content.startswith('#'), f"{command_path.name}: Missing title"
+        assert checks['title'], f"{command_path.name}: Missing title"
 
         # Check for essential sections
-        has_usage = 'Usage' in content or 'usage' in content
-        has_examples = 'Example' in content or 'example' in content or '```' in content
-
-        assert has_usage or has_examples, \
+        assert checks['usage'] or checks['examples'], \
             f"{command_path.name}: Missing usage/examples section"
 
-        print(f"  ✓ {command_path.relative_to(commands_dir.parent)}")
+        print(f"  ✓ {command_path.relative_to(COMMANDS_DIR.parent)}")
 
-    print(f"  ✓ All {len(all_commands)} commands have proper content")
+    print(f"  ✓ All {len(scanned)} commands have proper content")
 
 
 def test_command_code_blocks():
     """Test that commands have code examples."""
     print("\n🧪 Testing command code blocks...")
 
-    commands_dir = Path(__file__).parent.parent / ".claude/commands"
-
-    all_commands = list(commands_dir.glob("*/*.md"))
-
-    for command_path in all_commands:
-        with open(command_path, 'r') as f:
-            content = f.read()
+    scanned = _scan_commands()
 
+    for command_path, checks in scanned.items():
         # Check for code blocks
-        assert '```' in content, f"{command_path.name}: Missing code blocks"
-        assert 'python' in content.lower(), f"{command_path.name}: Missing python commands"
+        assert checks['code_blocks'], f"{command_path.name}: Missing code blocks"
+        assert checks['python'], f"{command_path.name}: Missing python commands"
 
         print(f"  ✓ {command_path.name} has code examples")
 
-    print(f"  ✓ All {len(all_commands)} commands have code blocks")
-
-
-def test_command_cli_references():
-    """Test that commands reference the CLI correctly."""
-    print("\n🧪 Testing CLI references...")
+    print(f"  ✓ All {len(scanned)} commands have code blocks")
 
-    commands_dir = Path(__file__).parent.parent / ".claude/commands"
 
-    # Commands that should reference clarity_cli.py
-    cli_commands = [
-        "analysis/query-data.md",
-        "analysis/aggregate-metrics.md",
-        "analysis/system-status.md",
-        "maintenance/aggregate-all.md",
-        "maintenance/list-data.md",
-    ]
+# Commands that should reference clarity_cli.py
+CLI_COMMANDS = [
+    "analysis/query-data.md",
+    "analysis/aggregate-metrics.md",
+    "analysis/system-status.md",
+    "maintenance/aggregate-all.md",
+    "maintenance/list-data.md",
+]
 
-    for command_path in cli_commands:
-        full_path = commands_dir / command_path
-        with open(full_path, 'r') as f:
-            content = f.read()
 
-        assert 'clarity_cli.py' in content, \
-            f"{command_path}: Should reference clarity_cli.py"
-        print(f"  ✓ {command_path} references CLI")
+@pytest.mark.parametrize("command_path", CLI_COMMANDS)
+def test_command_cli_references(command_path):
+    """Test that commands reference the CLI correctly."""
+    print(f"\n🧪 Testing CLI reference in {command_path}...")
 
-    print(f"  ✓ All {len(cli_commands)} CLI commands reference clarity_cli.py")
+    assert _scan_commands()[COMMANDS_DIR / command_path]['cli_reference'], \
+        f"{command_path}: Should reference clarity_cli.py"
+    print(f"  ✓ {command_path} references CLI")
 
 
 def test_no_hardcoded_data():
     """Test that commands don't contain hardcoded project data."""
     print("\n🧪 Testing for hardcoded data...")
 
-    commands_dir = Path(__file__).parent.parent / ".claude/commands"
-
-    all_commands = list(commands_dir.glob("*/*.md"))
-
-    # Patterns that should NOT appear (example project names)
-    forbidden_patterns = [
-        'Televika',  # Example project name
-    ]
-
-    for command_path in all_commands:
-        with open(command_path, 'r') as f:
-            content = f.read()
-
-        for pattern in forbidden_patterns:
-            assert pattern not in content, \
-                f"{command_path.name}: Contains hardcoded data: {pattern}"
-
-    print(f"  ✓ All {len(all_commands)} commands are generic")
-
-
-def run_all_tests():
-    """Run all Claude command tests."""
-    print("=" * 60)
-    print("CLAUDE SLASH COMMANDS TESTS")
-    print("=" * 60)
-
-    tests = [
-        test_commands_directory_structure,
-        test_command_files_exist,
-        test_command_content,
-        test_command_code_blocks,
-        test_command_cli_references,
-        test_no_hardcoded_data,
-    ]
-
-    passed = 0
-    failed = 0
-
-    for test in tests:
-        try:
-            test()
-            passed += 1
-        except Exception as e:
-            print(f"  ❌ Test failed: {e}")
-            import traceback
-            traceback.print_exc()
-            failed += 1
+    scanned = _scan_commands()
 
-    print("\n" + "=" * 60)
-    print(f"RESULTS: {passed} passed, {failed} failed")
-    print("=" * 60)
+    for command_path, checks in scanned.items():
+        assert not checks['hardcoded'], \
+            f"{command_path.name}: Contains hardcoded data: {', '.join(checks['hardcoded'])}"
 
-    return failed == 0
+    print(f"  ✓ All {len(scanned)} commands are generic")
 
 
 if __name__ == "__main__":
-    success = run_all_tests()
-    sys.exit(0 if success else 1)
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -2,21 +2,28 @@
 """Tests for CLI."""
 
 import sys
-from pathlib import Path
+import io
+import contextlib
 import subprocess
+from pathlib import Path
+
+import pytest
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import clarity_cli
 
 
 def run_cli(args):
-    """Run CLI command and return output."""
-    result = subprocess.run(
-        ['python', 'clarity_cli.py'] + args,
-        capture_output=True,
-        text=True,
-        cwd=Path(__file__).parent.parent
-    )
-    return result.returncode, result.stdout, result.stderr
+    """Run CLI command in-process and return (exit code, stdout, stderr)."""
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            returncode = clarity_cli.main(args)
+        except SystemExit as e:  # argparse exits on --help and usage errors
+            returncode = e.code or 0
+    return returncode, out.getvalue(), err.getvalue()
 
 
 def test_cli_help():
@@ -91,24 +98,15 @@ def test_cli_aggregate():
     print("  ✓ Aggregate command works")
 
 
-def test_date_format_parsing():
+@pytest.mark.parametrize("fmt", ['7', 'last-week', 'November', '2025-11'])
+def test_date_format_parsing(fmt):
     """Test various date formats."""
-    print("\n🧪 Testing date format parsing...")
+    print(f"\n🧪 Testing date format parsing: {fmt}...")
 
-    date_formats = [
-        '7',
-        'last-week',
-        'November',
-        '2025-11',
-    ]
-
-    for fmt in date_formats:
-        returncode, stdout, stderr = run_cli(['query', fmt, '--count-only'])
-        assert returncode == 0, f"Should parse date format: {fmt}"
-        assert 'Querying metrics:' in stdout, f"Should query with format: {fmt}"
-        print(f"  ✓ Parsed '{fmt}'")
-
-    print("  ✓ All date formats parsed successfully")
+    returncode, stdout, stderr = run_cli(['query', fmt, '--count-only'])
+    assert returncode == 0, f"Should parse date format: {fmt}"
+    assert 'Querying metrics:' in stdout, f"Should query with format: {fmt}"
+    print(f"  ✓ Parsed '{fmt}'")
 
 
 def test_cli_no_command():
@@ -123,42 +121,22 @@ def test_cli_no_command():
     print("  ✓ No command shows help")
 
 
-def run_all_tests():
-    """Run all CLI tests."""
-    print("=" * 60)
-    print("CLI TESTS")
-    print("=" * 60)
-
-    tests = [
-        test_cli_help,
-        test_cli_status,
-        test_cli_list,
-        test_cli_query,
-        test_cli_aggregate,
-        test_date_format_parsing,
-        test_cli_no_command,
-    ]
+def test_cli_script_entry_point():
+    """Test the script wiring once in a real interpreter."""
+    print("\n🧪 Testing CLI script entry point...")
 
-    passed = 0
-    failed = 0
-
-    for test in tests:
-        try:
-            test()
-            passed += 1
-        except Exception as e:
-            print(f"  ❌ Test failed: {e}")
-            import traceback
-            traceback.print_exc()
-            failed += 1
+    result = subprocess.run(
+        [sys.executable, 'clarity_cli.py'],
+        capture_output=True,
+        text=True,
+        cwd=ROOT
+    )
 
-    print("\n" + "=" * 60)
-    print(f"RESULTS: {passed} passed, {failed} failed")
-    print("=" * 60)
+    assert result.returncode == 1, "Exit code from main() should reach the shell"
+    assert 'usage:' in result.stdout, "Should show usage"
 
-    return failed == 0
+    print("  ✓ Script exits with main()'s return code")
 
 
 if __name__ == "__main__":
-    success = run_all_tests()
-    sys.exit(0 if success else 1)
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -5,13 +5,15 @@ import sys
 from pathlib import Path
 from datetime import date, timedelta
 
+import pytest
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scripts.comparator import PeriodComparator
 from scripts.query_engine import DateRange
 
 
-def test_comparator_initialization():
+def test_comparator_initialization(query_engine):
     """Test that comparator initializes correctly."""
     print("\n🧪 Testing comparator initialization...")
 
@@ -19,16 +21,17 @@ def test_comparator_initialization():
 
     assert comparator.query_engine is not None, "Query engine not initialized"
 
+    shared = PeriodComparator(query_engine=query_engine)
+    assert shared.query_engine is query_engine, "Injected query engine not used"
+
     print("  ✓ Comparator initialized")
     print("  ✓ Query engine available")
 
 
-def test_aggregate_period():
+def test_aggregate_period(comparator):
     """Test period aggregation."""
     print("\n🧪 Testing period aggregation...")
 
-    comparator = PeriodComparator()
-
     # Sample metrics
     metrics = [
         {'sessions': 100, 'users': 50, 'dead_clicks': 5, 'rage_clicks': 2},
@@ -47,12 +50,36 @@ def test_aggregate_period():
     print(f"  ✓ Calculated rates correctly")
 
 
-def test_calculate_changes():
+def test_aggregate_period_weighted(comparator):
+    """Test session-weighted averages and missing/None values."""
+    print("\n🧪 Testing weighted period aggregation...")
+
+    metrics = [
+        {'sessions': 100, 'avg_scroll_depth': 40.0, 'error_clicks': None},
+        {'sessions': 300, 'avg_scroll_depth': 80.0, 'error_clicks': 4},
+        {'sessions': None, 'avg_scroll_depth': 99.0},
+    ]
+
+    result = comparator._aggregate_period(metrics)
+
+    assert result['sessions'] == 400, "None sessions should count as 0"
+    assert result['error_clicks'] == 4, "None counts should count as 0"
+    assert result['avg_scroll_depth'] == 70.0, "Scroll depth not session-weighted"
+    assert result['avg_time_on_page'] == 0.0, "Missing averages should be 0"
+    assert result['error_clicks_rate'] == 4/400, "Error clicks rate incorrect"
+    assert all(type(result[k]) is int for k in ('sessions', 'users', 'error_clicks')), \
+        "Totals should be plain ints"
+
+    fractional = comparator._aggregate_period([{'sessions': 10, 'dead_clicks': 1.5}, {'sessions': 10}])
+    assert fractional['dead_clicks'] == 1.5, "Fractional values should not be truncated"
+
+    print(f"  ✓ Weighted scroll depth: {result['avg_scroll_depth']}")
+
+
+def test_calculate_changes(comparator):
     """Test change calculation."""
     print("\n🧪 Testing change calculation...")
 
-    comparator = PeriodComparator()
-
     current = {'sessions': 150, 'dead_clicks': 5}
     previous = {'sessions': 100, 'dead_clicks': 10}
 
@@ -79,58 +106,38 @@ def test_calculate_changes():
     print(f"  ✓ Regressions identified: {len(result['regressions'])}")
 
 
-def test_improvement_detection():
-    """Test improvement detection logic."""
-    print("\n🧪 Testing improvement detection...")
-
-    comparator = PeriodComparator()
+# (metric, change, is improvement, is regression)
+CLASSIFICATION_CASES = [
+    # Traffic: increases are good
+    ('sessions', 10, True, False),
+    ('users', 5, True, False),
+    ('sessions', -10, False, True),
+    ('users', -5, False, True),
+    # Frustration signals: decreases are good
+    ('dead_clicks', -5, True, False),
+    ('rage_clicks', -2, True, False),
+    ('dead_clicks', 5, False, True),
+    ('rage_clicks', 2, False, True),
+]
 
-    # Positive changes that are good
-    assert comparator._is_improvement('sessions', 10), "Sessions increase should be improvement"
-    assert comparator._is_improvement('users', 5), "Users increase should be improvement"
 
-    # Negative changes that are good (frustration signals)
-    assert comparator._is_improvement('dead_clicks', -5), "Dead clicks decrease should be improvement"
-    assert comparator._is_improvement('rage_clicks', -2), "Rage clicks decrease should be improvement"
+@pytest.mark.parametrize("metric,change,improvement,regression", CLASSIFICATION_CASES)
+def test_change_classification(comparator, metric, change, improvement, regression):
+    """Test improvement and regression detection logic."""
+    print(f"\n🧪 Testing classification of {metric} {change:+}...")
 
-    # Not improvements
-    assert not comparator._is_improvement('sessions', -10), "Sessions decrease not improvement"
-    assert not comparator._is_improvement('dead_clicks', 5), "Dead clicks increase not improvement"
+    assert comparator._is_improvement(metric, change) == improvement, \
+        f"{metric} {change:+} improvement should be {improvement}"
+    assert comparator._is_regression(metric, change) == regression, \
+        f"{metric} {change:+} regression should be {regression}"
 
-    print("  ✓ Traffic increase detected as improvement")
-    print("  ✓ Frustration decrease detected as improvement")
-    print("  ✓ Negative changes correctly classified")
+    print(f"  ✓ {metric} {change:+}: {'improvement' if improvement else 'regression'}")
 
 
-def test_regression_detection():
-    """Test regression detection logic."""
-    print("\n🧪 Testing regression detection...")
-
-    comparator = PeriodComparator()
-
-    # Negative changes that are bad
-    assert comparator._is_regression('sessions', -10), "Sessions decrease should be regression"
-    assert comparator._is_regression('users', -5), "Users decrease should be regression"
-
-    # Positive changes that are bad (frustration signals)
-    assert comparator._is_regression('dead_clicks', 5), "Dead clicks increase should be regression"
-    assert comparator._is_regression('rage_clicks', 2), "Rage clicks increase should be regression"
-
-    # Not regressions
-    assert not comparator._is_regression('sessions', 10), "Sessions increase not regression"
-    assert not comparator._is_regression('dead_clicks', -5), "Dead clicks decrease not regression"
-
-    print("  ✓ Traffic decrease detected as regression")
-    print("  ✓ Frustration increase detected as regression")
-    print("  ✓ Positive changes correctly classified")
-
-
-def test_compare_periods():
+def test_compare_periods(comparator):
     """Test comparing two periods."""
     print("\n🧪 Testing period comparison...")
 
-    comparator = PeriodComparator()
-
     # Get real data from database
     end_date = date.today()
     start_date = end_date - timedelta(days=2)
@@ -158,12 +165,10 @@ def test_compare_periods():
     print(f"  ✓ Regressions: {len(comparison['regressions'])}")
 
 
-def test_compare_to_previous():
+def test_compare_to_previous(comparator):
     """Test auto-comparison to previous period."""
     print("\n🧪 Testing auto-comparison to previous period...")
 
-    comparator = PeriodComparator()
-
     # Current period: last 3 days
     end_date = date.today()
     start_date = end_date - timedelta(days=2)
@@ -186,12 +191,10 @@ def test_compare_to_previous():
     print("  ✓ Periods are adjacent")
 
 
-def test_format_comparison():
+def test_format_comparison(comparator):
     """Test comparison formatting."""
     print("\n🧪 Testing comparison formatting...")
 
-    comparator = PeriodComparator()
-
     # Get real comparison
     end_date = date.today()
     start_date = end_date - timedelta(days=2)
@@ -213,43 +216,5 @@ def test_format_comparison():
     print(f"  ✓ Output length: {len(formatted)} characters")
 
 
-def run_all_tests():
-    """Run all comparator tests."""
-    print("=" * 60)
-    print("PERIOD COMPARATOR TESTS")
-    print("=" * 60)
-
-    tests = [
-        test_comparator_initialization,
-        test_aggregate_period,
-        test_calculate_changes,
-        test_improvement_detection,
-        test_regression_detection,
-        test_compare_periods,
-        test_compare_to_previous,
-        test_format_comparison,
-    ]
-
-    passed = 0
-    failed = 0
-
-    for test in tests:
-        try:
-            test()
-            passed += 1
-        except Exception as e:
-            print(f"  ❌ Test failed: {e}")
-            import traceback
-            traceback.print_exc()
-            failed += 1
-
-    print("\n" + "=" * 60)
-    print(f"RESULTS: {passed} passed, {failed} failed")
-    print("=" * 60)
-
-    return failed == 0
-
-
 if __name__ == "__main__":
-    success = run_all_tests()
-    sys.exit(0 if success else 1)
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -2,39 +2,48 @@
 """Tests for configuration system."""
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+import pytest
 import yaml
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from config_loader import ClarityConfig, load_config
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from config_loader import load_config, YAML_LOADER
 
+EXAMPLES_DIR = ROOT / "examples"
 
-def test_default_config():
+
+@lru_cache(maxsize=None)
+def _load_yaml(path):
+    """Parse a YAML file once per test run (callers must not mutate the result)."""
+    return yaml.load(path.read_text(), Loader=YAML_LOADER)
+
+
+def test_default_config(loaded_config):
     """Test loading default configuration."""
     print("\n🧪 Testing default configuration...")
 
-    config = ClarityConfig.load()
-
-    assert config.project.name == "Clarity Project"
-    assert config.project.type == "website"
-    assert config.reports.default_period_days == 3
-    assert config.data.retention_days == 90
+    assert loaded_config.project.name == "Clarity Project"
+    assert loaded_config.project.type == "website"
+    assert loaded_config.reports.default_period_days == 3
+    assert loaded_config.data.retention_days == 90
 
     print("  ✓ Default configuration loaded successfully")
-    print(f"    - Project: {config.project.name}")
-    print(f"    - Retention: {config.data.retention_days} days")
+    print(f"    - Project: {loaded_config.project.name}")
+    print(f"    - Retention: {loaded_config.data.retention_days} days")
 
 
 def test_template_config():
     """Test loading from template file."""
     print("\n🧪 Testing template configuration...")
 
-    template_path = Path(__file__).parent.parent / "config.template.yaml"
+    template_path = ROOT / "config.template.yaml"
     assert template_path.exists(), "Template file not found"
 
     # Verify template is valid YAML
-    with open(template_path, 'r') as f:
-        data = yaml.safe_load(f)
+    data = _load_yaml(template_path)
 
     assert 'project' in data
     assert 'clarity' in data
@@ -49,16 +58,16 @@ def test_example_configs():
     """Test all example configurations."""
     print("\n🧪 Testing example configurations...")
 
-    examples_dir = Path(__file__).parent.parent / "examples"
-    example_files = list(examples_dir.glob("*-config.yaml"))
+    example_files = list(EXAMPLES_DIR.glob("*-config.yaml"))
 
     assert len(example_files) > 0, "No example configs found"
 
-    for example_file in example_files:
-        print(f"  Testing {example_file.name}...")
+    # Example configs are independent, so parse them concurrently
+    with ThreadPoolExecutor() as executor:
+        parsed = list(executor.map(_load_yaml, example_files))
 
-        with open(example_file, 'r') as f:
-            data = yaml.safe_load(f)
+    for example_file, data in zip(example_files, parsed):
+        print(f"  Testing {example_file.name}...")
 
         # Validate required sections
         assert 'project' in data, f"{example_file.name}: Missing 'project' section"
@@ -75,52 +84,49 @@ def test_example_configs():
     print(f"  ✓ All {len(example_files)} example configs are valid")
 
 
-def test_config_validation():
+def test_config_validation(default_config):
     """Test configuration validation."""
     print("\n🧪 Testing configuration validation...")
 
-    config = ClarityConfig()
-
     # Test with valid config
-    errors = config.validate()
+    errors = default_config.validate()
     assert len(errors) == 0, "Default config should have no errors"
     print("  ✓ Default config validation passed")
 
-    # Test with invalid output format
-    config.reports.output_formats = ['invalid']
-    errors = config.validate()
+    # Test with invalid output format (only the mutated section needs checking)
+    default_config.reports.output_formats = ['invalid']
+    errors = default_config.validate_section('reports')
     assert len(errors) > 0, "Should catch invalid output format"
+    assert errors == default_config.validate(), "Section errors should match full validation"
     print(f"  ✓ Validation catches errors: {errors[0]}")
 
 
-def test_page_lookup():
+def test_page_lookup(default_config):
     """Test page lookup functions."""
     print("\n🧪 Testing page lookup functions...")
 
-    config = ClarityConfig()
-
     # Add test pages
     from config_loader import PageTrackingConfig
-    config.tracking.pages = [
+    default_config.tracking.pages = [
         PageTrackingConfig(id="page-001", path="/checkout", name="Checkout", category="conversion"),
         PageTrackingConfig(id="page-002", path="/search", name="Search", category="discovery"),
         PageTrackingConfig(id="page-003", path="/product/123", name="Product", category="content"),
     ]
 
     # Test get by ID
-    page = config.get_page_by_id("page-001")
+    page = default_config.get_page_by_id("page-001")
     assert page is not None
     assert page.path == "/checkout"
     print("  ✓ Get page by ID works")
 
     # Test get by path
-    page = config.get_page_by_path("/search")
+    page = default_config.get_page_by_path("/search")
     assert page is not None
     assert page.id == "page-002"
     print("  ✓ Get page by path works")
 
     # Test get by category
-    conversion_pages = config.get_pages_by_category("conversion")
+    conversion_pages = default_config.get_pages_by_category("conversion")
     assert len(conversion_pages) == 1
     assert conversion_pages[0].id == "page-001"
     print("  ✓ Get pages by category works")
@@ -130,15 +136,12 @@ def test_ecommerce_config():
     """Test e-commerce example configuration."""
     print("\n🧪 Testing e-commerce configuration...")
 
-    examples_dir = Path(__file__).parent.parent / "examples"
-    ecommerce_path = examples_dir / "ecommerce-config.yaml"
+    ecommerce_path = EXAMPLES_DIR / "ecommerce-config.yaml"
 
     if not ecommerce_path.exists():
-        print("  ⚠ E-commerce config not found, skipping")
-        return
+        pytest.skip("E-commerce config not found")
 
-    with open(ecommerce_path, 'r') as f:
-        data = yaml.safe_load(f)
+    data = _load_yaml(ecommerce_path)
 
     # Verify e-commerce specific settings
     assert data['project']['type'] == 'e-commerce'
@@ -154,41 +157,5 @@ def test_ecommerce_config():
     print(f"    - {len(conversion_pages)} conversion pages")
 
 
-def run_all_tests():
-    """Run all configuration tests."""
-    print("=" * 60)
-    print("CONFIGURATION SYSTEM TESTS")
-    print("=" * 60)
-
-    tests = [
-        test_default_config,
-        test_template_config,
-        test_example_configs,
-        test_config_validation,
-        test_page_lookup,
-        test_ecommerce_config,
-    ]
-
-    passed = 0
-    failed = 0
-
-    for test in tests:
-        try:
-            test()
-            passed += 1
-        except Exception as e:
-            print(f"  ❌ Test failed: {e}")
-            import traceback
-            traceback.print_exc()
-            failed += 1
-
-    print("\n" + "=" * 60)
-    print(f"RESULTS: {passed} passed, {failed} failed")
-    print("=" * 60)
-
-    return failed == 0
-
-
 if __name__ == "__main__":
-    success = run_all_tests()
-    sys.exit(0 if success else 1)
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """Tests for database schema v2."""
 
+import atexit
+import re
 import sys
 from pathlib import Path
 import sqlite3
@@ -8,255 +10,274 @@ from datetime import date, timedelta
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import config
+from _helpers import assert_uses_index, date_range_clause
+
+# One connection shared by every test, so SQLite's page cache stays warm
+# (plain tuple rows; cursors that need named columns set sqlite3.Row themselves)
+_CONN = sqlite3.connect(config.DB_PATH)
+# Connection-scoped tuning only: journal_mode/synchronous would change the real database
+_CONN.execute("PRAGMA temp_store = MEMORY")
+_CONN.execute("PRAGMA cache_size = -64000")  # 64 MB page cache
+atexit.register(_CONN.close)
 
 
 def test_daily_metrics_insert():
     """Test inserting daily metrics."""
     print("\n🧪 Testing daily_metrics insert...")
 
-    conn = sqlite3.connect(config.DB_PATH)
+    # Insert a test metric
+    today = date.today()
+    _CONN.execute("""
+        INSERT INTO daily_metrics (
+            metric_date, metric_name, data_scope,
+            sessions, users, bot_sessions,
+            dead_clicks, rage_clicks, quick_backs
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (
+        today, 'Traffic', 'general',
+        1500, 1200, 50,
+        120, 15, 300
+    ))
+    _CONN.commit()
+    print("  ✓ Successfully inserted test metric")
+
+    # Try inserting duplicate (should fail)
     try:
-        # Insert a test metric
-        today = date.today()
-        conn.execute("""
+        _CONN.execute("""
             INSERT INTO daily_metrics (
                 metric_date, metric_name, data_scope,
-                sessions, users, bot_sessions,
-                dead_clicks, rage_clicks, quick_backs
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            today, 'Traffic', 'general',
-            1500, 1200, 50,
-            120, 15, 300
-        ))
-        conn.commit()
-        print("  ✓ Successfully inserted test metric")
-
-        # Try inserting duplicate (should fail)
-        try:
-            conn.execute("""
-                INSERT INTO daily_metrics (
-                    metric_date, metric_name, data_scope,
-                    sessions, users, bot_sessions
-                ) VALUES (?, ?, ?, ?, ?, ?)
-            """, (today, 'Traffic', 'general', 1600, 1300, 60))
-            conn.commit()
-            print("  ❌ Duplicate constraint failed to prevent duplicate")
-        except sqlite3.IntegrityError:
-            print("  ✓ Duplicate constraint working correctly")
-
-    finally:
-        conn.close()
+                sessions, users, bot_sessions
+            ) VALUES (?, ?, ?, ?, ?, ?)
+        """, (today, 'Traffic', 'general', 1600, 1300, 60))
+        _CONN.commit()
+        print("  ❌ Duplicate constraint failed to prevent duplicate")
+    except sqlite3.IntegrityError:
+        print("  ✓ Duplicate constraint working correctly")
 
 
 def test_page_tracking():
     """Test page tracking functionality."""
     print("\n🧪 Testing page tracking...")
 
-    conn = sqlite3.connect(config.DB_PATH)
-    conn.row_factory = sqlite3.Row
-    try:
-        # Insert test pages
-        test_pages = [
-            ('page-001', '/checkout', 'Checkout', 'conversion'),
-            ('page-002', '/search', 'Search', 'discovery'),
-            ('page-003', '/product/123', 'Product Page', 'content'),
-        ]
-
-        for page_data in test_pages:
-            conn.execute("""
-                INSERT OR IGNORE INTO pages (id, path, name, category)
-                VALUES (?, ?, ?, ?)
-            """, page_data)
+    # Insert test pages
+    test_pages = [
+        ('page-001', '/checkout', 'Checkout', 'conversion'),
+        ('page-002', '/search', 'Search', 'discovery'),
+        ('page-003', '/product/123', 'Product Page', 'content'),
+    ]
 
-        conn.commit()
-        print("  ✓ Inserted 3 test pages")
+    with _CONN:
+        _CONN.executemany("""
+            INSERT OR IGNORE INTO pages (id, path, name, category)
+            VALUES (?, ?, ?, ?)
+        """, test_pages)
 
-        # Query pages
-        cursor = conn.execute("SELECT * FROM pages WHERE active = 1")
-        pages = cursor.fetchall()
-        print(f"  ✓ Retrieved {len(pages)} active pages")
+    print(f"  ✓ Inserted {len(test_pages)} test pages")
 
-        for page in pages:
-            print(f"    - {page['id']}: {page['path']} ({page['category']})")
+    # Query pages (named columns for the listing below)
+    cursor = _CONN.cursor()
+    cursor.row_factory = sqlite3.Row
+    cursor.execute("SELECT * FROM pages WHERE active = 1")
+    pages = cursor.fetchall()
+    print(f"  ✓ Retrieved {len(pages)} active pages")
 
-    finally:
-        conn.close()
+    # One write for the whole listing
+    if pages:
+        sys.stdout.write("\n".join(
+            f"    - {page['id']}: {page['path']} ({page['category']})" for page in pages
+        ) + "\n")
 
 
 def test_date_range_queries():
     """Test date range query performance."""
     print("\n🧪 Testing date range queries...")
 
-    conn = sqlite3.connect(config.DB_PATH)
-    conn.row_factory = sqlite3.Row
-
-    try:
-        # Query last 7 days
-        end_date = date.today()
-        start_date = end_date - timedelta(days=7)
-
-        cursor = conn.execute("""
-            SELECT metric_date, COUNT(*) as count
-            FROM daily_metrics
-            WHERE metric_date BETWEEN ? AND ?
-            GROUP BY metric_date
-            ORDER BY metric_date DESC
-        """, (start_date, end_date))
-
-        results = cursor.fetchall()
-        print(f"  ✓ Found data for {len(results)} days in last 7 days")
-
-        # Query specific month
-        cursor = conn.execute("""
-            SELECT COUNT(*) as count
-            FROM daily_metrics
-            WHERE strftime('%Y-%m', metric_date) = '2025-11'
-        """)
-
-        november_count = cursor.fetchone()['count']
-        print(f"  ✓ November 2025: {november_count} records")
-
-        # Test query performance with EXPLAIN QUERY PLAN
-        cursor = conn.execute("""
-            EXPLAIN QUERY PLAN
-            SELECT * FROM daily_metrics
-            WHERE metric_date BETWEEN ? AND ?
-        """, (start_date, end_date))
-
-        plan = cursor.fetchall()
-        uses_index = any('idx_daily_date' in str(row) for row in plan)
-        if uses_index:
-            print("  ✓ Date index is being used for queries")
-        else:
-            print("  ⚠ Date index not being used (check schema)")
-
-    finally:
-        conn.close()
+    # Query last 7 days
+    end_date = date.today()
+    start_date = end_date - timedelta(days=7)
+    week_clause, week_params = date_range_clause('metric_date', start_date, end_date)
+
+    cursor = _CONN.execute(f"""
+        SELECT metric_date, COUNT(*) as count
+        FROM daily_metrics
+        WHERE {week_clause}
+        GROUP BY metric_date
+        ORDER BY metric_date DESC
+    """, week_params)
+
+    day_count = sum(1 for _ in cursor)
+    print(f"  ✓ Found data for {day_count} days in last 7 days")
+
+    # Query specific month (a range on the bare column, so the date index applies)
+    november_clause, november_params = date_range_clause(
+        'metric_date', date(2025, 11, 1), date(2025, 11, 30)
+    )
+    november_query = f"""
+        SELECT COUNT(*) as count
+        FROM daily_metrics
+        WHERE {november_clause}
+    """
+    (november_count,) = _CONN.execute(november_query, november_params).fetchone()
+    print(f"  ✓ November 2025: {november_count} records")
+
+    # Test query performance with EXPLAIN QUERY PLAN
+    assert_uses_index(_CONN, f"""
+        SELECT * FROM daily_metrics
+        WHERE {week_clause}
+    """, week_params, 'idx_daily_date')
+    print("  ✓ Date index is being used for queries")
+
+    assert_uses_index(_CONN, november_query, november_params, 'idx_daily_date')
+    print("  ✓ Month query uses the date index")
 
 
 def test_fetch_log():
     """Test fetch log functionality."""
     print("\n🧪 Testing fetch_log...")
 
-    conn = sqlite3.connect(config.DB_PATH)
-    conn.row_factory = sqlite3.Row
-
-    try:
-        # Insert a test fetch log entry
-        today = date.today()
-        conn.execute("""
-            INSERT INTO fetch_log (
-                request_period_days, date_start, date_end,
-                scope, status_code, success, records_imported
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (3, today - timedelta(days=3), today, 'general', 200, True, 100))
-
-        conn.commit()
-        print("  ✓ Inserted test fetch log entry")
-
-        # Query recent fetches
-        cursor = conn.execute("""
-            SELECT * FROM fetch_log
-            ORDER BY fetch_timestamp DESC
-            LIMIT 5
-        """)
-
-        fetches = cursor.fetchall()
-        print(f"  ✓ Retrieved {len(fetches)} recent fetch logs")
-
-        for fetch in fetches:
-            print(f"    - {fetch['date_start']} to {fetch['date_end']}: {fetch['records_imported']} records")
+    # Insert a test fetch log entry
+    today = date.today()
+    _CONN.execute("""
+        INSERT INTO fetch_log (
+            request_period_days, date_start, date_end,
+            scope, status_code, success, records_imported
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, (3, today - timedelta(days=3), today, 'general', 200, True, 100))
+
+    _CONN.commit()
+    print("  ✓ Inserted test fetch log entry")
+
+    # Query recent fetches
+    cursor = _CONN.execute("""
+        SELECT date_start, date_end, records_imported FROM fetch_log
+        ORDER BY fetch_timestamp DESC
+        LIMIT 5
+    """)
+
+    fetches = [
+        f"    - {date_start} to {date_end}: {records_imported} records"
+        for date_start, date_end, records_imported in cursor
+    ]
+    if fetches:
+        sys.stdout.write("\n".join(fetches) + "\n")
 
-    finally:
-        conn.close()
+    print(f"  ✓ Retrieved {len(fetches)} recent fetch logs")
 
 
 def test_aggregation_tables():
     """Test weekly and monthly aggregation tables."""
     print("\n🧪 Testing aggregation tables...")
 
-    conn = sqlite3.connect(config.DB_PATH)
-
-    try:
-        # Insert test weekly aggregate
-        conn.execute("""
+    weekly_rows = [(
+        date(2025, 11, 18), date(2025, 11, 24),
+        2025, 47, 'Traffic', 'general',
+        1450.5, 10154
+    )]
+    monthly_rows = [(
+        2025, 11, 'Traffic', 'general',
+        1450.5, 43515, 1200, 1650, 30
+    )]
+
+    # Insert test weekly and monthly aggregates in one transaction
+    with _CONN:
+        _CONN.executemany("""
             INSERT INTO weekly_metrics (
                 week_start, week_end, year, week_number,
                 metric_name, data_scope,
                 avg_sessions, sum_sessions
             ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            date(2025, 11, 18), date(2025, 11, 24),
-            2025, 47, 'Traffic', 'general',
-            1450.5, 10154
-        ))
-
-        # Insert test monthly aggregate
-        conn.execute("""
+        """, weekly_rows)
+
+        _CONN.executemany("""
             INSERT INTO monthly_metrics (
                 year, month, metric_name, data_scope,
                 avg_sessions, sum_sessions, min_sessions, max_sessions,
                 data_points
             ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            2025, 11, 'Traffic', 'general',
-            1450.5, 43515, 1200, 1650, 30
-        ))
+        """, monthly_rows)
+
+    print("  ✓ Inserted test aggregation records")
+    print("  ✓ Weekly and monthly aggregation tables working")
+
+
+def test_daily_rollup():
+    """Test that daily_rollup mirrors grouped daily_metrics totals."""
+    print("\n🧪 Testing daily_rollup triggers...")
+
+    expected = {
+        row[:3]: row[3:]
+        for row in _CONN.execute("""
+            SELECT data_scope, metric_name, metric_date,
+                   COUNT(*), COALESCE(SUM(sessions), 0), COALESCE(SUM(dead_clicks), 0)
+            FROM daily_metrics
+            WHERE data_scope IS NOT NULL
+            GROUP BY data_scope, metric_name, metric_date
+        """)
+    }
+    actual = {
+        row[:3]: row[3:]
+        for row in _CONN.execute("""
+            SELECT data_scope, metric_name, metric_date,
+                   data_points, sessions, dead_clicks
+            FROM daily_rollup
+        """)
+    }
 
-        conn.commit()
-        print("  ✓ Inserted test aggregation records")
-        print("  ✓ Weekly and monthly aggregation tables working")
+    assert actual == expected, "daily_rollup out of sync with daily_metrics"
+    print(f"  ✓ daily_rollup in sync ({len(actual)} scope/metric/day rows)")
 
-    finally:
-        conn.close()
+
+def test_date_filters_half_open():
+    """Test that test queries filter dates through date_range_clause, not BETWEEN."""
+    print("\n🧪 Testing date filters in test queries...")
+
+    between_re = re.compile(r'\b\w*date\w*\s+BETWEEN\s+\?\s+AND\s+\?', re.IGNORECASE)
+    offenders = [
+        f"{path.name}: {match.group(0)}"
+        for path in sorted(Path(__file__).parent.glob('*.py'))
+        for match in between_re.finditer(path.read_text(encoding='utf-8'))
+    ]
+
+    assert not offenders, "Use date_range_clause instead of BETWEEN:\n" + "\n".join(offenders)
+    print("  ✓ No BETWEEN date filters in test queries")
 
 
 def test_schema_integrity():
     """Test overall schema integrity."""
     print("\n🧪 Testing schema integrity...")
 
-    conn = sqlite3.connect(config.DB_PATH)
-    conn.row_factory = sqlite3.Row
-
-    try:
-        # Check all tables exist
-        cursor = conn.execute("""
-            SELECT name FROM sqlite_master
-            WHERE type='table'
-            ORDER BY name
-        """)
-
-        tables = [row['name'] for row in cursor.fetchall()]
-        expected_tables = [
-            'api_requests',  # Old table (kept for compatibility)
-            'archive_log',
-            'clarity_metrics',  # Old table (kept for compatibility)
-            'daily_metrics',
-            'fetch_log',
-            'monthly_metrics',
-            'pages',
-            'weekly_metrics'
-        ]
-
-        for table in expected_tables:
-            if table in tables:
-                print(f"  ✓ Table '{table}' exists")
-            else:
-                print(f"  ❌ Table '{table}' missing!")
-
-        # Check indexes
-        cursor = conn.execute("""
-            SELECT name FROM sqlite_master
-            WHERE type='index' AND name LIKE 'idx_%'
-            ORDER BY name
-        """)
+    # Tables and custom indexes in one sqlite_master scan
+    cursor = _CONN.execute("""
+        SELECT type, name FROM sqlite_master
+        WHERE type = 'table' OR (type = 'index' AND name LIKE 'idx_%')
+        ORDER BY type, name
+    """)
+
+    tables, indexes = [], []
+    for kind, name in cursor:
+        (tables if kind == 'table' else indexes).append(name)
+
+    # Check all tables exist
+    expected_tables = [
+        'api_requests',  # Old table (kept for compatibility)
+        'archive_log',
+        'clarity_metrics',  # Old table (kept for compatibility)
+        'daily_metrics',
+        'daily_rollup',
+        'fetch_log',
+        'monthly_metrics',
+        'pages',
+        'weekly_metrics'
+    ]
 
-        indexes = [row['name'] for row in cursor.fetchall()]
-        print(f"  ✓ Found {len(indexes)} custom indexes")
+    for table in expected_tables:
+        if table in tables:
+            print(f"  ✓ Table '{table}' exists")
+        else:
+            print(f"  ❌ Table '{table}' missing!")
 
-    finally:
-        conn.close()
+    # Check indexes
+    print(f"  ✓ Found {len(indexes)} custom indexes")
 
 
 def run_all_tests():
@@ -272,18 +293,21 @@ def run_all_tests():
         test_date_range_queries,
         test_fetch_log,
         test_aggregation_tables,
+        test_daily_rollup,
+        test_date_filters_half_open,
     ]
 
     passed = 0
     failed = 0
 
-    for test in tests:
-        try:
-            test()
-            passed += 1
-        except Exception as e:
-            print(f"  ❌ Test failed: {e}")
-            failed += 1
+    with _CONN:
+        for test in tests:
+            try:
+                test()
+                passed += 1
+            except Exception as e:
+                print(f"  ❌ Test failed: {e}")
+                failed += 1
 
     print("\n" + "=" * 60)
     print(f"RESULTS: {passed} passed, {failed} failed")
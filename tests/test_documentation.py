@@ -2,16 +2,24 @@
 """Tests for documentation completeness."""
 
 import sys
+import traceback
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+DOCS_DIR = ROOT / "docs"
+EXAMPLES_DIR = ROOT / "examples"
+
+# Every Markdown doc (plus the top-level README) read once, by file name
+DOCS = {path.name: path.read_text(encoding='utf-8') for path in DOCS_DIR.glob("*.md")}
+DOCS["README.md"] = (ROOT / "README.md").read_text(encoding='utf-8')
 
 
 def test_documentation_files_exist():
     """Test that all documentation files exist."""
     print("\n🧪 Testing documentation files...")
 
-    docs_dir = Path(__file__).parent.parent / "docs"
     expected_docs = [
         "QUICK-START.md",
         "DATE-FORMATS.md",
@@ -19,8 +27,7 @@ def test_documentation_files_exist():
     ]
 
     for doc in expected_docs:
-        doc_path = docs_dir / doc
-        assert doc_path.exists(), f"Documentation missing: {doc}"
+        assert doc in DOCS, f"Documentation missing: {doc}"
         print(f"  ✓ {doc}")
 
     print(f"  ✓ All {len(expected_docs)} documentation files found")
@@ -30,7 +37,6 @@ def test_example_configs_exist():
     """Test that example configurations exist."""
     print("\n🧪 Testing example configurations...")
 
-    examples_dir = Path(__file__).parent.parent / "examples"
     expected_examples = [
         "ecommerce-config.yaml",
         "saas-config.yaml",
@@ -38,7 +44,7 @@ def test_example_configs_exist():
     ]
 
     for example in expected_examples:
-        example_path = examples_dir / example
+        example_path = EXAMPLES_DIR / example
         assert example_path.exists(), f"Example missing: {example}"
         print(f"  ✓ {example}")
 
@@ -49,9 +55,7 @@ def test_readme_links():
     """Test that README contains links to documentation."""
     print("\n🧪 Testing README links...")
 
-    readme_path = Path(__file__).parent.parent / "README.md"
-    with open(readme_path, 'r') as f:
-        readme_content = f.read()
+    readme_content = DOCS["README.md"]
 
     required_links = [
         "QUICK-START.md",
@@ -62,8 +66,9 @@ def test_readme_links():
         "media-streaming-config.yaml",
     ]
 
+    missing = [link for link in required_links if link not in readme_content]
+    assert not missing, f"README missing link to: {', '.join(missing)}"
     for link in required_links:
-        assert link in readme_content, f"README missing link to: {link}"
         print(f"  ✓ Links to {link}")
 
     print("  ✓ All documentation links present in README")
@@ -73,10 +78,7 @@ def test_quick_start_content():
     """Test that quick start guide has essential sections."""
     print("\n🧪 Testing quick start content...")
 
-    quick_start_path = Path(__file__).parent.parent / "docs/QUICK-START.md"
-
-    with open(quick_start_path, 'r') as f:
-        content = f.read()
+    content = DOCS["QUICK-START.md"]
 
     required_sections = [
         "Prerequisites",
@@ -86,8 +88,9 @@ def test_quick_start_content():
         "Next Steps",
     ]
 
+    missing = [section for section in required_sections if section not in content]
+    assert not missing, f"Quick start missing section: {', '.join(missing)}"
     for section in required_sections:
-        assert section in content, f"Quick start missing section: {section}"
         print(f"  ✓ Has '{section}' section")
 
     print("  ✓ All required sections present")
@@ -97,10 +100,7 @@ def test_date_formats_content():
     """Test that date formats guide covers all formats."""
     print("\n🧪 Testing date formats guide...")
 
-    date_formats_path = Path(__file__).parent.parent / "docs/DATE-FORMATS.md"
-
-    with open(date_formats_path, 'r') as f:
-        content = f.read()
+    content = DOCS["DATE-FORMATS.md"]
 
     required_formats = [
         "Numeric Formats",
@@ -111,15 +111,16 @@ def test_date_formats_content():
         "Custom Ranges",
     ]
 
+    missing = [format_type for format_type in required_formats if format_type not in content]
+    assert not missing, f"Date formats missing: {', '.join(missing)}"
     for format_type in required_formats:
-        assert format_type in content, f"Date formats missing: {format_type}"
         print(f"  ✓ Documents '{format_type}'")
 
     # Check for example formats
     example_formats = ["7", "last-week", "November", "2025-Q4", "2025"]
-    for fmt in example_formats:
-        assert f'"{fmt}"' in content or f"'{fmt}'" in content, \
-            f"Missing example: {fmt}"
+    missing = [fmt for fmt in example_formats
+               if f'"{fmt}"' not in content and f"'{fmt}'" not in content]
+    assert not missing, f"Missing example: {', '.join(missing)}"
 
     print("  ✓ All format types and examples documented")
 
@@ -128,10 +129,7 @@ def test_readme_summary_content():
     """Test that README summary has all key sections."""
     print("\n🧪 Testing README summary content...")
 
-    summary_path = Path(__file__).parent.parent / "docs/README-SUMMARY.md"
-
-    with open(summary_path, 'r') as f:
-        content = f.read()
+    content = DOCS["README-SUMMARY.md"]
 
     required_sections = [
         "What's Included",
@@ -143,8 +141,9 @@ def test_readme_summary_content():
         "Usage Examples",
     ]
 
+    missing = [section for section in required_sections if section not in content]
+    assert not missing, f"Summary missing section: {', '.join(missing)}"
     for section in required_sections:
-        assert section in content, f"Summary missing section: {section}"
         print(f"  ✓ Has '{section}' section")
 
     print("  ✓ All required sections present")
@@ -174,7 +173,6 @@ def run_all_tests():
             passed += 1
         except Exception as e:
             print(f"  ❌ Test failed: {e}")
-            import traceback
             traceback.print_exc()
             failed += 1
 
@@ -2,11 +2,18 @@
 """Tests for query engine and date parser."""
 
 import sys
+import traceback
 from pathlib import Path
 from datetime import date, timedelta
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from scripts.query_engine import DateParser, QueryEngine, DateRange
+from _helpers import date_range_clause, uses_index
+
+# Today-anchored comparison weeks, built once (DateRange is frozen)
+_TODAY = date.today()
+_THIS_WEEK = DateRange(_TODAY - timedelta(days=6), _TODAY)
+_PREVIOUS_WEEK = DateRange(_TODAY - timedelta(days=13), _TODAY - timedelta(days=7))
 
 
 def test_numeric_dates():
@@ -143,6 +150,30 @@ def test_custom_range():
     print("  ✓ All custom range tests passed")
 
 
+def test_parse_cache():
+    """Test that repeated parses of one expression are served from the cache."""
+    print("\n🧪 Testing date parse cache...")
+
+    ref_date = date(2025, 11, 25)
+    DateParser._parse_cached.cache_clear()
+
+    first = DateParser.parse("last-month", ref_date)
+    again = DateParser.parse("  last-month ", ref_date)
+    assert again is first, "Repeated parse should reuse the cached range"
+    assert DateParser._parse_cached.cache_info().hits >= 1, "Cache was not hit"
+
+    later = DateParser.parse("last-month", date(2025, 12, 25))
+    assert later.start == date(2025, 11, 1), "Cache must be keyed by reference date"
+
+    try:
+        first.start = date(2025, 1, 1)
+        assert False, "Cached ranges must be immutable"
+    except AttributeError:
+        pass
+
+    print(f"  ✓ {DateParser._parse_cached.cache_info()}")
+
+
 def test_query_engine():
     """Test query engine functionality."""
     print("\n🧪 Testing query engine...")
@@ -155,13 +186,15 @@ def test_query_engine():
     if dates:
         print(f"    Latest: {dates[0]}, Earliest: {dates[-1]}")
 
-    # Test query metrics
+    # Test query metrics, unfiltered and with a metric filter, in one round trip
     if dates:
-        metrics = engine.query_metrics("7", data_scope='general')
+        metrics, traffic_metrics = engine.query_metrics_batch("7", [
+            {'data_scope': 'general'},
+            {'metric_name': "Traffic"},
+        ])
         print(f"  ✓ Query last 7 days: {len(metrics)} records")
+        assert all(m['sessions'] is not None for m in metrics), "NULL sessions should read back as 0"
 
-        # Test with metric filter
-        traffic_metrics = engine.query_metrics("7", metric_name="Traffic")
         print(f"  ✓ Query Traffic metrics: {len(traffic_metrics)} records")
 
     # Test aggregate metrics
@@ -177,6 +210,153 @@ def test_query_engine():
     print("  ✓ Query engine tests passed")
 
 
+def test_query_metrics_batch():
+    """Test batched filters against one query_metrics call per filter."""
+    print("\n🧪 Testing batched metric queries...")
+
+    engine = QueryEngine()
+
+    specs = [
+        {'data_scope': 'general'},
+        {'metric_name': "Traffic"},
+        {'metric_name': "DeadClickCount", 'data_scope': 'general'},
+        {'data_scope': 'page', 'page_id': '/checkout'},
+    ]
+
+    batched = engine.query_metrics_batch("30", specs)
+    assert len(batched) == len(specs), "One result list per spec expected"
+    for spec, rows in zip(specs, batched):
+        assert rows == engine.query_metrics("30", **spec), f"Batch rows differ for {spec}"
+        print(f"  ✓ {spec}: {len(rows)} rows")
+
+    assert engine.query_metrics_batch("30", []) == []
+    try:
+        engine.query_metrics_batch("30", [{'metric': "Traffic"}])
+        assert False, "Unknown filter should be rejected"
+    except ValueError:
+        pass
+
+    print("  ✓ Unknown filters rejected")
+
+
+def test_aggregate_metric_totals():
+    """Test grouped SQL totals against row-level query results."""
+    print("\n🧪 Testing aggregate metric totals...")
+
+    engine = QueryEngine()
+
+    totals = engine.aggregate_metric_totals("30", ["Traffic", "ScrollDepth"])
+    assert isinstance(totals, dict), "Totals not a dict"
+
+    rows = engine.query_metrics("30", metric_name="Traffic")
+    expected_sessions = sum(m.get('sessions') or 0 for m in rows)
+
+    if rows:
+        traffic = totals["Traffic"]
+        assert traffic['data_points'] == len(rows), "Row count mismatch"
+        assert traffic['sessions'] == expected_sessions, "Session total mismatch"
+        print(f"  ✓ Traffic: {traffic['data_points']} rows, {traffic['sessions']:,} sessions")
+    else:
+        assert "Traffic" not in totals, "Empty metric should be omitted"
+        print("  ✓ No Traffic data in range (metric omitted)")
+
+    assert engine.aggregate_metric_totals("30", []) == {}, "Empty metric list should return {}"
+    print("  ✓ Aggregate metric totals match row-level sums")
+
+
+def test_query_metrics_columns():
+    """Test column arrays against row-level query results."""
+    print("\n🧪 Testing metric column query...")
+
+    engine = QueryEngine()
+
+    rows = engine.query_metrics("30", metric_name="Traffic")
+    cols = engine.query_metrics_columns("30", ('sessions', 'users'), metric_name="Traffic")
+
+    assert set(cols) == {'metric_date', 'sessions', 'users'}, "Unexpected columns"
+    assert len(cols['sessions']) == len(rows), "Row count mismatch"
+    assert int(cols['sessions'].sum()) == sum(m['sessions'] for m in rows), "Session total mismatch"
+    assert list(cols['metric_date']) == sorted(cols['metric_date']), "Rows should be oldest first"
+
+    try:
+        engine.query_metrics_columns("30", ('sessions', 'raw_json'))
+        assert False, "Non-count column should be rejected"
+    except ValueError:
+        pass
+
+    print(f"  ✓ {len(rows)} rows as arrays, {int(cols['sessions'].sum()):,} sessions")
+    print("  ✓ Non-count columns rejected")
+
+
+def test_aggregate_two_periods():
+    """Test single-query two-period totals against per-period totals."""
+    print("\n🧪 Testing two-period aggregation...")
+
+    engine = QueryEngine()
+
+    current, previous = _THIS_WEEK, _PREVIOUS_WEEK
+    metrics = ["Traffic", "DeadClickCount"]
+
+    combined = engine.aggregate_metrics_two_periods(current, previous, metrics)
+
+    for period, date_range in (('current', current), ('previous', previous)):
+        separate = engine.aggregate_metric_totals(date_range, metrics)
+        for metric_name in metrics:
+            assert combined.get((period, metric_name)) == separate.get(metric_name), \
+                f"{period} {metric_name} totals differ"
+        print(f"  ✓ {period.title()} period matches ({len(separate)} metrics with data)")
+
+
+def test_query_two_periods():
+    """Test single-query two-period rows against per-period rows."""
+    print("\n🧪 Testing two-period metric query...")
+
+    engine = QueryEngine()
+
+    dates = engine.get_available_dates()
+    end_date = date.fromisoformat(dates[0]) if dates else date.today()
+    current = DateRange(end_date - timedelta(days=6), end_date)
+    previous = DateRange(end_date - timedelta(days=13), end_date - timedelta(days=7))
+    overlapping = DateRange(end_date - timedelta(days=9), end_date - timedelta(days=3))
+
+    for period2 in (previous, overlapping):
+        rows1, rows2 = engine.query_metrics_two_periods(current, period2, metric_name="Traffic")
+        assert rows1 == engine.query_metrics(current, metric_name="Traffic"), "First period rows differ"
+        assert rows2 == engine.query_metrics(period2, metric_name="Traffic"), "Second period rows differ"
+        print(f"  ✓ {period2}: {len(rows1)} + {len(rows2)} rows match")
+
+
+def test_metric_index():
+    """Test that the (scope, metric, date) index exists for metric queries."""
+    print("\n🧪 Testing metric query index...")
+
+    engine = QueryEngine()
+
+    conn = engine.get_connection()
+    try:
+        cursor = conn.execute("""
+            SELECT name FROM sqlite_master
+            WHERE type = 'index' AND name = 'idx_daily_scope_metric_date'
+        """)
+        assert cursor.fetchone(), "idx_daily_scope_metric_date missing"
+        print("  ✓ Composite index exists")
+
+        # Planner choice depends on table statistics, so only report it
+        clause, params = date_range_clause('metric_date', date(2025, 11, 1), date(2025, 11, 30))
+        if uses_index(conn, f"""
+            SELECT * FROM daily_metrics
+            WHERE {clause}
+              AND data_scope = ?
+              AND metric_name = ?
+            ORDER BY metric_date DESC, metric_name
+        """, params + ('general', 'Traffic'), 'idx_daily_scope_metric_date'):
+            print("  ✓ Composite index is being used for metric queries")
+        else:
+            print("  ⚠ Composite index not chosen by the planner for this data")
+    finally:
+        conn.close()
+
+
 def test_date_range_object():
     """Test DateRange object."""
     print("\n🧪 Testing DateRange object...")
@@ -206,7 +386,14 @@ def run_all_tests():
         test_quarter_dates,
         test_year_dates,
         test_custom_range,
+        test_parse_cache,
         test_query_engine,
+        test_query_metrics_batch,
+        test_aggregate_metric_totals,
+        test_query_metrics_columns,
+        test_aggregate_two_periods,
+        test_query_two_periods,
+        test_metric_index,
     ]
 
     passed = 0
@@ -218,7 +405,6 @@ def run_all_tests():
             passed += 1
         except Exception as e:
             print(f"  ❌ Test failed: {e}")
-            import traceback
             traceback.print_exc()
             failed += 1
 
@@ -1,23 +1,50 @@
 #!/usr/bin/env python3
 """Tests for report generator."""
 
+import atexit
+import os
 import sys
+import traceback
+from contextlib import contextmanager
 from pathlib import Path
 import tempfile
 import shutil
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from scripts.report_generator import ReportGenerator
+from scripts.report_generator import ReportGenerator, _load_template
 from scripts.query_engine import DateRange
 from datetime import date, timedelta
 
+# Canonical date ranges (DateRange is frozen, so sharing them is safe)
+_TODAY = date.today()
+_RANGE_1D = DateRange(_TODAY - timedelta(days=1), _TODAY)
+_RANGE_3D = DateRange(_TODAY - timedelta(days=3), _TODAY)
+_RANGE_7D = DateRange(_TODAY - timedelta(days=7), _TODAY)
+
+# One generator (and QueryEngine connection) shared by every test
+_GEN = ReportGenerator()
+atexit.register(_GEN.query_engine.close)
+
+
+@contextmanager
+def _redirected(generator, **dirs):
+    """Temporarily point generator directories (e.g. reports_dir) elsewhere."""
+    saved = {name: getattr(generator, name) for name in dirs}
+    for name, path in dirs.items():
+        setattr(generator, name, path)
+    try:
+        yield generator
+    finally:
+        for name, path in saved.items():
+            setattr(generator, name, path)
+
 
 def test_report_generator_initialization():
     """Test that report generator initializes correctly."""
     print("\n🧪 Testing report generator initialization...")
 
-    generator = ReportGenerator()
+    generator = _GEN
 
     assert generator.query_engine is not None, "Query engine not initialized"
     assert generator.templates_dir.exists(), "Templates directory not found"
@@ -32,7 +59,7 @@ def test_find_templates():
     """Test that all templates can be found."""
     print("\n🧪 Testing template discovery...")
 
-    generator = ReportGenerator()
+    generator = _GEN
 
     expected_templates = [
         'ux-health',
@@ -55,7 +82,7 @@ def test_extract_frontmatter():
     """Test frontmatter extraction."""
     print("\n🧪 Testing frontmatter extraction...")
 
-    generator = ReportGenerator()
+    generator = _GEN
 
     # Load a template
     template_path = generator._find_template('ux-health')
@@ -77,19 +104,24 @@ def test_extract_frontmatter():
     assert 'report_type' in content, "Template should have report_type field"
     print("  ✓ Frontmatter section validated")
 
+    # generate_report reads templates through the same split, cached per mtime
+    mtime_ns = template_path.stat().st_mtime_ns
+    hits = _load_template.cache_info().hits
+    _, cached_body = _load_template(template_path, mtime_ns)
+    assert cached_body == body, "Cached template body differs from extraction"
+    assert _load_template(template_path, mtime_ns)[1] is cached_body, "Template not cached"
+    assert _load_template.cache_info().hits > hits, "Template cache was not hit"
+    print("  ✓ Template parse reused from cache")
+
 
 def test_gather_data():
     """Test data gathering from database."""
     print("\n🧪 Testing data gathering...")
 
-    generator = ReportGenerator()
+    generator = _GEN
 
     # Get last 3 days
-    end_date = date.today()
-    start_date = end_date - timedelta(days=3)
-    date_range = DateRange(start_date, end_date)
-
-    data = generator._gather_data(date_range)
+    data = generator._gather_data(_RANGE_3D)
 
     # Should have some data keys
     assert isinstance(data, dict), "Data not a dict"
@@ -107,7 +139,7 @@ def test_fill_placeholders():
     """Test placeholder filling."""
     print("\n🧪 Testing placeholder filling...")
 
-    generator = ReportGenerator()
+    generator = _GEN
 
     template = """
 Project: {PROJECT_NAME}
@@ -115,13 +147,9 @@ Date: {START_DATE} to {END_DATE}
 Sessions: {TOTAL_SESSIONS}
 """
 
-    end_date = date.today()
-    start_date = end_date - timedelta(days=3)
-    date_range = DateRange(start_date, end_date)
-
     data = {'TOTAL_SESSIONS': '1,234'}
 
-    result = generator._fill_placeholders(template, data, date_range)
+    result = generator._fill_placeholders(template, data, _RANGE_3D)
 
     assert '{PROJECT_NAME}' not in result, "PROJECT_NAME not filled"
     assert '{START_DATE}' not in result, "START_DATE not filled"
@@ -133,25 +161,50 @@ Sessions: {TOTAL_SESSIONS}
     print(f"  ✓ Output length: {len(result)} characters")
 
 
+def test_unknown_placeholders():
+    """Test placeholders without a value render empty."""
+    print("\n🧪 Testing unknown placeholders...")
+
+    generator = _GEN
+
+    result = generator._fill_placeholders(
+        "Sessions: {TOTAL_SESSIONS}|{NOT_A_REAL_PLACEHOLDER}|",
+        {'TOTAL_SESSIONS': '42'},
+        _RANGE_3D
+    )
+
+    assert result == "Sessions: 42||", f"Unexpected result: {result!r}"
+
+    print("  ✓ Unknown placeholders replaced with empty text")
+
+
+def test_insights_without_users():
+    """Test insights when no users were recorded."""
+    print("\n🧪 Testing insights without user data...")
+
+    generator = _GEN
+
+    insights = generator._build_insights({'TOTAL_SESSIONS': '120'})
+
+    assert insights['PAGES_PER_SESSION'] == 'N/A', "Expected N/A pages per session"
+    assert insights['PAGES_STATUS'] == 'N/A', "Expected N/A pages status"
+    assert 'Sessions per User: N/A' in insights['BUSINESS_INSIGHTS'], "Expected N/A sessions per user"
+
+    print("  ✓ No division by zero when users are missing")
+
+
 def test_generate_report():
     """Test full report generation."""
     print("\n🧪 Testing report generation...")
 
-    generator = ReportGenerator()
+    generator = _GEN
 
     # Use temporary output directory
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Override reports directory
-        generator.reports_dir = Path(tmpdir)
-
+    with tempfile.TemporaryDirectory() as tmpdir, _redirected(generator, reports_dir=Path(tmpdir)):
         # Generate report for last 3 days
-        end_date = date.today()
-        start_date = end_date - timedelta(days=3)
-        date_range = DateRange(start_date, end_date)
-
         output_path = generator.generate_report(
             'ux-health',
-            date_range
+            _RANGE_3D
         )
 
         assert output_path.exists(), "Report file not created"
@@ -171,24 +224,69 @@ def test_generate_report():
         print(f"  ✓ No unfilled placeholders")
 
 
+def test_template_cache_invalidation():
+    """Test cached templates are reloaded when the file changes."""
+    print("\n🧪 Testing template cache invalidation...")
+
+    generator = _GEN
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        (tmp / "general").mkdir()
+        template_path = tmp / "general" / "cache-test.md.template"
+        template_path.write_text("---\ntitle: Cache\n---\nFirst {START_DATE}\n")
+
+        with _redirected(generator, templates_dir=tmp, reports_dir=tmp / "reports"):
+            first = generator.generate_report('cache-test', _RANGE_1D).read_text()
+            assert 'First' in first, "Initial template not rendered"
+
+            template_path.write_text("---\ntitle: Cache\n---\nSecond {START_DATE}\n")
+            stat = template_path.stat()
+            os.utime(template_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+            second = generator.generate_report('cache-test', _RANGE_1D).read_text()
+            assert 'Second' in second, "Changed template not reloaded"
+
+        print("  ✓ Template reloaded after modification")
+
+
+def test_generate_reports_batch():
+    """Test parallel page report generation."""
+    print("\n🧪 Testing batch report generation...")
+
+    generator = _GEN
+
+    with tempfile.TemporaryDirectory() as tmpdir, _redirected(generator, reports_dir=Path(tmpdir)):
+        page_ids = ['/payment', '/checkout', '/home']
+        paths = generator.generate_reports_batch(
+            'page-analysis', _RANGE_3D, page_ids, max_workers=2
+        )
+
+        assert len(paths) == len(page_ids), "Missing batch reports"
+        for page_id, path in zip(page_ids, paths):
+            assert path.exists(), f"Report not created for {page_id}"
+            assert Path(tmpdir) in path.parents, "Report written outside reports_dir"
+            assert page_id.strip('/') in path.name, "Reports out of page order"
+
+        assert generator.generate_reports_batch('page-analysis', _RANGE_3D, []) == []
+
+        print(f"  ✓ Generated {len(paths)} page reports in parallel")
+
+
 def test_output_path_generation():
     """Test output path generation."""
     print("\n🧪 Testing output path generation...")
 
-    generator = ReportGenerator()
-
-    end_date = date.today()
-    start_date = end_date - timedelta(days=7)
-    date_range = DateRange(start_date, end_date)
+    generator = _GEN
 
     # General report
-    path1 = generator._default_output_path('ux-health', date_range)
+    path1 = generator._default_output_path('ux-health', _RANGE_7D)
     assert 'general' in str(path1), "General report not in general directory"
     assert 'ux-health' in str(path1), "Template name not in path"
     print(f"  ✓ General report path: {path1.name}")
 
     # Page-specific report
-    path2 = generator._default_output_path('page-analysis', date_range, page_id='/payment')
+    path2 = generator._default_output_path('page-analysis', _RANGE_7D, page_id='/payment')
     assert 'pages' in str(path2), "Page report not in pages directory"
     assert 'payment' in str(path2), "Page ID not in path"
     print(f"  ✓ Page report path: {path2.name}")
@@ -208,7 +306,11 @@ def run_all_tests():
         test_extract_frontmatter,
         test_gather_data,
         test_fill_placeholders,
+        test_unknown_placeholders,
+        test_insights_without_users,
         test_generate_report,
+        test_template_cache_invalidation,
+        test_generate_reports_batch,
         test_output_path_generation,
     ]
 
@@ -221,7 +323,6 @@ def run_all_tests():
             passed += 1
         except Exception as e:
             print(f"  ❌ Test failed: {e}")
-            import traceback
             traceback.print_exc()
             failed += 1
 
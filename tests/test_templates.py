@@ -1,19 +1,61 @@
 #!/usr/bin/env python3
 """Tests for report templates."""
 
+import itertools
+import os
 import sys
+import traceback
+from functools import cache
 from pathlib import Path
 import re
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+ROOT = Path(__file__).resolve().parent.parent
+
+TEMPLATES_DIR = ROOT / "templates"
+
+# Template scans, compiled once for every template file
+_PLACEHOLDER_RE = re.compile(r'\{([A-Z_0-9]+)\}')
+_TITLE_RE = re.compile(r'^#\s+\w+', re.MULTILINE)
+_SECTION_RE = re.compile(r'^##\s+(.+)$', re.MULTILINE)
+
+# Audience section names expected in general templates
+REQUIRED_AUDIENCES = (
+    'Technical Team',
+    'UX Team',
+    'Product/UX Team',
+    'Business Team',
+    'Executive Team',
+    'Marketing Team',
+)
+# All audiences in one scan; the lookahead also reports "UX Team" inside "Product/UX Team"
+_AUDIENCE_RE = re.compile(
+    f"(?=({'|'.join(sorted(map(re.escape, REQUIRED_AUDIENCES), key=len, reverse=True))}))"
+)
+
+
+def _list_templates(subdir):
+    """Paths of the *.template files in a templates subdirectory (no extra stat calls)."""
+    with os.scandir(TEMPLATES_DIR / subdir) as it:
+        return [
+            entry.path for entry in it
+            if entry.name.endswith('.template') and entry.is_file(follow_symlinks=False)
+        ]
+
+
+@cache
+def _load_templates():
+    """Every general and page template read once, by path (general first)."""
+    templates = {}
+    for path in itertools.chain(_list_templates("general"), _list_templates("pages")):
+        with open(path, encoding='utf-8') as f:
+            templates[Path(path)] = f.read()
+    return templates
 
 
 def test_template_files_exist():
     """Test that all expected template files exist."""
     print("\n🧪 Testing template files existence...")
 
-    templates_dir = Path(__file__).parent.parent / "templates"
-
     expected_general_templates = [
         "ux-health.md.template",
         "frustration-analysis.md.template",
@@ -28,14 +70,14 @@ def test_template_files_exist():
     ]
 
     # Check general templates
-    general_dir = templates_dir / "general"
+    general_dir = TEMPLATES_DIR / "general"
     for template in expected_general_templates:
         template_path = general_dir / template
         assert template_path.exists(), f"General template missing: {template}"
         print(f"  ✓ {template}")
 
     # Check page templates
-    pages_dir = templates_dir / "pages"
+    pages_dir = TEMPLATES_DIR / "pages"
     for template in expected_page_templates:
         template_path = pages_dir / template
         assert template_path.exists(), f"Page template missing: {template}"
@@ -48,22 +90,14 @@ def test_template_yaml_frontmatter():
     """Test that all templates have valid YAML frontmatter."""
     print("\n🧪 Testing YAML frontmatter...")
 
-    templates_dir = Path(__file__).parent.parent / "templates"
-
-    all_templates = list((templates_dir / "general").glob("*.template"))
-    all_templates.extend(list((templates_dir / "pages").glob("*.template")))
-
-    for template_path in all_templates:
-        with open(template_path, 'r') as f:
-            content = f.read()
-
-        # Check for YAML frontmatter
+    for template_path, content in _load_templates().items():
+        # Check for YAML frontmatter (only the head up to the closing delimiter is scanned)
         assert content.startswith('---'), f"{template_path.name}: Missing YAML frontmatter start"
-        assert content.count('---') >= 2, f"{template_path.name}: Incomplete YAML frontmatter"
+        end = content.find('---', 3)
+        assert end != -1, f"{template_path.name}: Incomplete YAML frontmatter"
 
         # Extract frontmatter
-        parts = content.split('---', 2)
-        frontmatter = parts[1].strip()
+        frontmatter = content[3:end].strip()
 
         # Check for required fields
         assert 'report_type:' in frontmatter, f"{template_path.name}: Missing report_type"
@@ -78,11 +112,6 @@ def test_template_placeholders():
     """Test that templates use consistent placeholder format."""
     print("\n🧪 Testing template placeholders...")
 
-    templates_dir = Path(__file__).parent.parent / "templates"
-
-    all_templates = list((templates_dir / "general").glob("*.template"))
-    all_templates.extend(list((templates_dir / "pages").glob("*.template")))
-
     # Common placeholders that should be in most templates
     common_placeholders = [
         'PROJECT_NAME',
@@ -91,17 +120,9 @@ def test_template_placeholders():
         'GENERATED_DATE',
     ]
 
-    for template_path in all_templates:
-        with open(template_path, 'r') as f:
-            content = f.read()
-
-        # Find all placeholders
-        placeholders = re.findall(r'\{([A-Z_0-9]+)\}', content)
-
-        # Check placeholder format (uppercase with underscores)
-        for placeholder in placeholders:
-            assert re.match(r'^[A-Z_0-9]+$', placeholder), \
-                f"{template_path.name}: Invalid placeholder format: {placeholder}"
+    for template_path, content in _load_templates().items():
+        # Find all placeholders (the pattern only matches uppercase with underscores)
+        placeholders = _PLACEHOLDER_RE.findall(content)
 
         # Check for common placeholders
         for common in common_placeholders:
@@ -115,49 +136,27 @@ def test_audience_sections():
     """Test that general templates have audience-specific sections."""
     print("\n🧪 Testing audience sections...")
 
-    templates_dir = Path(__file__).parent.parent / "templates" / "general"
+    for template_path, content in _load_templates().items():
+        if template_path.parent.name != "general":
+            continue
 
-    required_audiences = [
-        'Technical Team',
-        'UX Team',
-        'Product/UX Team',
-        'Business Team',
-        'Executive Team',
-        'Marketing Team',
-    ]
-
-    for template_path in templates_dir.glob("*.template"):
-        with open(template_path, 'r') as f:
-            content = f.read()
-
-        # Check for at least one audience section
-        has_audience_section = any(audience in content for audience in required_audiences)
-        assert has_audience_section, f"{template_path.name}: Missing audience sections"
-
-        # Count audience sections
-        audience_count = sum(1 for audience in required_audiences if audience in content)
-        print(f"  ✓ {template_path.name}: {audience_count} audience sections")
+        # Audience sections present, from a single scan
+        found = set(_AUDIENCE_RE.findall(content))
+        assert found, f"{template_path.name}: Missing audience sections"
+        print(f"  ✓ {template_path.name}: {len(found)} audience sections")
 
 
 def test_template_structure():
     """Test that templates have proper structure (headers, tables, etc.)."""
     print("\n🧪 Testing template structure...")
 
-    templates_dir = Path(__file__).parent.parent / "templates"
-
-    all_templates = list((templates_dir / "general").glob("*.template"))
-    all_templates.extend(list((templates_dir / "pages").glob("*.template")))
-
-    for template_path in all_templates:
-        with open(template_path, 'r') as f:
-            content = f.read()
-
+    for template_path, content in _load_templates().items():
         # Check for main title (# Header)
-        assert re.search(r'^#\s+\w+', content, re.MULTILINE), \
+        assert _TITLE_RE.search(content), \
             f"{template_path.name}: Missing main title"
 
         # Check for sections (## Header)
-        sections = re.findall(r'^##\s+(.+)$', content, re.MULTILINE)
+        sections = _SECTION_RE.findall(content)
         assert len(sections) >= 3, \
             f"{template_path.name}: Should have at least 3 sections, found {len(sections)}"
 
@@ -168,27 +167,26 @@ def test_no_hardcoded_data():
     """Test that templates don't contain hardcoded project-specific data."""
     print("\n🧪 Testing for hardcoded data...")
 
-    templates_dir = Path(__file__).parent.parent / "templates"
-
-    all_templates = list((templates_dir / "general").glob("*.template"))
-    all_templates.extend(list((templates_dir / "pages").glob("*.template")))
-
     # Patterns that should NOT appear (example project names, URLs, etc.)
     forbidden_patterns = [
-        r'Televika',  # Example project name
-        r'example\.com',  # Would be in placeholders, not hardcoded
-        r'http://(?!.*\{)',  # Hardcoded HTTP URLs (not in placeholders)
-        r'https://(?!.*\{)(?!docs\.microsoft)',  # Hardcoded HTTPS URLs except docs
+        re.compile(pattern, re.IGNORECASE) for pattern in (
+            r'Televika',  # Example project name
+            r'example\.com',  # Would be in placeholders, not hardcoded
+            r'http://(?!.*\{)',  # Hardcoded HTTP URLs (not in placeholders)
+            r'https://(?!.*\{)(?!docs\.microsoft)',  # Hardcoded HTTPS URLs except docs
+        )
     ]
 
-    for template_path in all_templates:
-        with open(template_path, 'r') as f:
-            content = f.read()
+    # Literal text every forbidden pattern needs; templates without any skip the regexes
+    prefilter = ('televika', 'example.com', 'http')
 
-        for pattern in forbidden_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            if matches and 'microsoft' not in str(matches).lower():
-                print(f"  ⚠ {template_path.name}: Potential hardcoded data: {matches}")
+    for template_path, content in _load_templates().items():
+        lowered = content.lower()
+        if any(needle in lowered for needle in prefilter):
+            for pattern in forbidden_patterns:
+                matches = pattern.findall(content)
+                if matches and 'microsoft' not in str(matches).lower():
+                    print(f"  ⚠ {template_path.name}: Potential hardcoded data: {matches}")
 
         print(f"  ✓ {template_path.name}: No forbidden patterns found")
 
@@ -217,7 +215,6 @@ def run_all_tests():
             passed += 1
         except Exception as e:
             print(f"  ❌ Test failed: {e}")
-            import traceback
             traceback.print_exc()
             failed += 1
 
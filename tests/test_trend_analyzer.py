@@ -2,13 +2,27 @@
 """Tests for trend analyzer."""
 
 import sys
+import traceback
+import json
 from pathlib import Path
 from datetime import date, timedelta
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from scripts.trend_analyzer import TrendAnalyzer
+from scripts.trend_analyzer import TrendAnalyzer, OVERALL_COLUMNS, analysis_to_json
 from scripts.query_engine import DateRange
+from scripts import trend_kernels
+from scripts.trend_kernels import fit_line, peaks_and_valleys
+
+
+def _columns(metrics):
+    """Count columns of metric dicts as int64 arrays, the shape the analyzer fetches."""
+    return {
+        key: np.array([m.get(key) or 0 for m in metrics], dtype=np.int64)
+        for key in OVERALL_COLUMNS
+    }
 
 
 def test_trend_analyzer_initialization():
@@ -35,7 +49,7 @@ def test_analyze_overall():
         {'sessions': 120, 'users': 60, 'dead_clicks': 6, 'rage_clicks': 2, 'quick_backs': 2},
     ]
 
-    overall = analyzer._analyze_overall(metrics)
+    overall = analyzer._analyze_overall(_columns(metrics))
 
     assert overall['sessions']['total'] == 370, "Total sessions incorrect"
     assert overall['sessions']['average_per_day'] == 370/3, "Average sessions incorrect"
@@ -63,7 +77,7 @@ def test_analyze_growth():
         {'sessions': 133},
     ]
 
-    growth = analyzer._analyze_growth(metrics)
+    growth = analyzer._analyze_growth(_columns(metrics)['sessions'])
 
     assert growth['first_period_sessions'] == 100, "First period incorrect"
     assert growth['last_period_sessions'] == 133, "Last period incorrect"
@@ -90,7 +104,7 @@ def test_analyze_volatility():
         {'sessions': 99},
     ]
 
-    vol = analyzer._analyze_volatility(stable_metrics)
+    vol = analyzer._analyze_volatility(_columns(stable_metrics)['sessions'])
 
     assert 'mean' in vol, "Mean not calculated"
     assert 'std_dev' in vol, "Std dev not calculated"
@@ -118,7 +132,7 @@ def test_identify_trends():
         {'sessions': 140},
     ]
 
-    trends = analyzer._identify_trends(increasing_metrics)
+    trends = analyzer._identify_trends(_columns(increasing_metrics)['sessions'])
 
     assert trends['direction'] == 'increasing', "Should detect increasing trend"
     assert trends['slope'] > 0, "Slope should be positive"
@@ -131,6 +145,57 @@ def test_identify_trends():
     print(f"  ✓ Strength: {trends['strength'].upper()}")
 
 
+def test_trend_kernels():
+    """Test regression and peak-detection kernels."""
+    print("\n🧪 Testing trend kernels...")
+
+    slope, intercept, r_squared = fit_line([5, 7, 9, 11, 13])
+    assert abs(slope - 2) < 1e-9, f"Expected slope 2, got {slope}"
+    assert abs(intercept - 5) < 1e-9, f"Expected intercept 5, got {intercept}"
+    assert abs(r_squared - 1) < 1e-9, f"Expected perfect fit, got {r_squared}"
+
+    _, _, flat_r_squared = fit_line([4, 4, 4, 4])
+    assert flat_r_squared == 0, "Flat series should have zero R-squared"
+
+    peaks, valleys = peaks_and_valleys([1, 3, 1, 0, 2, 2, 1])
+    assert list(peaks) == [1], f"Unexpected peaks: {list(peaks)}"
+    assert list(valleys) == [3], f"Unexpected valleys: {list(valleys)}"
+
+    print(f"  ✓ Line fit: slope {slope:.1f}, intercept {intercept:.1f}")
+    print(f"  ✓ Peaks {list(peaks)}, valleys {list(valleys)} (plateaus ignored)")
+
+
+def test_trend_kernels_agree():
+    """Test the numba and numpy kernels give the same results (needs numba)."""
+    print("\n🧪 Testing numba kernels against numpy...")
+
+    if trend_kernels.njit is None:
+        print("  ⚠ numba not installed, skipping")
+        return
+
+    rng = np.random.default_rng(0)
+    series = [
+        np.array([5, 7, 9, 11, 13], dtype=np.float64),
+        np.array([4, 4, 4, 4], dtype=np.float64),
+        # Large, low-variance series: one-pass raw sums lose all precision here
+        5e6 + rng.integers(0, 3, 3650).astype(np.float64),
+        rng.normal(1000, 50, 365),
+    ]
+
+    for y in series:
+        expected = trend_kernels._linreg_numpy(y)
+        actual = trend_kernels._linreg_numba(y)
+        assert np.allclose(actual, expected, rtol=1e-6, atol=1e-9), \
+            f"Line fit differs: numba {actual}, numpy {expected}"
+
+        numba_peaks = trend_kernels._find_peaks_numba(y)
+        numpy_peaks = trend_kernels._find_peaks_numpy(y)
+        assert all(np.array_equal(a, b) for a, b in zip(numba_peaks, numpy_peaks)), \
+            "Peak detection differs between numba and numpy"
+
+    print(f"  ✓ {len(series)} series fit and peak-scanned identically")
+
+
 def test_identify_patterns():
     """Test pattern identification."""
     print("\n🧪 Testing pattern identification...")
@@ -152,7 +217,7 @@ def test_identify_patterns():
         {'sessions': 140},  # Peak day 10
     ]
 
-    patterns = analyzer._identify_patterns(weekly_metrics)
+    patterns = analyzer._identify_patterns(_columns(weekly_metrics)['sessions'])
 
     assert 'peaks_count' in patterns, "Peaks not counted"
     assert 'valleys_count' in patterns, "Valleys not counted"
@@ -198,6 +263,31 @@ def test_analyze_trend_full():
         print(f"  ⚠ No data available: {analysis['error']}")
 
 
+def test_fetch_metrics_cache():
+    """Test repeated analyses reuse the fetched rows."""
+    print("\n🧪 Testing metric fetch cache...")
+
+    analyzer = TrendAnalyzer()
+    date_range = DateRange(date.today() - timedelta(days=7), date.today())
+
+    first = analyzer.analyze_trend(date_range)
+    hits = analyzer._fetch_metrics.cache_info().hits
+    second = analyzer.analyze_trend(date_range)
+
+    assert analyzer._fetch_metrics.cache_info().hits == hits + 1, "Second analysis should hit the cache"
+    assert first == second, "Cached analysis should match the first run"
+    print("  ✓ Repeat analysis served from cache")
+
+    other = TrendAnalyzer()
+    assert other._fetch_metrics.cache_info().currsize == 0, "Cache should be per analyzer"
+    print("  ✓ Each analyzer has its own cache")
+
+    analyzer.clear_cache()
+    assert analyzer._fetch_metrics.cache_info().currsize == 0, "clear_cache should empty the cache"
+    assert analyzer.analyze_trend(date_range) == first, "Refetched analysis should match"
+    print("  ✓ clear_cache forces a refetch")
+
+
 def test_format_analysis():
     """Test analysis formatting."""
     print("\n🧪 Testing analysis formatting...")
@@ -224,6 +314,28 @@ def test_format_analysis():
     print(f"  ✓ Output length: {len(formatted)} characters")
 
 
+def test_analysis_to_json():
+    """Test JSON output of an analysis."""
+    print("\n🧪 Testing JSON output...")
+
+    analyzer = TrendAnalyzer()
+    metrics = [{'sessions': 100 + i * 10, 'users': 50} for i in range(8)]
+    cols = _columns(metrics)
+
+    analysis = {
+        'overall': analyzer._analyze_overall(cols),
+        'trends': analyzer._identify_trends(cols['sessions']),
+        'patterns': analyzer._identify_patterns(cols['sessions'])
+    }
+
+    decoded = json.loads(analysis_to_json(analysis))
+    assert decoded['overall']['sessions']['total'] == 1080, "Total sessions lost in JSON"
+    assert decoded['trends']['direction'] == 'increasing', "Trend direction lost in JSON"
+    assert decoded['patterns']['avg_peak_distance'] is None, "None should serialize as null"
+
+    print("  ✓ Analysis round-trips through JSON")
+
+
 def run_all_tests():
     """Run all trend analyzer tests."""
     print("=" * 60)
@@ -236,9 +348,13 @@ def run_all_tests():
         test_analyze_growth,
         test_analyze_volatility,
         test_identify_trends,
+        test_trend_kernels,
+        test_trend_kernels_agree,
         test_identify_patterns,
         test_analyze_trend_full,
+        test_fetch_metrics_cache,
         test_format_analysis,
+        test_analysis_to_json,
     ]
 
     passed = 0
@@ -250,7 +366,6 @@ def run_all_tests():
             passed += 1
         except Exception as e:
             print(f"  ❌ Test failed: {e}")
-            import traceback
             traceback.print_exc()
             failed += 1
 
@@ -5,6 +5,17 @@ from pathlib import Path
 from database.db_manager import DatabaseManager
 import config
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; parsing falls back to the stdlib
+    orjson = None
+
+
+def _load_json(file_path):
+    """Parse a JSON file from its raw bytes (orjson when available)."""
+    raw = file_path.read_bytes()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
 
 def validate_json_files():
     """Validate that all JSON files exist and are valid."""
@@ -30,8 +41,7 @@ def validate_json_files():
             continue
 
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+            data = _load_json(file_path)
 
             if not data.get('success'):
                 print(f"❌ {filename}: API call was not successful")
@@ -71,26 +81,43 @@ def validate_database():
     # Check for expected data
     checks = []
 
+    # Both validation queries on one connection
+    conn = db.get_connection()
+    try:
+        # Record counts per (first dimension, has second dimension), counted by SQLite
+        cursor = conn.execute("""
+            SELECT dimension1_name, dimension2_name IS NOT NULL as two_dim, COUNT(*) as count
+            FROM clarity_metrics
+            GROUP BY dimension1_name, two_dim
+        """)
+        dimension_counts = [
+            (row['dimension1_name'], row['two_dim'], row['count']) for row in cursor
+        ]
+
+        # Distinct records, for the duplicate check below
+        cursor = conn.execute("""
+            SELECT COUNT(*) as unique_records FROM (
+                SELECT DISTINCT metric_name, num_days, dimension1_name, dimension1_value,
+                                dimension2_name, dimension2_value, dimension3_name, dimension3_value
+                FROM clarity_metrics
+            )
+        """)
+        unique = cursor.fetchone()['unique_records']
+    finally:
+        conn.close()
+
     # Should have base metrics (no dimensions)
-    base_metrics = db.get_metrics()
-    base_count = len([m for m in base_metrics if m['dimension1_name'] is None])
+    base_count = sum(count for dim1, _, count in dimension_counts if dim1 is None)
     checks.append(('Base metrics (no dimensions)', base_count > 0, base_count))
 
-    # Should have device metrics
-    device_metrics = [m for m in base_metrics if m['dimension1_name'] == 'Device']
-    checks.append(('Device metrics', len(device_metrics) > 0, len(device_metrics)))
-
-    # Should have country metrics
-    country_metrics = [m for m in base_metrics if m['dimension1_name'] == 'Country']
-    checks.append(('Country metrics', len(country_metrics) > 0, len(country_metrics)))
-
-    # Should have browser metrics
-    browser_metrics = [m for m in base_metrics if m['dimension1_name'] == 'Browser']
-    checks.append(('Browser metrics', len(browser_metrics) > 0, len(browser_metrics)))
+    # Should have device, country and browser metrics
+    for dimension in ('Device', 'Country', 'Browser'):
+        dim_count = sum(count for dim1, _, count in dimension_counts if dim1 == dimension)
+        checks.append((f'{dimension} metrics', dim_count > 0, dim_count))
 
     # Should have 2-dimensional data
-    two_dim = [m for m in base_metrics if m['dimension2_name'] is not None]
-    checks.append(('Two-dimensional metrics', len(two_dim) > 0, len(two_dim)))
+    two_dim_count = sum(count for _, two_dim, count in dimension_counts if two_dim)
+    checks.append(('Two-dimensional metrics', two_dim_count > 0, two_dim_count))
 
     print("\nData Completeness Checks:")
     all_passed = True
@@ -100,21 +127,8 @@ def validate_database():
         if not passed:
             all_passed = False
 
-    # Check for duplicates
-    conn = db.get_connection()
-    cursor = conn.execute("SELECT COUNT(*) as total FROM clarity_metrics")
-    total = cursor.fetchone()['total']
-
-    cursor = conn.execute("""
-        SELECT COUNT(*) as unique_records FROM (
-            SELECT DISTINCT metric_name, num_days, dimension1_name, dimension1_value,
-                            dimension2_name, dimension2_value, dimension3_name, dimension3_value
-            FROM clarity_metrics
-        )
-    """)
-    unique = cursor.fetchone()['unique_records']
-    conn.close()
-
+    # Check for duplicates (the dimension groups partition every record)
+    total = sum(count for _, _, count in dimension_counts)
     duplicate_count = total - unique
     if duplicate_count == 0:
         print(f"\n✅ No duplicates found ({total} total records)")